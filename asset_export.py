@@ -0,0 +1,249 @@
+# asset_export.py
+
+import io
+import os
+import csv
+import math
+import time
+import zipfile
+import datetime
+import tempfile
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# ─────────────────────────────────────────────────────────────
+# 하위 노드 자산 ZIP 내보내기
+#   선택한 노드와 하위 노드의 자산(이미지/3DXML/FBX)을 zip 하나로 묶고 manifest.csv 를 함께 넣는다.
+#   - 파일 내용은 CHUNK_SIZE 단위로 읽어 바로 zip 에 쓰므로 메모리 사용량은 파일 크기와 무관하다.
+#   - 이미 압축된 형식(PNG/JPG/3DXML 등)은 다시 압축하지 않고 저장(stored)만 한다.
+#   - 4GB 를 넘는 파일/아카이브는 ZIP64 로 기록된다.
+#   - 임시 파일에 쓴 뒤 완료되면 교체하므로 취소하거나 실패하면 불완전한 zip 이 남지 않는다.
+# ─────────────────────────────────────────────────────────────
+# (files_dict 키, zip 안의 폴더 이름)
+EXPORT_TYPES = (("image", "Image"), ("xml3d", "3DXML"), ("fbx", "FBX"))
+# 다시 압축해도 줄지 않는 확장자
+STORED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".3dxml", ".zip", ".7z", ".gz", ".rar", ".mp4"}
+CHUNK_SIZE = 1024 * 1024
+MANIFEST_NAME = "manifest.csv"
+MANIFEST_COLUMNS = ("BOM Path", "Level", "Part No", "Qty", "Type", "Archive Entry", "Source File")
+# 진행률 시그널 최소 간격 (초)
+PROGRESS_INTERVAL = 0.1
+
+
+class ExportCancelled(Exception):
+    """내보내기가 취소되었을 때 발생"""
+
+
+def compress_type_for(path):
+    if os.path.splitext(path)[1].lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _qty_text(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class ExportResult:
+    """ZIP 내보내기 결과"""
+    def __init__(self, zip_path, label=""):
+        self.zip_path = zip_path
+        self.label = label          # 내보내기를 시작한 노드의 파트넘버
+        self.entries = 0            # zip 에 넣은 파일 수
+        self.manifest_rows = 0      # manifest.csv 의 행 수 (occurrence x 자산 종류)
+        self.total_bytes = 0        # 원본 파일 크기 합계
+        self.missing = 0            # 자산 파일이 없는 (파트넘버, 종류) 수
+        self.failed = []            # (원본 경로, 오류 메시지)
+        self.cancelled = False
+        self.elapsed = 0.0
+
+    def summary(self):
+        text = (f"파일 {self.entries}개 ({self.total_bytes / (1024 * 1024):.1f}MB), "
+                f"manifest {self.manifest_rows}행, 파일 없음 {self.missing}, 실패 {len(self.failed)}")
+        if self.cancelled:
+            text += " (취소됨)"
+        return text
+
+
+class SubtreeExportWorker(QThread):
+    """
+    노드 하위의 자산을 zip 하나로 내보내는 QThread.
+    location 은 BomTreeModel.node_location() 결과, qty 는 엑셀 행 위치 -> Qty 배열(없으면 None).
+    progress(퍼센트, 메시지) 로 진행률을 알리고, 끝나면 completed(ExportResult) 를 보낸다.
+    """
+    progress = pyqtSignal(int, str)
+    completed = pyqtSignal(object)
+
+    def __init__(self, graph, location, qty, file_dicts, modes, zip_path, label="", parent=None):
+        super().__init__(parent)
+        self.graph = graph
+        self.location = location
+        self.qty = qty
+        # 내보내는 동안 자산 변경 감지로 원본 딕셔너리가 바뀌어도 영향 없도록 복사
+        self.file_dicts = {mode: dict(file_dicts.get(mode, {})) for mode in modes}
+        self.modes = [(mode, folder) for mode, folder in EXPORT_TYPES if mode in modes]
+        self.result = ExportResult(zip_path, label)
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def plan(self):
+        """
+        zip 항목 목록 [(이름, 원본 경로)] 과 (종류, 파트 id) -> 항목 이름 딕셔너리를 만든다.
+        같은 원본 파일은 한 번만 넣으며, 하위 노드의 서로 다른 파트만 훑는다.
+        """
+        graph = self.graph
+        upper = graph.upper_keys
+        part, slot, expandable, ancestors = self.location
+
+        entries = []
+        names = {}           # (종류, 파트 id) -> zip 항목 이름
+        archive_names = {}   # (종류, 원본 경로) -> zip 항목 이름
+        used_names = set()
+        missing = set()
+        for p in graph.subtree_parts(part, expandable):
+            for mode, folder in self.modes:
+                key = upper[p]
+                src = self.file_dicts[mode].get(key)
+                if not src:
+                    missing.add((mode, key))
+                    continue
+                source_key = (mode, os.path.normcase(os.path.abspath(src)))
+                name = archive_names.get(source_key)
+                if name is None:
+                    # 다른 폴더의 같은 파일 이름은 번호를 붙여 구분
+                    stem, ext = os.path.splitext(os.path.basename(src))
+                    name = f"{folder}/{stem}{ext}"
+                    n = 2
+                    while name.lower() in used_names:
+                        name = f"{folder}/{stem}_{n}{ext}"
+                        n += 1
+                    used_names.add(name.lower())
+                    archive_names[source_key] = name
+                    entries.append((name, src))
+                names[(mode, p)] = name
+            if self._cancel_requested:
+                raise ExportCancelled()
+        self.result.missing = len(missing)
+        return entries, names
+
+    def iter_manifest_rows(self, names, written):
+        """
+        manifest 행 (occurrence x 자산 종류) 을 트리뷰 전위 순회 순서로 하나씩 만든다.
+        반복되는 하위 조립품은 행 수가 occurrence 수만큼 커지므로 목록으로 모아 두지 않는다.
+        zip 에 실제로 들어간(written) 항목만 포함한다.
+        """
+        graph = self.graph
+        keys = graph.keys
+        upper = graph.upper_keys
+        part, slot, expandable, ancestors = self.location
+        prefix = [keys[p] for p in ancestors]
+        base_level = len(ancestors)
+        for p, s, path in graph.iter_subtree_occurrences(part, slot, expandable):
+            bom_path = None
+            for mode, folder in self.modes:
+                name = names.get((mode, p))
+                if name not in written:
+                    continue
+                if bom_path is None:
+                    bom_path = "/".join(prefix + [keys[q] for q in path])
+                    row = graph.row_of(p, s)
+                    qty = _qty_text(self.qty[row]) if self.qty is not None and row >= 0 else ""
+                yield (bom_path, base_level + len(path) - 1, keys[p], qty, folder, name,
+                       self.file_dicts[mode][upper[p]])
+            if self._cancel_requested:
+                raise ExportCancelled()
+
+    def run(self):
+        result = self.result
+        start = time.time()
+        tmp_path = None
+        try:
+            self.progress.emit(0, "내보낼 파일 목록 작성 중...")
+            entries, names = self.plan()
+            sizes = []
+            for name, src in entries:
+                try:
+                    sizes.append(os.path.getsize(src))
+                except OSError:
+                    sizes.append(0)
+            total = max(sum(sizes), 1)
+
+            folder = os.path.dirname(os.path.abspath(result.zip_path))
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(result.zip_path) + ".", suffix=".tmp", dir=folder)
+            os.close(fd)
+            written = set()
+            done = 0
+            last_emit = 0.0
+            with zipfile.ZipFile(tmp_path, "w", allowZip64=True) as zf:
+                for (name, src), size in zip(entries, sizes):
+                    # 원본을 열 수 없는 파일은 zip 에 아무것도 쓰기 전이므로 건너뛴다
+                    fsrc = None
+                    try:
+                        fsrc = open(src, "rb")
+                        # 1980 년 이전 수정시각은 ZIP 에 담을 수 없으므로 1980-01-01 로 기록 (ValueError 대신)
+                        info = zipfile.ZipInfo.from_file(src, name, strict_timestamps=False)
+                    except (OSError, ValueError) as e:
+                        if fsrc is not None:
+                            fsrc.close()
+                        result.failed.append((src, str(e)))
+                        continue
+                    info.compress_type = compress_type_for(src)
+                    # ZipInfo 의 file_size 로 ZIP64 사용 여부가 정해짐 (from_file 이 채움)
+                    # 항목을 쓰기 시작한 뒤의 오류는 잘린 항목이 zip 에 남으므로 임시 아카이브 전체를 실패로 처리
+                    with fsrc, zf.open(info, "w") as fdst:
+                        try:
+                            while True:
+                                chunk = fsrc.read(CHUNK_SIZE)
+                                if not chunk:
+                                    break
+                                if self._cancel_requested:
+                                    raise ExportCancelled()
+                                fdst.write(chunk)
+                                done += len(chunk)
+                                now = time.time()
+                                if now - last_emit >= PROGRESS_INTERVAL:
+                                    last_emit = now
+                                    self.progress.emit(min(99, done * 100 // total), name)
+                        except OSError as e:
+                            raise OSError(f"{src}: {e}") from e
+                    written.add(name)
+                    result.entries += 1
+                    result.total_bytes += size
+
+                # manifest.csv (Excel 에서 한글이 깨지지 않도록 BOM 포함 UTF-8)
+                info = zipfile.ZipInfo(MANIFEST_NAME, date_time=datetime.datetime.now().timetuple()[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with zf.open(info, "w") as raw:
+                    with io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as text:
+                        writer = csv.writer(text)
+                        writer.writerow(MANIFEST_COLUMNS)
+                        for row in self.iter_manifest_rows(names, written):
+                            writer.writerow(row)
+                            result.manifest_rows += 1
+            os.replace(tmp_path, result.zip_path)
+            tmp_path = None
+            self.progress.emit(100, "완료")
+        except ExportCancelled:
+            result.cancelled = True
+        except OSError as e:
+            # zip 파일은 만들어지지 않음
+            result.entries = result.manifest_rows = result.total_bytes = 0
+            result.failed.append((result.zip_path, str(e)))
+        except Exception as e:
+            # 예상하지 못한 오류도 completed 는 보내야 진행률 창이 닫히고 다음 내보내기를 시작할 수 있음
+            result.entries = result.manifest_rows = result.total_bytes = 0
+            result.failed.append((result.zip_path, f"{type(e).__name__}: {e}"))
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+        result.elapsed = time.time() - start
+        self.completed.emit(result)
@@ -0,0 +1,193 @@
+# asset_index.py
+
+import os
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from asset_scanner import ASSET_TYPES, ScanResult, build_scan_result
+
+# ─────────────────────────────────────────────────────────────
+# 자산 폴더 인덱스 (01_excel/asset_index.json)
+#   폴더별 mtime 과 파일별 [크기, mtime] 을 저장해 두고,
+#   Refresh 때 폴더 mtime 이 바뀐 폴더만 다시 읽는다.
+#   화면에 반영할 변경분은 마지막으로 반영된(mark_applied) 목록과 비교해 계산하므로,
+#   반영되지 못한(취소된) Refresh 의 변경분도 다음 Refresh 에서 다시 나온다.
+#   파일은 캐시일 뿐이므로 지워도 되며, 손상되면 전체 스캔으로 다시 만든다.
+# ─────────────────────────────────────────────────────────────
+INDEX_VERSION = 1
+INDEX_FILENAME = "asset_index.json"
+
+
+class FolderDelta:
+    """폴더 하나의 변경 내역 (파일명 기준)"""
+    def __init__(self, rescanned=False, added=(), removed=(), changed=()):
+        self.rescanned = rescanned
+        self.added = list(added)
+        self.removed = list(removed)
+        self.changed = list(changed)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+class AssetIndex:
+    """
+    자산 폴더 인덱스. refresh() 는 폴더마다 os.stat 한 번으로 변경 여부를 판단하고,
+    바뀐 폴더만 os.scandir 로 다시 읽는다. 여러 스레드에서 호출해도 안전하다.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.folders = {}      # 폴더명 -> {"mtime_ns": int, "entries": {파일명: [크기, mtime_ns]}}
+        self.applied = {}      # 폴더명 -> 화면에 마지막으로 반영된 entries (mark_applied 로 갱신)
+        self._results = {}     # 폴더명 -> (mtime_ns, ScanResult) : 메모리 캐시
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """인덱스 파일을 읽는다. 없거나 손상되었으면 빈 인덱스를 반환."""
+        index = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                index.folders = data.get("folders", {})
+        except (OSError, ValueError):
+            pass
+        return index
+
+    def save(self):
+        """임시 파일에 쓴 뒤 os.replace 로 교체. 실패해도 예외를 올리지 않는다."""
+        tmp_path = None
+        try:
+            folder = os.path.dirname(self.path) or "."
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=INDEX_FILENAME + ".", suffix=".tmp", dir=folder)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "folders": self.folders}, f, ensure_ascii=False)
+            os.chmod(tmp_path, 0o644)  # mkstemp 기본 권한(0600) 대신 다른 사용자도 읽을 수 있게
+            os.replace(tmp_path, self.path)
+            tmp_path = None
+            return True
+        except OSError:
+            return False
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _refresh_folder(self, asset_type, base_path):
+        folder_path = os.path.join(base_path, asset_type.folder)
+        cached = self.folders.get(asset_type.folder)
+        try:
+            mtime_ns = os.stat(folder_path).st_mtime_ns
+        except OSError:
+            result = ScanResult(asset_type, folder_path)
+            result.exists = False
+            old_entries = cached["entries"] if cached else {}
+            return None, result, FolderDelta(True, removed=old_entries)
+
+        # 폴더 mtime 이 같으면 저장된 목록을 그대로 사용 (stat 한 번)
+        if cached and cached.get("mtime_ns") == mtime_ns:
+            memo = self._results.get(asset_type.folder)
+            if memo and memo[0] == mtime_ns and memo[1].folder_path == folder_path:
+                return cached, memo[1], FolderDelta()
+            result = build_scan_result(asset_type, folder_path, cached["entries"])
+            return cached, result, FolderDelta()
+
+        entries = {}
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat()
+                    entries[entry.name] = [st.st_size, st.st_mtime_ns]
+                except OSError:
+                    entries[entry.name] = [0, 0]
+        old_entries = cached["entries"] if cached else {}
+        delta = FolderDelta(
+            True,
+            added=[name for name in entries if name not in old_entries],
+            removed=[name for name in old_entries if name not in entries],
+            changed=[name for name, info in entries.items()
+                     if name in old_entries and old_entries[name] != info],
+        )
+        result = build_scan_result(asset_type, folder_path, entries)
+        return {"mtime_ns": mtime_ns, "entries": entries}, result, delta
+
+    def _timed_refresh_folder(self, asset_type, base_path, timing):
+        with timing.span(f"scan:{asset_type.label}") as span:
+            outcome = self._refresh_folder(asset_type, base_path)
+            span.count(files=outcome[1].total_files, rescanned=outcome[2].rescanned)
+            return outcome
+
+    def refresh(self, base_path, asset_types=ASSET_TYPES, log=None, timing=None):
+        """
+        모든 자산 폴더를 동시에 갱신하고 ScanResult 목록을 반환 (각 result.entries 에 폴더 목록).
+        log 가 주어지면 이전 스캔 대비 추가/삭제/변경 개수를 기록한다.
+        화면에 반영할 변경분은 affected_parts(results) 로 구한다.
+        timing(perf_timing 구간)이 주어지면 폴더별 "scan:<라벨>" 구간을 남긴다.
+        """
+        def refresh_folder(asset_type):
+            if timing is None:
+                return self._refresh_folder(asset_type, base_path)
+            return self._timed_refresh_folder(asset_type, base_path, timing)
+
+        with self._lock:
+            with ThreadPoolExecutor(max_workers=len(asset_types)) as pool:
+                outcomes = list(pool.map(refresh_folder, asset_types))
+
+            results = []
+            dirty = False
+            for asset_type, (folder_state, result, delta) in zip(asset_types, outcomes):
+                result.entries = folder_state["entries"] if folder_state is not None else {}
+                results.append(result)
+                if folder_state is None:
+                    dirty = dirty or asset_type.folder in self.folders
+                    self.folders.pop(asset_type.folder, None)
+                    self._results.pop(asset_type.folder, None)
+                else:
+                    if delta.rescanned:
+                        dirty = True
+                    self.folders[asset_type.folder] = folder_state
+                    self._results[asset_type.folder] = (folder_state["mtime_ns"], result)
+                if log:
+                    if delta.rescanned:
+                        log(f"[asset_index:{asset_type.label}] 추가 {len(delta.added)}, "
+                            f"삭제 {len(delta.removed)}, 변경 {len(delta.changed)}")
+                    else:
+                        log(f"[asset_index:{asset_type.label}] 변경 없음")
+            if dirty:
+                self.save()
+            return results
+
+    def affected_parts(self, results):
+        """
+        refresh 결과와 화면에 마지막으로 반영된 목록을 비교해 추가/삭제/변경된 파일의 파트넘버 집합.
+        아직 반영된 적 없는 폴더가 있으면 None (파일 딕셔너리 전체를 바꿔야 함).
+        """
+        with self._lock:
+            applied = dict(self.applied)
+        parts = set()
+        for result in results:
+            base = applied.get(result.asset_type.folder)
+            if base is None:
+                return None
+            entries = result.entries
+            if entries is base:
+                continue  # 반영된 뒤로 다시 읽지 않은 폴더
+            part_rule = result.asset_type.part_rule
+            for fname in base.keys() | entries.keys():
+                if base.get(fname) != entries.get(fname):
+                    part_number = part_rule(fname)
+                    if part_number is not None:
+                        parts.add(part_number)
+        return parts
+
+    def mark_applied(self, results):
+        """results(refresh 결과)의 폴더 목록이 화면(파일 딕셔너리)에 반영되었음을 기록"""
+        with self._lock:
+            for result in results:
+                if result.entries is not None:
+                    self.applied[result.asset_type.folder] = result.entries
@@ -0,0 +1,151 @@
+# asset_scanner.py
+
+import os
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+
+def extract_part_number(fname):
+    """
+    파일명 예: aaa_bbb_ccc_PARTNO.ext 에서 PARTNO(대문자)를 추출.
+    언더스코어로 나눈 요소가 4개 미만이면 None.
+    """
+    file_parts = fname.split("_")
+    if len(file_parts) < 4:
+        return None
+    return os.path.splitext(file_parts[3])[0].upper()
+
+
+# ─────────────────────────────────────────────────────────────
+# 자산 종류 테이블
+#   key        : files_dict 키 / 카운트 속성 접두어 (예: image_folder_count)
+#   label      : 로그에 표시할 이름
+#   folder     : 실행 폴더 기준 하위 폴더명
+#   extensions : 대상 확장자 (소문자)
+#   part_rule  : 파일명 -> 파트넘버 (None 이면 형식 오류)
+# ─────────────────────────────────────────────────────────────
+AssetType = namedtuple("AssetType", "key label folder extensions part_rule")
+
+ASSET_TYPES = (
+    AssetType("image", "Image", "00_image", (".png", ".jpg"), extract_part_number),
+    AssetType("xml3d", "3DXML", "02_3dxml", (".3dxml",), extract_part_number),
+    AssetType("fbx", "FBX", "03_fbx", (".fbx",), extract_part_number),
+)
+
+
+class ScanResult:
+    """폴더 하나의 스캔 결과"""
+    def __init__(self, asset_type, folder_path):
+        self.asset_type = asset_type
+        self.folder_path = folder_path
+        self.exists = True
+        self.files = {}         # 파트넘버 -> 파일 경로 (최초 파일)
+        self.total_files = 0    # 폴더 내 전체 항목 수
+        self.folder_count = 0   # 확장자가 맞는 파일 수
+        self.duplicates = {}    # 파트넘버 -> [중복된 파일명, ...]
+        self.invalid_files = [] # 파일명 형식 오류
+        self.entries = None     # AssetIndex 가 읽은 폴더 목록 {파일명: [크기, mtime_ns]} (인덱스 없이 스캔하면 None)
+
+    @property
+    def duplicate_count(self):
+        return sum(len(v) for v in self.duplicates.values())
+
+
+def build_scan_result(asset_type, folder_path, names):
+    """폴더 내 파일명 목록(디렉터리 순서)으로 파일 등록, 중복, 형식 오류를 한 번에 집계"""
+    result = ScanResult(asset_type, folder_path)
+    extensions = asset_type.extensions
+    part_rule = asset_type.part_rule
+    files = result.files
+    for fname in names:
+        result.total_files += 1
+        if not fname.lower().endswith(extensions):
+            continue
+        result.folder_count += 1
+        part_number = part_rule(fname)
+        if part_number is None:
+            result.invalid_files.append(fname)
+        elif part_number in files:
+            result.duplicates.setdefault(part_number, []).append(fname)
+        else:
+            files[part_number] = os.path.join(folder_path, fname)
+    return result
+
+
+def scan_asset_folder(asset_type, base_path):
+    """os.scandir 로 폴더를 한 번만 훑어서 ScanResult 를 만든다"""
+    folder_path = os.path.join(base_path, asset_type.folder)
+    try:
+        with os.scandir(folder_path) as entries:
+            names = [entry.name for entry in entries]
+    except (FileNotFoundError, NotADirectoryError):
+        result = ScanResult(asset_type, folder_path)
+        result.exists = False
+        return result
+    return build_scan_result(asset_type, folder_path, names)
+
+
+def log_scan_result(result, log):
+    """
+    스캔 결과를 로그에 출력. log(메시지, 수준) 형식 (window/LoadContext 의 appendLog).
+    형식 오류 파일과 중복 목록은 개수 요약만 WARNING 으로, 파일별 내역은 DEBUG 로 남긴다.
+    """
+    tag = f"[scan_assets:{result.asset_type.label}]"
+    if not result.exists:
+        log(f"{tag} {result.asset_type.folder} 폴더를 찾을 수 없습니다: {result.folder_path}", logging.WARNING)
+        return
+    log(f"{tag} 전체 파일 수: {result.total_files}")
+    for fname in result.invalid_files:
+        log(f"{tag} 파일명 형식 오류(언더스코어 분리 부족): {fname}", logging.DEBUG)
+
+    # 중복 로그: 각 파트넘버에 대해 최초 파일과 중복 파일을 모두 보여줌
+    if result.duplicates:
+        duplicate_log_lines = [f"{tag} 중복된 PARTNO 로그:"]
+        for part_number, dup_file_list in result.duplicates.items():
+            duplicate_log_lines.append(f"[{part_number}]")
+            duplicate_log_lines.append(f"-> {os.path.basename(result.files[part_number])}")
+            for dup in dup_file_list:
+                duplicate_log_lines.append(f"-> {dup}")
+        log("\n".join(duplicate_log_lines), logging.DEBUG)
+        log(f"{tag} 중복된 PARTNO {len(result.duplicates)}개 (중복 파일 {result.duplicate_count}개, "
+            f"목록은 DEBUG 로그)", logging.WARNING)
+
+    log(f"{tag} 유효한 {result.asset_type.label} 파일 처리 수: {len(result.files)}")
+    log(f"총 {len(result.files)}개의 {result.asset_type.label} 파일이 추가되었습니다.")
+    if result.invalid_files:
+        sample = ", ".join(result.invalid_files[:5])
+        more = f" 외 {len(result.invalid_files) - 5}개" if len(result.invalid_files) > 5 else ""
+        log(f"{tag} 올바르지 않은 형식의 파일 {len(result.invalid_files)}개: {sample}{more}", logging.WARNING)
+
+
+def scan_assets(window, files, base_path, asset_types=ASSET_TYPES, index=None, timing=None):
+    """
+    자산 폴더들을 스레드 풀에서 동시에 스캔하여 files[key] 를 채우고,
+    window(또는 LoadContext)에 {key}_folder_count / _duplicate_count / _registered_count 를 기록.
+    index(AssetIndex)가 주어지면 mtime 이 바뀐 폴더만 다시 읽는다.
+    timing(perf_timing 구간)이 주어지면 폴더별 "scan:<라벨>" 구간을 남긴다 (동시에 실행되므로 합계가 전체보다 클 수 있음).
+    로그는 테이블 순서대로 출력한다. 스캔 결과 목록을 반환.
+    """
+    if index is not None:
+        results = index.refresh(base_path, asset_types, log=window.appendLog, timing=timing)
+    else:
+        def scan(asset_type):
+            if timing is None:
+                return scan_asset_folder(asset_type, base_path)
+            with timing.span(f"scan:{asset_type.label}") as span:
+                result = scan_asset_folder(asset_type, base_path)
+                span.count(files=result.total_files)
+                return result
+
+        with ThreadPoolExecutor(max_workers=len(asset_types)) as pool:
+            results = list(pool.map(scan, asset_types))
+
+    for result in results:
+        key = result.asset_type.key
+        files[key] = result.files
+        log_scan_result(result, window.appendLog)
+        setattr(window, f"{key}_folder_count", result.folder_count)
+        setattr(window, f"{key}_duplicate_count", result.duplicate_count)
+        setattr(window, f"{key}_registered_count", len(result.files))
+    return results
@@ -0,0 +1,55 @@
+# asset_watcher.py
+
+import os
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from asset_scanner import ASSET_TYPES
+
+# 파일 이벤트가 멈춘 뒤 갱신까지 기다리는 시간 (ms)
+DEBOUNCE_MS = 700
+
+
+class AssetWatcher(QObject):
+    """
+    자산 폴더(00_image, 02_3dxml, 03_fbx)를 QFileSystemWatcher 로 감시.
+    짧은 시간에 몰려 오는 파일 이벤트를 DEBOUNCE_MS 동안 모아서 changed 를 한 번만 보낸다.
+    실행 폴더도 함께 감시하여 나중에 생성된 자산 폴더도 감시 대상에 추가한다.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, base_path, asset_types=ASSET_TYPES, delay_ms=DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.base_path = base_path
+        self.folder_paths = [os.path.join(base_path, t.folder) for t in asset_types]
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.changed.emit)
+        self.active = False
+
+    def start(self):
+        self.active = True
+        self._watch_existing()
+
+    def stop(self):
+        self.active = False
+        self._timer.stop()
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+
+    def _watch_existing(self):
+        watched = set(self._watcher.directories())
+        paths = [self.base_path] + self.folder_paths
+        missing = [p for p in paths if p not in watched and os.path.isdir(p)]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _on_directory_changed(self, path):
+        if not self.active:
+            return
+        if path == self.base_path:
+            # 자산 폴더가 새로 생기거나 지워졌을 수 있음
+            self._watch_existing()
+        self._timer.start()  # 이벤트가 이어지는 동안 타이머를 계속 뒤로 미룸
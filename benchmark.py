@@ -0,0 +1,324 @@
+# benchmark.py
+
+import os
+import sys
+import gc
+import json
+import time
+import random
+import argparse
+import datetime
+import platform
+import subprocess
+from collections import deque
+
+# ─────────────────────────────────────────────────────────────
+# 합성 BOM 벤치마크
+#   python benchmark.py [--rows 20000] [--depth 8] [--fanout 6] [--dup-rate 0.1] [--files 5000]
+#   1) 작업 폴더(--workdir)에 합성 엑셀(01_excel/data.xlsx)과 00_image / 02_3dxml / 03_fbx 폴더를 만든다.
+#      (aaa_bbb_ccc_파트넘버.확장자 형식, 같은 설정이면 다시 만들지 않음)
+#   2) FA50_BASE_PATH 로 그 폴더를 지정하고 오프스크린 Qt 에서 실제 코드 경로를 단계별로 측정한다.
+#   3) 단계별 시간과 최대 메모리(RSS)를 결과 파일(JSON Lines)에 한 줄로 덧붙이고,
+#      같은 설정의 이전 기록과 비교한다 (--fail-threshold 를 넘으면 종료 코드 1).
+# ─────────────────────────────────────────────────────────────
+DEFAULT_RESULTS = "benchmark_results.jsonl"
+PARAMS_FILENAME = "bench_params.json"
+GENERATOR_VERSION = 1
+EXCEL_COLUMNS = (
+    "S/N", "Level", "Type", "Part No", "Part Rev", "Part Status", "Latest", "Nomenclature",
+    "Instance ID 총수량(ALL DB)", "Qty", "Owner", "Created", "Modified", "NextPart",
+)
+ASSET_FOLDERS = (("00_image", ".png"), ("02_3dxml", ".3dxml"), ("03_fbx", ".fbx"))
+NOUNS = ("BRACKET", "PANEL", "FITTING", "HARNESS", "CLAMP", "SPAR", "RIB", "VALVE", "PUMP", "DUCT")
+# 이 시간(초)보다 짧은 단계는 회귀 판정에서 제외 (측정 오차)
+MIN_COMPARE_SECONDS = 0.005
+
+
+# ─── 합성 데이터 ──────────────────────────────────────────────
+
+def generate_bom(rows, depth, fanout, dup_rate, seed):
+    """
+    (파트넘버, 부모 파트넘버, 레벨) 목록. 너비 우선으로 노드마다 평균 fanout 개의 자식을 만들고,
+    dup_rate 확률로 같은 레벨에 이미 만든 조립품을 다시 사용한다 (반복 하위 조립품, 순환 없음).
+    """
+    rng = random.Random(seed)
+    root = "ROOT-000000"
+    bom = [(root, "", 0)]
+    by_level = {}          # 레벨 -> 그 레벨에서 새로 만든 파트 (재사용 후보)
+    frontier = deque([(root, 0)])
+    counter = 1
+    while len(bom) < rows and frontier:
+        parent, level = frontier.popleft()
+        count = max(1, int(round(rng.gauss(fanout, fanout / 3))))
+        for _ in range(count):
+            if len(bom) >= rows:
+                break
+            pool = by_level.get(level + 1)
+            if pool and rng.random() < dup_rate:
+                bom.append((rng.choice(pool), parent, level + 1))
+                continue
+            child = f"P{counter:07d}"
+            counter += 1
+            bom.append((child, parent, level + 1))
+            by_level.setdefault(level + 1, []).append(child)
+            if level + 1 < depth:
+                frontier.append((child, level + 1))
+    return bom
+
+
+def generate_workdir(workdir, rows, depth, fanout, dup_rate, files, seed, log=print):
+    """작업 폴더에 합성 엑셀과 자산 폴더를 만든다. 같은 설정으로 이미 만들어져 있으면 건너뜀."""
+    import pandas as pd
+
+    params = {"version": GENERATOR_VERSION, "rows": rows, "depth": depth, "fanout": fanout,
+              "dup_rate": dup_rate, "files": files, "seed": seed}
+    params_path = os.path.join(workdir, PARAMS_FILENAME)
+    try:
+        with open(params_path, "r", encoding="utf-8") as f:
+            if json.load(f) == params:
+                log(f"[bench] 기존 합성 데이터 사용: {workdir}")
+                return params
+    except (OSError, ValueError):
+        pass
+
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    bom = generate_bom(rows, depth, fanout, dup_rate, seed)
+    data = [
+        (n + 1, level, "Part", part, "A", "Released", "Y",
+         f"{rng.choice(NOUNS)} {part}", 1, rng.randint(1, 4), "bench", "", "", parent)
+        for n, (part, parent, level) in enumerate(bom)
+    ]
+    excel_dir = os.path.join(workdir, "01_excel")
+    os.makedirs(excel_dir, exist_ok=True)
+    for name in os.listdir(excel_dir):  # 이전 설정의 캐시/인덱스 제거
+        if name != "memo.json":
+            os.remove(os.path.join(excel_dir, name))
+    pd.DataFrame(data, columns=EXCEL_COLUMNS).to_excel(
+        os.path.join(excel_dir, "data.xlsx"), sheet_name="Sheet1", index=False
+    )
+
+    unique_parts = list(dict.fromkeys(part for part, _, _ in bom))
+    for folder, ext in ASSET_FOLDERS:
+        path = os.path.join(workdir, folder)
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            os.remove(os.path.join(path, name))
+        for part in rng.sample(unique_parts, min(files, len(unique_parts))):
+            open(os.path.join(path, f"aaa_bbb_ccc_{part}{ext}"), "wb").close()
+
+    with open(params_path, "w", encoding="utf-8") as f:
+        json.dump(params, f)
+    log(f"[bench] 합성 데이터 생성: 행 {len(bom)}, 파트 {len(unique_parts)}, "
+        f"폴더별 파일 {min(files, len(unique_parts))} ({time.perf_counter() - start:.1f}s)")
+    return params
+
+
+# ─── 측정 ─────────────────────────────────────────────────────
+
+def peak_rss_mb():
+    """지금까지의 프로세스 최대 메모리 사용량(MB). 측정할 수 없으면 None."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+    except ImportError:
+        pass
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return round(counters.PeakWorkingSetSize / (1024 * 1024), 1)
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+class Bench:
+    """단계별 시간과 그 시점까지의 최대 메모리를 기록"""
+    def __init__(self, log=print):
+        self.steps = {}
+        self.log = log
+
+    def measure(self, name, func, *args, calls=1):
+        """func(*args) 한 번의 시간. calls 는 그 안에서 반복한 호출 수 (호출당 시간 표시용)."""
+        gc.collect()
+        start = time.perf_counter()
+        value = func(*args)
+        elapsed = time.perf_counter() - start
+        self.steps[name] = {"seconds": round(elapsed, 4), "calls": calls, "peak_rss_mb": peak_rss_mb()}
+        per_call = f" ({elapsed / calls * 1000:.2f}ms/회)" if calls > 1 else ""
+        self.log(f"[bench] {name}: {elapsed:.3f}s{per_call}")
+        return value
+
+
+def run_benchmarks(workdir, lookups, seed, log=print):
+    """오프스크린 Qt 에서 실제 MainWindow 와 tree_manager 함수를 단계별로 측정하여 steps 를 반환."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["FA50_BASE_PATH"] = workdir
+    from PyQt5.QtWidgets import QApplication
+    from ui_functionality import MainWindow
+    from tree_manager import build_tree_view, apply_tree_view_styles, display_part_info
+    from bom_loader import LoadContext
+    from asset_scanner import scan_assets
+
+    app = QApplication.instance() or QApplication([])
+    bench = Bench(log)
+    excel_path = os.path.join(workdir, "01_excel", "data.xlsx")
+
+    bench.measure("scan_assets", lambda: scan_assets(LoadContext(), {}, workdir))
+
+    window = MainWindow()
+    window.checkbox_watch.setChecked(False)  # 측정 중 폴더 감시로 인한 재로딩 방지
+    window.json_file_path = os.path.join(workdir, "01_excel", "memo.json")
+    window.load_memo_data()
+
+    # 엑셀 파싱부터 (파싱 캐시 끔) → 캐시 생성 → 캐시 사용
+    os.environ["FA50_PARSE_CACHE"] = "0"
+    bench.measure("build_tree_view (parse)", build_tree_view, excel_path, window)
+    os.environ["FA50_PARSE_CACHE"] = "1"
+    build_tree_view(excel_path, window)
+    bench.measure("build_tree_view (cached)", build_tree_view, excel_path, window)
+    app.processEvents()
+
+    tree = window.tree
+    model = tree.model()
+    for style in ("image", "3dxml", "fbx"):
+        bench.measure(f"apply_tree_view_styles ({style})", apply_tree_view_styles, tree, style)
+    bench.measure("expand_to_depth_2", tree.expandToDepth, 2)
+    for style, key in (("image", "image"), ("3dxml", "xml3d"), ("fbx", "fbx")):
+        apply_tree_view_styles(tree, style)
+        bench.measure(f"filter_tree_items ({style})", window.filter_tree_items, tree, key)
+        bench.measure(f"count_visible ({style})", model.count_visible)
+        window.clear_tree_filter(tree)
+
+    graph = window.bom_graph
+    rng = random.Random(seed)
+    reachable = [graph.keys[p] for p in range(len(graph)) if graph.depth[p] >= 0]
+    sample = [rng.choice(reachable) for _ in range(lookups)]
+    indexes = bench.measure("find_item", lambda: [tree.find_item(key) for key in sample], calls=len(sample))
+
+    def show_all():
+        for key, index in zip(sample, indexes):
+            display_part_info(key, window, model.row_for_index(index))
+    bench.measure("display_part_info", show_all, calls=len(sample))
+
+    search_index, fuzzy_index = window.search_index, window.fuzzy_index
+    prefixes = [key[:max(2, len(key) - 2)] for key in sample]
+    bench.measure("search occurrences", lambda: [search_index.occurrences(p) for p in prefixes], calls=len(sample))
+    words = [f"{key[1:]} {fuzzy_index.labels[graph.lookup(key)].split(' ')[0]}" for key in sample]
+    bench.measure("fuzzy search", lambda: [fuzzy_index.search(w) for w in words], calls=len(sample))
+
+    info = {"nodes": int(graph.node_count), "parts": int(len(graph))}
+    window.close()
+    app.processEvents()
+    return bench.steps, info
+
+
+# ─── 결과 기록 / 비교 ─────────────────────────────────────────
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def previous_record(results_path, params):
+    """같은 합성 설정으로 기록된 마지막 결과 (없으면 None)"""
+    last = None
+    try:
+        with open(results_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("params") == params:
+                    last = record
+    except OSError:
+        pass
+    return last
+
+
+def compare(previous, steps, threshold, log=print):
+    """이전 기록 대비 단계별 변화율을 출력하고, threshold 보다 느려진 단계 이름 목록을 반환."""
+    regressions = []
+    log(f"[bench] 비교 대상: {previous.get('time')} ({previous.get('revision') or '-'})")
+    for name, step in steps.items():
+        old = previous.get("steps", {}).get(name)
+        if not old:
+            continue
+        before, after = old["seconds"], step["seconds"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold and after >= MIN_COMPARE_SECONDS:
+            flag = "  <-- 느려짐"
+            regressions.append(name)
+        log(f"  {name:<34} {before:>9.4f}s -> {after:>9.4f}s  {change:+7.1%}{flag}")
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="합성 BOM 으로 로딩/스타일/필터/검색 성능을 측정합니다.")
+    parser.add_argument("--rows", type=int, default=20000, help="엑셀 행 수")
+    parser.add_argument("--depth", type=int, default=8, help="최대 BOM 깊이")
+    parser.add_argument("--fanout", type=float, default=6, help="조립품당 평균 자식 수")
+    parser.add_argument("--dup-rate", type=float, default=0.1, help="반복 하위 조립품 비율 (0~1)")
+    parser.add_argument("--files", type=int, default=5000, help="자산 폴더별 파일 수")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--lookups", type=int, default=200, help="find_item / 검색 반복 횟수")
+    parser.add_argument("--workdir", default=None, help="합성 데이터 폴더 (기본: ./bench_data)")
+    parser.add_argument("--results", default=DEFAULT_RESULTS, help="결과 파일 (JSON Lines, 덧붙임)")
+    parser.add_argument("--tag", default="", help="결과에 함께 남길 메모")
+    parser.add_argument("--fail-threshold", type=float, default=None,
+                        help="이전 기록보다 이 비율(예: 0.2) 이상 느려진 단계가 있으면 종료 코드 1")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    workdir = os.path.abspath(args.workdir or os.path.join(os.getcwd(), "bench_data"))
+    params = generate_workdir(workdir, args.rows, args.depth, args.fanout, args.dup_rate, args.files, args.seed)
+    steps, info = run_benchmarks(workdir, args.lookups, args.seed)
+
+    record = {
+        "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "revision": git_revision(),
+        "tag": args.tag,
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "params": params,
+        "graph": info,
+        "steps": steps,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    previous = previous_record(args.results, params)
+    with open(args.results, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"[bench] 결과 저장: {os.path.abspath(args.results)} (최대 메모리 {record['peak_rss_mb']}MB)")
+
+    if previous is not None:
+        regressions = compare(previous, steps, args.fail_threshold or 0.2)
+        if args.fail_threshold is not None and regressions:
+            print(f"[bench] 느려진 단계: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,447 @@
+# bom_graph.py
+
+import heapq
+import numpy as np
+import pandas as pd
+
+
+class BomGraph:
+    """
+    BOM 관계를 정수 배열로 보관하는 그래프.
+
+    - keys       : 파트 id -> 파트넘버 (pd.factorize 로 중복 제거)
+    - child_ptr  : CSR 인덱스. 파트 p 의 자식 슬롯은 child_ptr[p]:child_ptr[p+1]
+    - child_idx  : 슬롯 -> 자식 파트 id (엑셀 행 순서 유지)
+    - first_child: 파트 -> 첫 번째 자식 슬롯 (-1 이면 자식 없음)
+    - next_sibling: 슬롯 -> 같은 부모의 다음 슬롯 (-1 이면 마지막)
+    - parent     : 파트 -> 트리뷰 상 최초 등장 위치의 부모 파트 id (-1 이면 루트/미도달)
+    - depth      : 파트 -> 루트에서의 최장 경로 길이 (-1 이면 미도달). 모든 관계에서 자식이 부모보다 깊다.
+    - node_size  : 파트 -> 그 파트의 노드 하나를 끝까지 펼쳤을 때의 노드 수 (자신 포함)
+    - slot_row   : 슬롯 -> 해당 관계가 기록된 엑셀 행 위치 (DataFrame iloc 기준)
+    - first_row  : 파트 -> PartNo 로 처음 등장하는 엑셀 행 위치 (-1 이면 NextPart 로만 등장)
+    - root_rows  : roots 와 같은 순서로, 각 최종 루트가 처음 기록된 행 위치
+    - root_position: 파트 -> 트리뷰 최상위에서의 위치 (-1 이면 최종 루트가 아님)
+    - part_source: 파트 -> 출처(엑셀/시트) 번호. source_labels[번호] 가 출처 이름
+
+    BOM 은 DAG 로 다룬다. 하위 조립품의 자식 목록은 파트마다 한 번만 저장하고,
+    같은 하위 조립품이 여러 곳에 쓰이면 모든 위치(occurrence)가 같은 자식 목록을 공유하여 펼쳐진다.
+    메모리는 전체 occurrence 수가 아니라 파트/관계 수에 비례한다.
+    최종 루트가 여럿이면 모두 최상위 노드가 되는 숲(forest)으로 보여준다 (root 는 첫 번째 루트).
+    여러 출처를 합친 그래프에서는 출처마다 파트 id 가 따로 있으므로 keys 에 같은 파트넘버가 여러 번 나올 수 있다.
+    순환 관계(조상 파트로 되돌아가는 슬롯)만 펼치지 않으며, 펼치는 슬롯은 expand_edge 로 표시된다.
+    """
+    def __init__(self, keys, edge_parent, edge_child, roots, total_parts=0,
+                 edge_rows=None, first_row=None, root_rows=None, part_source=None, source_labels=None):
+        self.keys = keys
+        self.upper_keys = pd.Series(keys, dtype=object).str.upper().to_numpy(dtype=object)
+        self.key_index = pd.Index(keys)
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.total_parts = total_parts
+        n = len(keys)
+
+        # CSR 자식 인덱스 (같은 부모 안에서는 엑셀 행 순서 유지)
+        order = np.argsort(edge_parent, kind="stable")
+        self.child_idx = edge_child[order]
+        self.slot_row = edge_rows[order] if edge_rows is not None else np.full(len(order), -1, dtype=np.int64)
+        self.first_row = first_row if first_row is not None else np.full(n, -1, dtype=np.int64)
+        self.root_rows = root_rows if root_rows is not None else np.full(len(roots), -1, dtype=np.int64)
+        self.part_source = part_source if part_source is not None else np.zeros(n, dtype=np.int64)
+        self.source_labels = list(source_labels) if source_labels is not None else [""]
+        self.root_position = np.full(n, -1, dtype=np.int64)
+        self.root_position[roots] = np.arange(len(roots), dtype=np.int64)
+        self.outdeg = np.bincount(edge_parent, minlength=n)
+        self.child_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(self.outdeg, out=self.child_ptr[1:])
+        self.slot_parent = np.repeat(np.arange(n, dtype=np.int64), self.outdeg)
+
+        self.first_child = np.where(self.outdeg > 0, self.child_ptr[:-1], -1)
+        self.next_sibling = np.arange(1, len(self.child_idx) + 1, dtype=np.int64)
+        last_slots = self.child_ptr[1:][self.outdeg > 0] - 1
+        self.next_sibling[last_slots] = -1
+
+        self.root = int(self.roots[0]) if len(self.roots) else -1
+        self._compute_layout()
+
+    @classmethod
+    def from_columns(cls, part_nos, next_parts, sources=None, source_labels=None):
+        """
+        공백 제거된 PartNo / NextPart 문자열 컬럼으로 그래프를 만든다 (행 단위 파이썬 루프 없음).
+        NextPart 가 비어 있거나 'nan' 인 행은 최종 루트로 취급.
+        sources 는 행별 출처 번호 배열로, 주어지면 (출처, 파트넘버) 단위로 파트를 나눈다.
+        같은 파트넘버라도 출처가 다르면 다른 파트 id 가 되어 출처별 BOM 구조가 섞이지 않는다.
+        """
+        part_values = part_nos.to_numpy(dtype=object)
+        next_values = next_parts.to_numpy(dtype=object)
+        valid = part_values != ""
+        is_root = valid & ((next_values == "") | (next_parts.str.lower().to_numpy(dtype=object) == "nan"))
+        is_edge = valid & ~is_root
+
+        valid_parts = part_values[valid]
+        names = np.concatenate([valid_parts, next_values[is_edge]])
+        if sources is None:
+            codes, uniques = pd.factorize(names)
+            part_source = None
+        else:
+            # (출처, 파트넘버) 쌍을 하나의 정수로 묶어 factorize
+            name_codes, name_uniques = pd.factorize(names)
+            sources = np.asarray(sources, dtype=np.int64)
+            width = max(len(name_uniques), 1)
+            pairs = np.concatenate([sources[valid], sources[is_edge]]) * width + name_codes
+            codes, pair_uniques = pd.factorize(pairs)
+            uniques = np.asarray(name_uniques, dtype=object)[pair_uniques % width]
+            part_source = (pair_uniques // width).astype(np.int64)
+        part_codes = codes[:len(valid_parts)]
+        edge_parent = codes[len(valid_parts):].astype(np.int64)
+        edge_child = part_codes[is_edge[valid]].astype(np.int64)
+
+        # 메타데이터 조회용 행 위치: 관계별 행, 파트별 첫 행, 루트별 첫 행
+        valid_rows = np.flatnonzero(valid)
+        edge_rows = np.flatnonzero(is_edge)
+        first_row = np.full(len(uniques), -1, dtype=np.int64)
+        first_row[part_codes[::-1]] = valid_rows[::-1]  # 뒤에서부터 채워 첫 행이 남게 함
+
+        root_part_codes = part_codes[is_root[valid]]
+        root_codes, root_first = np.unique(root_part_codes, return_index=True)
+        by_row = np.argsort(root_first)  # pd.unique 와 같은 첫 등장 순서
+        root_codes = root_codes[by_row]
+        root_rows = np.flatnonzero(is_root)[root_first[by_row]]
+
+        keys = np.asarray(uniques, dtype=object)
+        return cls(keys, edge_parent, edge_child, root_codes.astype(np.int64), int(valid.sum()),
+                   edge_rows=edge_rows, first_row=first_row, root_rows=root_rows,
+                   part_source=part_source, source_labels=source_labels)
+
+    def _compute_layout(self):
+        """
+        최종 루트들에서 차례로 깊이 우선 순회하여 (앞선 루트에서 이미 본 파트는 다시 훑지 않음)
+        각 파트의 최초 등장 슬롯(전위 순회 기준)과 순환 슬롯(순회 중인 조상으로 되돌아가는 관계)을 찾고,
+        순환 슬롯을 뺀 DAG 에서 최장 경로 깊이, 깊이별 슬롯 묶음, 펼친 노드 수를 계산한다.
+        각 파트의 자식은 한 번만 훑으므로 비용은 도달 가능한 파트/관계 수에 비례한다.
+        """
+        n = len(self.keys)
+        self.parent = np.full(n, -1, dtype=np.int64)
+        self.first_slot = np.full(n, -1, dtype=np.int64)
+        self.depth = np.full(n, -1, dtype=np.int64)
+        self.node_size = np.ones(n, dtype=np.int64)
+        self.expand_edge = np.ones(len(self.child_idx), dtype=bool)
+        self.cycle_slots = np.zeros(0, dtype=np.int64)
+        self.node_count = 0
+        self.level_slots = []
+        if self.root < 0:
+            self.order = np.zeros(0, dtype=np.int64)
+            return
+
+        ptr = self.child_ptr.tolist()
+        child = self.child_idx.tolist()
+        seen = bytearray(n)
+        on_path = bytearray(n)
+        order = []
+        children = []
+        first_slots = []
+        back_slots = []
+        postorder = []
+        for root in self.roots.tolist():
+            if seen[root]:
+                continue  # 앞선 루트의 하위 조립품으로 이미 순회함
+            seen[root] = on_path[root] = 1
+            order.append(root)
+            stack = [[root, ptr[root]]]
+            while stack:
+                top = stack[-1]
+                p, slot = top
+                if slot >= ptr[p + 1]:
+                    stack.pop()
+                    on_path[p] = 0
+                    postorder.append(p)
+                    continue
+                top[1] = slot + 1
+                c = child[slot]
+                if seen[c]:
+                    if on_path[c]:
+                        back_slots.append(slot)  # 순환: 펼치면 끝나지 않으므로 이 위치는 펼치지 않음
+                    continue
+                seen[c] = on_path[c] = 1
+                order.append(c)
+                children.append(c)
+                first_slots.append(slot)
+                stack.append([c, ptr[c]])
+
+        self.order = np.asarray(order, dtype=np.int64)
+        first_slots = np.asarray(first_slots, dtype=np.int64)
+        children = np.asarray(children, dtype=np.int64)
+        self.first_slot[children] = first_slots
+        self.parent[children] = self.slot_parent[first_slots]
+        self.cycle_slots = np.asarray(back_slots, dtype=np.int64)
+        self.expand_edge[self.cycle_slots] = False
+
+        # 최장 경로 깊이: 후위 순회의 역순이 (순환 슬롯을 뺀) 위상 정렬 순서
+        depth = [-1] * n
+        for root in self.roots.tolist():
+            depth[root] = 0
+        expand = self.expand_edge.tolist()
+        for p in reversed(postorder):
+            d = depth[p] + 1
+            for slot in range(ptr[p], ptr[p + 1]):
+                c = child[slot]
+                if expand[slot] and depth[c] < d:
+                    depth[c] = d
+        self.depth = np.asarray(depth, dtype=np.int64)
+
+        # 부모 깊이별 슬롯 묶음 (자식 → 부모 방향 일괄 계산용). 펼치는 슬롯은 자식이 항상 더 깊은 묶음에 있다.
+        slot_depth = self.depth[self.slot_parent]
+        reachable = np.flatnonzero(slot_depth >= 0)
+        reachable = reachable[np.argsort(slot_depth[reachable], kind="stable")]
+        bounds = np.searchsorted(slot_depth[reachable], np.arange(int(self.depth.max()) + 2))
+        self.level_slots = [reachable[bounds[d]:bounds[d + 1]] for d in range(len(bounds) - 1)]
+
+        # 펼친 노드 수: 공유되는 하위 조립품은 쓰인 위치마다 전체가 펼쳐진다
+        for slots in reversed(self.level_slots):
+            sizes = np.where(self.expand_edge[slots], self.node_size[self.child_idx[slots]], 1)
+            np.add.at(self.node_size, self.slot_parent[slots], sizes)
+        self.node_count = int(self.node_size[self.roots].sum())
+
+    # ─── 조회 ─────────────────────────────────────────────────
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, key):
+        """파트넘버 -> 파트 id (없으면 -1). 여러 출처에 있는 파트넘버는 첫 번째 출처의 id."""
+        try:
+            loc = self.key_index.get_loc(key)
+        except KeyError:
+            return -1
+        if isinstance(loc, (int, np.integer)):
+            return int(loc)
+        if isinstance(loc, slice):
+            return int(loc.start or 0)
+        return int(np.argmax(loc))  # 중복 키: bool 마스크의 첫 위치
+
+    def source_of(self, part):
+        """파트의 출처 이름 (출처가 하나뿐이면 그 이름, 없으면 빈 문자열)"""
+        return self.source_labels[int(self.part_source[part])] if part >= 0 else ""
+
+    def child_count(self, part):
+        return int(self.outdeg[part])
+
+    def child_slot(self, part, row):
+        return int(self.child_ptr[part]) + row
+
+    def row_of(self, part, slot=-1):
+        """
+        occurrence 의 엑셀 행 위치. slot 이 주어지면 그 관계가 기록된 행,
+        최종 루트면 루트 행, 그 밖에는 파트의 첫 행 (-1 이면 없음).
+        """
+        if slot >= 0:
+            return int(self.slot_row[slot])
+        if part >= 0 and self.root_position[part] >= 0:
+            return int(self.root_rows[self.root_position[part]])
+        return int(self.first_row[part]) if part >= 0 else -1
+
+    def is_reachable(self, part):
+        return self.depth[part] >= 0
+
+    def path_rows(self, part):
+        """
+        part 의 최초 등장 노드까지의 row 목록. 첫 값은 최종 루트의 최상위 위치이고,
+        이후는 각 단계의 자식 위치.
+        """
+        rows = []
+        while self.first_slot[part] >= 0:
+            slot = self.first_slot[part]
+            parent = self.parent[part]
+            rows.append(int(slot - self.child_ptr[parent]))
+            part = parent
+        rows.append(int(self.root_position[part]))
+        rows.reverse()
+        return rows
+
+    def occurrence_paths(self, flags, limit=None):
+        """
+        flags[파트 id] 가 True 인 파트가 트리뷰에 나타나는 모든 위치를 전위 순회 순서로 (파트 id, row 경로) 로 반환.
+        row 경로는 path_rows 와 같은 형식 (첫 값이 최종 루트의 최상위 위치).
+        공유 하위 조립품 안의 파트는 쓰인 위치마다 나오며, 일치하는 파트가 없는 하위 트리는
+        subtree_flags 로 미리 걸러 들어가지 않는다. limit 개를 찾으면 멈춘다.
+        """
+        if self.root < 0 or not flags.any():
+            return []
+        sub = self.subtree_flags(flags)
+        ptr = self.child_ptr
+        child = self.child_idx
+        expand_edge = self.expand_edge
+        hits = []
+        for position, root in enumerate(self.roots.tolist()):
+            if not sub[root]:
+                continue
+            stack = [(root, True, (position,))]
+            while stack:
+                p, can_expand, rows = stack.pop()
+                if flags[p]:
+                    hits.append((p, list(rows)))
+                    if limit is not None and len(hits) >= limit:
+                        return hits
+                if not can_expand:
+                    continue
+                lo = int(ptr[p])
+                for slot in range(int(ptr[p + 1]) - 1, lo - 1, -1):
+                    c = int(child[slot])
+                    # 순환 위치(펼치지 않음)는 자식 자신만 본다
+                    if flags[c] or (expand_edge[slot] and sub[c]):
+                        stack.append((c, bool(expand_edge[slot]), rows + (slot - lo,)))
+        return hits
+
+    def iter_subtree(self, part, expandable=True):
+        """part 노드와 하위 노드의 파트 id 를 트리뷰 전위 순회 순서로 반환 (공유 하위 조립품은 쓰인 위치마다 포함)"""
+        ptr = self.child_ptr
+        child = self.child_idx
+        expand_edge = self.expand_edge
+        stack = [(part, expandable)]
+        while stack:
+            p, can_expand = stack.pop()
+            yield p
+            if not can_expand:
+                continue
+            for slot in range(ptr[p + 1] - 1, ptr[p] - 1, -1):
+                stack.append((child[slot], expand_edge[slot]))
+
+    def iter_subtree_occurrences(self, part, slot=-1, expandable=True):
+        """
+        part 노드(슬롯 slot)와 하위 노드를 트리뷰 전위 순회 순서로 (파트 id, 슬롯, 시작 노드부터의 파트 id 경로) 로 반환.
+        경로 튜플은 시작 노드를 포함하며, 순환 위치는 펼치지 않는다.
+        """
+        ptr = self.child_ptr
+        child = self.child_idx
+        expand_edge = self.expand_edge
+        stack = [(part, slot, expandable, (part,))]
+        while stack:
+            p, s, can_expand, path = stack.pop()
+            yield p, s, path
+            if not can_expand:
+                continue
+            for c_slot in range(ptr[p + 1] - 1, ptr[p] - 1, -1):
+                c = int(child[c_slot])
+                stack.append((c, c_slot, bool(expand_edge[c_slot]), path + (c,)))
+
+    def subtree_parts(self, part, expandable=True):
+        """
+        part 노드와 하위 노드에 나타나는 서로 다른 파트 id 목록 (처음 나타나는 전위 순회 순서).
+        같은 파트의 자식은 한 번만 훑으므로 반복되는 하위 조립품이 많아도 파트 수에 비례한다.
+        """
+        ptr = self.child_ptr
+        child = self.child_idx
+        expand_edge = self.expand_edge
+        seen = {}
+        expanded = set()
+        stack = [(part, expandable)]
+        while stack:
+            p, can_expand = stack.pop()
+            seen.setdefault(p, None)
+            if not can_expand or p in expanded:
+                continue
+            expanded.add(p)
+            for slot in range(ptr[p + 1] - 1, ptr[p] - 1, -1):
+                stack.append((int(child[slot]), bool(expand_edge[slot])))
+        return list(seen)
+
+    # ─── 활성 여부 계산 ───────────────────────────────────────
+
+    def self_flags(self, file_dict):
+        """파트 id 별로 파일 딕셔너리(대문자 파트넘버 키)에 존재하는지 여부"""
+        if not file_dict:
+            return np.zeros(len(self.keys), dtype=bool)
+        return pd.Index(self.upper_keys).isin(list(file_dict)).astype(bool)
+
+    def self_masks(self, file_dicts):
+        """
+        파트 id 별 비트마스크. i 번째 비트는 file_dicts[i] 에 파일이 있는지 여부 (최대 8개 모드).
+        """
+        masks = np.zeros(len(self.keys), dtype=np.uint8)
+        for bit, file_dict in enumerate(file_dicts):
+            masks |= self.self_flags(file_dict).astype(np.uint8) << bit
+        return masks
+
+    def subtree_flags(self, self_flags):
+        """
+        파트별로 자신 또는 하위 노드에 파일이 있는지 여부 (공유 하위 조립품이므로 모든 occurrence 에서 같다).
+        가장 깊은 부모부터 깊이 단위로 자식 → 부모 방향으로 한 번에 전파한다.
+        self_flags 가 bool 배열이면 bool, self_masks 비트마스크면 모드별 비트를 한꺼번에 계산한다.
+        """
+        sub = self_flags.copy()
+        child = self.child_idx
+        for slots in reversed(self.level_slots):
+            if not len(slots):
+                continue
+            c = child[slots]
+            # 순환 위치(펼치지 않음)는 자식의 자기 파일만 본다
+            child_visible = self_flags[c] | (sub[c] * self.expand_edge[slots])
+            np.bitwise_or.at(sub, self.slot_parent[slots], child_visible)
+        return sub
+
+    def parts_for_upper_keys(self, upper_keys):
+        """대문자 파트넘버 목록에 해당하는 파트 id 배열 (대소문자만 다른 파트넘버는 모두 포함)"""
+        if not upper_keys:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(pd.Index(self.upper_keys).isin(list(upper_keys)))
+
+    def _parent_slots(self, part):
+        """part 가 자식으로 등장하는 모든 슬롯 (역방향 인덱스는 처음 필요할 때 만든다)"""
+        if not hasattr(self, "_rev_slots"):
+            self._rev_slots = np.argsort(self.child_idx, kind="stable")
+            rev_counts = np.bincount(self.child_idx, minlength=len(self.keys))
+            self._rev_ptr = np.zeros(len(self.keys) + 1, dtype=np.int64)
+            np.cumsum(rev_counts, out=self._rev_ptr[1:])
+        return self._rev_slots[self._rev_ptr[part]:self._rev_ptr[part + 1]]
+
+    def update_subtree_flags(self, self_flags, sub, parts):
+        """
+        parts 의 self_flags 가 바뀐 뒤 sub 를 해당 파트와 조상 방향으로만 다시 계산 (배열을 직접 수정).
+        공유 하위 조립품은 부모가 여럿이므로 모든 부모 파트로 올라간다.
+        깊은 파트부터 처리하며 값이 그대로면 더 올라가지 않는다. sub 값이 바뀐 파트 id 목록을 반환.
+        subtree_flags 와 마찬가지로 bool 배열과 비트마스크 모두 사용할 수 있다.
+        """
+        ptr = self.child_ptr
+        child = self.child_idx
+        heap = []
+        queued = set()
+
+        def push(p):
+            if p >= 0 and self.depth[p] >= 0 and p not in queued:
+                queued.add(p)
+                heapq.heappush(heap, (-int(self.depth[p]), int(p)))
+
+        def push_parents(p):
+            for slot in self._parent_slots(p):
+                push(self.slot_parent[slot])
+
+        for p in parts:
+            push(p)
+            # 부모는 자식의 self 값만으로도 활성 여부가 달라질 수 있다 (순환 위치 포함)
+            push_parents(p)
+
+        changed = []
+        while heap:
+            _, p = heapq.heappop(heap)
+            lo, hi = ptr[p], ptr[p + 1]
+            c = child[lo:hi]
+            value = self_flags[p] | np.bitwise_or.reduce(self_flags[c] | (sub[c] * self.expand_edge[lo:hi]))
+            if value != sub[p]:
+                sub[p] = value
+                changed.append(p)
+                push_parents(p)
+        return changed
+
+    def count_visible(self, self_flags, sub):
+        """
+        트리뷰 전체(펼치지 않은 노드 포함)에서 활성 노드 수.
+        공유 하위 조립품은 쓰인 위치마다 세므로 파트별 하위 활성 노드 수를 자식 → 부모로 더해 구한다.
+        """
+        if self.root < 0:
+            return 0
+        child = self.child_idx
+        below = np.zeros(len(self.keys), dtype=np.int64)  # 파트 노드 아래(자신 제외)의 활성 노드 수
+        for slots in reversed(self.level_slots):
+            c = child[slots]
+            counts = np.where(self.expand_edge[slots], sub[c].astype(np.int64) + below[c],
+                              self_flags[c].astype(np.int64))
+            np.add.at(below, self.slot_parent[slots], counts)
+        return int(sub[self.roots].sum()) + int(below[self.roots].sum())
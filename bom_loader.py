@@ -0,0 +1,438 @@
+# bom_loader.py
+
+import os
+import sys
+import logging
+import datetime
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+import pandas as pd
+from bom_graph import BomGraph
+from part_search import PartSearchIndex, FuzzySearchIndex
+from excel_cache import read_excel_cached, load_cache, cache_enabled, get_cache_path
+from bom_schema import BomSchemaError, read_bom_sheet, schema_signature
+from asset_scanner import ASSET_TYPES, scan_assets
+from asset_index import AssetIndex, INDEX_FILENAME
+from perf_timing import NULL_SPAN, PROFILE_DIRNAME, TIMING_FILENAME, append_timing_record, start_span
+
+# ─────────────────────────────────────────────────────────────
+# BOM 로딩 파이프라인 (Qt 없이 동작)
+#   폴더 스캔 → 엑셀 읽기 → BomGraph 구성 → 모드별 커버리지 계산.
+#   뷰어(tree_manager / bom_worker)와 헤드리스 실행(headless.py)이 같은 함수를 사용한다.
+#   여러 엑셀/시트(구성 변형, 생산 로트 등)를 한 번에 읽으면 하나의 숲(forest)으로 합친다.
+#     - 출처는 "경로#시트" 로 지정 (시트를 생략하면 Sheet1). 트리 툴팁과 df 의 Source 컬럼에 출처 이름이 남는다.
+#     - 캐시가 유효한 출처는 바로 읽고, 나머지는 작업 프로세스에서 동시에 파싱한다
+#       (FA50_PARSE_WORKERS: 최대 프로세스 수, 기본 CPU 수. 1 이면 현재 프로세스에서 차례로 읽음).
+#     - 같은 파트넘버라도 출처가 다르면 별개의 파트로 두어 출처별 BOM 구조가 섞이지 않는다.
+# ─────────────────────────────────────────────────────────────
+
+# 스타일(모드) 이름 -> 파일 딕셔너리 키. 순서가 파트별 비트마스크의 비트 위치가 된다.
+STYLE_FILE_KEYS = {"image": "image", "3dxml": "xml3d", "fbx": "fbx"}
+STYLE_MODES = tuple(STYLE_FILE_KEYS)
+
+DEFAULT_SHEET = "Sheet1"
+SOURCE_COLUMN = "Source"   # 여러 출처를 합친 df 에서 행별 출처 이름
+# 작업 프로세스의 파싱을 기다리는 동안 취소 여부를 확인하는 간격 (초)
+PARSE_POLL_SECONDS = 0.2
+
+asset_index = None  # 자산 폴더 인덱스 (get_asset_index 로 최초 사용 시 로드)
+
+def get_base_path():
+    """
+    실행 파일(또는 스크립트)이 있는 폴더를 반환.
+    환경변수 FA50_BASE_PATH 가 있으면 그 폴더를 사용한다 (헤드리스 검증/벤치마크에서 다른 데이터 폴더 지정).
+    """
+    override = os.environ.get("FA50_BASE_PATH")
+    if override:
+        return os.path.abspath(override)
+    if getattr(sys, 'frozen', False):  # PyInstaller로 빌드된 경우
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(__file__)
+
+def get_asset_index():
+    """01_excel/asset_index.json 에 저장되는 자산 폴더 인덱스를 반환 (최초 호출 시 로드)"""
+    global asset_index
+    if asset_index is None:
+        asset_index = AssetIndex.load(os.path.join(get_base_path(), "01_excel", INDEX_FILENAME))
+    return asset_index
+
+
+# 스캐너가 기록하는 폴더별 카운트 속성 (예: image_folder_count)
+COUNT_ATTRS = tuple(
+    f"{asset_type.key}_{kind}_count"
+    for asset_type in ASSET_TYPES
+    for kind in ("folder", "duplicate", "registered")
+)
+
+def parse_workers():
+    """엑셀 파싱에 쓸 최대 작업 프로세스 수 (FA50_PARSE_WORKERS, 기본 CPU 수)"""
+    try:
+        return max(1, int(os.environ.get("FA50_PARSE_WORKERS", 0)) or os.cpu_count() or 1)
+    except ValueError:
+        return os.cpu_count() or 1
+
+class BomSource:
+    """BOM 을 읽을 엑셀 파일과 시트. label 은 트리/로그에서 출처를 구분하는 이름."""
+    def __init__(self, path, sheet=DEFAULT_SHEET, label=None):
+        self.path = path
+        self.sheet = sheet or DEFAULT_SHEET
+        if label is None:
+            label = os.path.splitext(os.path.basename(path))[0]
+            if self.sheet != DEFAULT_SHEET:
+                label += f"#{self.sheet}"
+        self.label = label
+
+    @classmethod
+    def parse(cls, spec):
+        """"경로#시트" 문자열을 BomSource 로 변환 (파일명에 #이 들어 있으면 그대로 경로로 봄)"""
+        if isinstance(spec, cls):
+            return spec
+        spec = str(spec)
+        path, sep, sheet = spec.rpartition("#")
+        if not sep or os.path.exists(spec):
+            return cls(spec)
+        return cls(path, sheet)
+
+    def __str__(self):
+        return self.path if self.sheet == DEFAULT_SHEET else f"{self.path}#{self.sheet}"
+
+def as_sources(excel_path):
+    """
+    load_bom 의 excel_path(경로, "경로#시트", BomSource 또는 그 목록)를 BomSource 목록으로 변환.
+    None 이면 None. 출처 이름이 겹치면 뒤에 (2), (3) ... 을 붙인다.
+    """
+    if excel_path is None:
+        return None
+    if isinstance(excel_path, (str, os.PathLike, BomSource)):
+        excel_path = [excel_path]
+    sources = [BomSource.parse(spec) for spec in excel_path]
+    seen = {}
+    for source in sources:
+        count = seen.get(source.label, 0) + 1
+        seen[source.label] = count
+        if count > 1:
+            source.label = f"{source.label} ({count})"
+    return sources
+
+def parse_source(source, variant, log=None, progress=None, timing=None, profile_dir=None, check_cache=True):
+    """
+    출처 하나를 읽어 (DataFrame, 로그 [(메시지, 수준), ...], 측정 구간) 을 반환.
+    작업 프로세스에서도 호출되므로 log 가 없으면 로그를 모아서 돌려주고,
+    timing 이 없으면 "source:<이름>" 구간을 새로 만들어 함께 돌려준다.
+    """
+    messages = []
+    if log is None:
+        log = lambda message, level=logging.INFO: messages.append((message, level))
+    own_timing = timing is None
+    if own_timing:
+        timing = start_span(f"source:{source.label}", profile_dir)
+    df = read_excel_cached(
+        source.path, sheet_name=source.sheet, log=log,
+        reader=functools.partial(read_bom_sheet, log=log, progress=progress),
+        variant=variant, timing=timing, check_cache=check_cache,
+    )
+    timing.count(rows=len(df))
+    if own_timing:
+        timing.finish()
+    return df, messages, timing
+
+class LoadCancelled(Exception):
+    """진행 중인 로딩이 취소되었을 때 발생"""
+
+class LoadContext:
+    """
+    BOM 로딩 파이프라인이 window 대신 사용하는 객체.
+    스캐너가 쓰는 appendLog 와 카운트 속성을 제공하며 위젯에는 접근하지 않으므로
+    작업 스레드에서도 사용할 수 있다. timing 은 load_bom 이 시작한 최상위 측정 구간.
+    """
+    def __init__(self, log=None, progress=None, is_cancelled=None):
+        self._log = log
+        self._progress = progress
+        self._is_cancelled = is_cancelled
+        self.timing = NULL_SPAN
+        for name in COUNT_ATTRS:
+            setattr(self, name, 0)
+
+    @staticmethod
+    def profile_dir():
+        return os.path.join(get_base_path(), "01_excel", PROFILE_DIRNAME)
+
+    def start_timing(self, name):
+        """최상위 측정 구간 시작 (.prof 는 01_excel/profile 에 저장)"""
+        self.timing = start_span(name, profile_dir=self.profile_dir())
+        return self.timing
+
+    def appendLog(self, message, level=logging.INFO):
+        if self._log:
+            self._log(message, level)
+
+    def check_cancelled(self):
+        if self._is_cancelled and self._is_cancelled():
+            raise LoadCancelled()
+
+    def report(self, percent, message):
+        """진행률 보고 (취소 여부도 함께 확인)"""
+        self.check_cancelled()
+        if self._progress:
+            self._progress(percent, message)
+
+class LoadResult:
+    """load_bom 의 결과: 새 파일 딕셔너리, 폴더별 카운트, 엑셀 데이터와 BOM 그래프, 읽은 출처 목록"""
+    def __init__(self, files, counts, df=None, graph=None, affected_parts=None, search_index=None,
+                 fuzzy_index=None, timing=NULL_SPAN, sources=None, scan_results=None):
+        self.files = files
+        self.counts = counts
+        self.df = df
+        self.graph = graph
+        self.search_index = search_index      # 파트넘버 검색 인덱스 (graph 와 함께 생성)
+        self.fuzzy_index = fuzzy_index        # 파트넘버/품명 퍼지 검색 인덱스
+        self.affected_parts = affected_parts  # 자산이 바뀐 파트넘버 (None 이면 알 수 없음)
+        self.scan_results = scan_results or []  # 폴더별 ScanResult (화면 반영 후 AssetIndex.mark_applied 에 전달)
+        self.timing = timing                  # 단계별 측정 구간 (화면 반영 단계는 GUI 스레드에서 추가)
+        self.sources = sources or []          # 읽은 BomSource 목록 (graph.source_labels 와 같은 순서)
+
+def load_bom(excel_path, ctx, with_search=True):
+    """
+    폴더 스캔 → 엑셀 읽기 → BOM 관계 구성까지 위젯 없이 수행하여 LoadResult 를 반환.
+    excel_path 는 엑셀 경로 또는 "경로#시트" (BomSource) 이며, 목록이면 모든 출처를 하나의 숲으로 합친다.
+    excel_path 가 None 이면 폴더 스캔만 한다 (Refresh).
+    with_search 가 False 이면 검색 인덱스를 만들지 않는다 (헤드리스 검증용).
+    각 단계의 시간은 result.timing ("load" 또는 "refresh" 구간) 아래 "load_bom" 에 남는다.
+    컬럼 구성 오류는 BomSchemaError, 취소는 LoadCancelled 로 전달된다.
+    """
+    sources = as_sources(excel_path)
+    timing = ctx.start_timing("refresh" if sources is None else "load")
+    with timing.span("load_bom") as span:
+        result = _load_bom(sources, ctx, span, with_search)
+    result.timing = timing
+    return result
+
+def save_timing_record(result):
+    """
+    엑셀 로딩의 단계별 시간을 01_excel/timing_log.jsonl 에 추가 (작업 스레드에서 호출).
+    폴더 스캔만 한 Refresh 와 측정이 꺼진 경우(FA50_TIMING=0)는 기록하지 않는다.
+    화면 반영("apply") 구간은 이후 GUI 스레드에서 붙으므로 로그창 요약에만 나온다.
+    """
+    timing = result.timing
+    if not timing or result.graph is None:
+        return
+    record = {
+        "time": datetime.datetime.fromtimestamp(timing.started).strftime("%Y-%m-%d %H:%M:%S"),
+        "excel": [str(source) for source in result.sources],
+        "timing": timing.to_dict(),
+    }
+    append_timing_record(os.path.join(get_base_path(), "01_excel", TIMING_FILENAME), record)
+
+def _load_bom(sources, ctx, timing, with_search):
+    files = {}
+    ctx.report(0, "자산 폴더 스캔 중...")
+    index = get_asset_index()
+    with timing.span("scan_assets") as span:
+        scan_results = scan_assets(ctx, files, get_base_path(), index=index, timing=span)
+        span.count(**{key: len(found) for key, found in files.items()})
+    counts = {name: getattr(ctx, name) for name in COUNT_ATTRS}
+    if sources is None:
+        ctx.report(100, "폴더 스캔 완료")
+        return LoadResult(files, counts, affected_parts=index.affected_parts(scan_results),
+                          scan_results=scan_results)
+
+    # 스키마에 정의된 컬럼만 읽음 (컬럼 구성이 맞지 않으면 중단)
+    ctx.report(30, "엑셀 읽는 중...")
+    with timing.span("read_excel") as span:
+        frames = _read_sources(sources, ctx, span)
+        span.count(rows=sum(len(frame) for frame in frames), sources=len(sources))
+    ctx.report(80, "BOM 관계 구성 중...")
+    with timing.span("build_graph") as span:
+        labels = [source.label for source in sources]
+        if len(frames) == 1:
+            df = frames[0]
+            row_sources = None
+        else:
+            df = pd.concat(frames, ignore_index=True)
+            row_sources = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+            df[SOURCE_COLUMN] = pd.Categorical.from_codes(row_sources, labels)
+        part_nos = df["Part No"].astype(str).str.strip()
+        next_parts = df["NextPart"].astype(str).str.strip()
+        # 부모-자식 관계를 정수 배열 그래프로 구성 (행 단위 루프 없음)
+        graph = BomGraph.from_columns(part_nos, next_parts, row_sources, labels)
+        span.count(parts=int(graph.total_parts), roots=len(graph.roots), nodes=int(graph.node_count))
+    search_index = fuzzy_index = None
+    if with_search:
+        ctx.report(90, "검색 인덱스 구성 중...")
+        with timing.span("search_index"):
+            search_index = PartSearchIndex(graph)
+        with timing.span("fuzzy_index"):
+            # 퍼지 인덱스 캐시는 출처가 하나일 때만 엑셀 옆에 저장 (시트별로 구분)
+            cache_path = variant = None
+            if len(sources) == 1:
+                cache_path = sources[0].path
+                variant = schema_signature()
+                if sources[0].sheet != DEFAULT_SHEET:
+                    variant += f"#{sources[0].sheet}"
+            fuzzy_index = FuzzySearchIndex.load_or_build(
+                graph, df, cache_path, variant=variant or "", log=ctx.appendLog
+            )
+    ctx.report(100, "로딩 완료")
+    return LoadResult(files, counts, df, graph, search_index=search_index, fuzzy_index=fuzzy_index,
+                      sources=sources, scan_results=scan_results)
+
+def _read_sources(sources, ctx, timing):
+    """
+    모든 출처의 DataFrame 을 sources 순서로 반환. 출처가 여럿이면 출처별 측정 구간은 timing 아래 "source:<이름>" 하나
+    (캐시를 확인했지만 파싱한 출처는 캐시 확인과 파싱 시간을 합친 구간).
+    캐시가 유효한 출처는 바로 읽고, 파싱이 필요한 출처가 둘 이상이면 작업 프로세스에서 동시에 파싱한다.
+    """
+    variant = schema_signature()
+    if len(sources) == 1:
+        df, _, _ = parse_source(
+            sources[0], variant, log=ctx.appendLog,
+            progress=lambda rows: ctx.report(30, f"엑셀 읽는 중... ({rows}행)"), timing=timing,
+        )
+        return [df]
+
+    frames = [None] * len(sources)
+    pending = []
+    checks = {}   # 캐시가 없던 출처 -> 캐시 확인 구간 (파싱 구간에 합침)
+    for i, source in enumerate(sources):
+        ctx.check_cancelled()
+        if cache_enabled():
+            span = start_span(f"source:{source.label}", ctx.profile_dir())
+            with span.span("load_cache"):
+                df = load_cache(source.path, source.sheet, variant)
+            span.finish()
+            if df is not None:
+                span.count(rows=len(df))
+                timing.attach(span)
+                ctx.appendLog(f"[excel_cache] 캐시 사용: {get_cache_path(source.path, source.sheet)}")
+                frames[i] = df
+                continue
+            checks[i] = span
+        pending.append(i)
+
+    def finish_source(i, span):
+        span.merge(checks.get(i))
+        timing.attach(span)
+
+    workers = min(len(pending), parse_workers())
+    if workers <= 1:
+        for i in pending:
+            frames[i], span = _parse_in_process(sources[i], variant, ctx)
+            finish_source(i, span)
+        return frames
+
+    ctx.appendLog(f"[load_bom] 엑셀 {len(pending)}개를 프로세스 {workers}개에서 동시에 파싱합니다.")
+    # Qt 스레드가 있는 프로세스를 fork 하지 않도록 모든 플랫폼에서 spawn 사용
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        futures = {
+            pool.submit(parse_source, sources[i], variant, profile_dir=ctx.profile_dir(), check_cache=False): i
+            for i in pending
+        }
+        remaining = set(futures)
+        while remaining:
+            done, remaining = wait(remaining, timeout=PARSE_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            ctx.check_cancelled()
+            for future in done:
+                i = futures[future]
+                try:
+                    df, messages, span = future.result()
+                except BomSchemaError as e:
+                    raise BomSchemaError(f"{sources[i].label}: {e}") from e
+                for message, level in messages:
+                    ctx.appendLog(message, level)
+                finish_source(i, span)
+                frames[i] = df
+            finished = len(pending) - len(remaining)
+            ctx.report(30 + 50 * finished // len(pending), f"엑셀 읽는 중... ({finished}/{len(pending)})")
+    finally:
+        # 취소/오류 시 아직 시작하지 않은 파싱은 버리고 기다리지 않는다
+        pool.shutdown(wait=False, cancel_futures=True)
+    return frames
+
+def _parse_in_process(source, variant, ctx):
+    """현재 프로세스에서 출처 하나를 파싱하여 (df, "source:<이름>" 구간) 반환 (캐시는 이미 확인함. 로그와 진행률은 바로 전달)"""
+    try:
+        df, _, span = parse_source(
+            source, variant, log=ctx.appendLog,
+            progress=lambda rows: ctx.report(30, f"엑셀 읽는 중... {source.label} ({rows}행)"),
+            profile_dir=ctx.profile_dir(), check_cache=False,
+        )
+    except BomSchemaError as e:
+        raise BomSchemaError(f"{source.label}: {e}") from e
+    return df, span
+
+# ─── 요약 / 커버리지 ─────────────────────────────────────────
+
+def operation_summary(counts, graph, node_count=None):
+    """
+    폴더별 카운트와 그래프로 Operation Summary 를 dict 로 만든다.
+    {"assets": {라벨: {"folder", "duplicate", "registered"}}, "total_parts", "node_count"}
+    """
+    return {
+        "assets": {
+            asset_type.label: {
+                kind: int(counts.get(f"{asset_type.key}_{kind}_count", 0))
+                for kind in ("folder", "duplicate", "registered")
+            }
+            for asset_type in ASSET_TYPES
+        },
+        "total_parts": int(graph.total_parts) if graph is not None else 0,
+        "node_count": int(graph.node_count if node_count is None else node_count) if graph is not None else 0,
+    }
+
+def format_operation_summary(summary):
+    """operation_summary 결과를 로그창에 쓰던 형식의 문자열로 변환"""
+    text = "===== Operation Summary =====\n"
+    for label, c in summary["assets"].items():
+        text += (f"Log event: {label} - 폴더 내 파일: {c['folder']}, 중복 파일: {c['duplicate']}, "
+                 f"등록된 파일: {c['registered']}\n")
+    text += f"Log event: 총 유효 파트 수: {summary['total_parts']}\n"
+    text += f"Log event: 트리뷰에 추가된 전체 노드 수: {summary['node_count']}\n"
+    return text
+
+def style_masks(graph, files):
+    """
+    files({파일 딕셔너리 키: {파트넘버: 경로}})로 모든 모드의 파트별 파일 존재 비트와
+    자식 포함 활성 비트를 계산 (STYLE_MODES 순서).
+    """
+    self_masks = graph.self_masks([files.get(STYLE_FILE_KEYS[mode], {}) for mode in STYLE_MODES])
+    return self_masks, graph.subtree_flags(self_masks)
+
+def mode_flags(masks, bit):
+    """비트마스크 배열에서 한 모드의 bool 배열을 꺼낸다"""
+    return ((masks >> bit) & 1).astype(bool)
+
+def coverage_report(graph, files, with_missing=True):
+    """
+    모드별 커버리지: 트리뷰에 나타나는 파트넘버 중 파일이 있는 파트넘버 수, 활성 노드 수(필터 결과와 동일),
+    with_missing 이면 파일이 없는 파트넘버 목록.
+    여러 출처에 같은 파트넘버가 있으면 (파일도 같으므로) 한 번만 센다.
+    """
+    self_masks, sub_masks = style_masks(graph, files)
+    reachable = graph.depth >= 0
+    multi_source = len(graph.source_labels) > 1
+
+    def count_keys(flags):
+        if multi_source:
+            return len(pd.unique(graph.keys[flags]))
+        return int(flags.sum())
+
+    parts = count_keys(reachable)
+    report = {}
+    for bit, mode in enumerate(STYLE_MODES):
+        self_flags = mode_flags(self_masks, bit)
+        with_file = count_keys(self_flags & reachable)
+        entry = {
+            "parts": parts,
+            "parts_with_file": with_file,
+            "coverage": round(with_file / parts, 4) if parts else 0.0,
+            "active_nodes": int(graph.count_visible(self_flags, mode_flags(sub_masks, bit))),
+            "total_nodes": int(graph.node_count),
+        }
+        if with_missing:
+            missing = np.flatnonzero(reachable & ~self_flags)
+            entry["missing"] = sorted(set(graph.keys[missing].tolist()))  # 여러 출처에 같은 파트넘버가 있으면 한 번만
+        report[mode] = entry
+    return report
@@ -0,0 +1,151 @@
+# bom_schema.py
+
+import hashlib
+import logging
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+# ─────────────────────────────────────────────────────────────
+# BOM 엑셀 컬럼 매핑 스키마
+#   name     : DataFrame 에서 사용할 표준 컬럼명 (display_part_info 등이 사용)
+#   aliases  : 엑셀 헤더에서 같은 컬럼으로 인정할 다른 이름들
+#   position : 이름으로 찾지 못했을 때 사용할 0-based 열 위치 (None 이면 사용 안 함)
+#   required : 없으면 로드 중단
+#   kind     : "text" (문자열로 변환) / "number" (숫자로 변환, 실패 시 NaN)
+# ─────────────────────────────────────────────────────────────
+ColumnSpec = namedtuple("ColumnSpec", "name aliases position required kind")
+
+BOM_SCHEMA = (
+    ColumnSpec("S/N", ("SN",), None, False, "text"),
+    ColumnSpec("Level", (), None, False, "number"),
+    ColumnSpec("Type", (), None, False, "text"),
+    ColumnSpec("Part No", ("PartNo", "Part Number"), 3, True, "text"),
+    ColumnSpec("Part Rev", ("PartRev",), None, False, "text"),
+    ColumnSpec("Part Status", (), None, False, "text"),
+    ColumnSpec("Latest", (), None, False, "text"),
+    ColumnSpec("Nomenclature", (), None, False, "text"),
+    ColumnSpec("Instance ID 총수량(ALL DB)", (), None, False, "number"),
+    ColumnSpec("Qty", ("Quantity",), None, False, "number"),
+    ColumnSpec("NextPart", ("Next Part",), 13, True, "text"),
+)
+
+
+class BomSchemaError(ValueError):
+    """엑셀 컬럼 구성이 스키마와 맞지 않을 때 발생"""
+
+
+def _normalize(header):
+    return "".join(str(header).split()).lower()
+
+
+def schema_signature(schema=BOM_SCHEMA):
+    """스키마 내용이 바뀌면 달라지는 짧은 문자열 (파싱 캐시 구분용)"""
+    return hashlib.sha1(repr(tuple(schema)).encode("utf-8")).hexdigest()[:12]
+
+
+def resolve_columns(header, schema=BOM_SCHEMA):
+    """
+    엑셀 헤더 행으로 스키마를 검증하고 {표준 컬럼명: 열 위치} 와 경고 목록을 반환.
+    필수 컬럼을 찾지 못하거나 두 항목이 같은 열을 가리키면 BomSchemaError.
+    """
+    if not header:
+        raise BomSchemaError("헤더 행이 없습니다.")
+    positions = {}
+    for i, value in enumerate(header):
+        if value is None:
+            continue
+        positions.setdefault(_normalize(value), i)
+
+    mapping = {}
+    warnings = []
+    missing = []
+    for spec in schema:
+        index = None
+        for candidate in (spec.name,) + tuple(spec.aliases):
+            index = positions.get(_normalize(candidate))
+            if index is not None:
+                break
+        if index is None and spec.position is not None and spec.position < len(header):
+            index = spec.position
+            warnings.append(
+                f"'{spec.name}' 컬럼명을 찾지 못해 {spec.position + 1}번째 열({header[index]})을 사용합니다."
+            )
+        if index is None:
+            if spec.required:
+                missing.append(spec.name)
+            else:
+                warnings.append(f"'{spec.name}' 컬럼이 없습니다. (N/A로 표시)")
+            continue
+        mapping[spec.name] = index
+
+    if missing:
+        available = ", ".join(str(h) for h in header if h is not None)
+        raise BomSchemaError(
+            f"필수 컬럼을 찾을 수 없습니다: {', '.join(missing)}\n엑셀 헤더: {available}"
+        )
+    used = {}
+    for name, index in mapping.items():
+        if index in used:
+            raise BomSchemaError(f"'{used[index]}'와 '{name}'가 같은 열({index + 1}번째)을 가리킵니다.")
+        used[index] = name
+    return mapping, warnings
+
+
+def _convert(values, kind):
+    series = pd.Series(values, dtype=object)
+    if kind == "number":
+        return pd.to_numeric(series, errors="coerce")
+    # 텍스트: 숫자로 저장된 파트넘버도 문자열로, 빈 셀은 NaN
+    notna = series.notna()
+    series[notna] = series[notna].map(str)
+    series[~notna] = np.nan
+    return series
+
+
+# progress 콜백 호출 간격 (행)
+PROGRESS_INTERVAL = 5000
+
+
+def read_bom_sheet(excel_path, sheet_name="Sheet1", schema=BOM_SCHEMA, log=None, progress=None):
+    """
+    openpyxl read-only 모드로 시트를 한 행씩 읽으면서 스키마에 매핑된 컬럼만 보관한다.
+    사용하지 않는 PLM 컬럼은 메모리에 올리지 않는다.
+    progress(읽은 행 수) 는 PROGRESS_INTERVAL 행마다 호출되며, 예외를 던져 중단할 수 있다.
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        if sheet_name not in wb.sheetnames:
+            raise BomSchemaError(f"시트 '{sheet_name}'를 찾을 수 없습니다. (시트 목록: {', '.join(wb.sheetnames)})")
+        ws = wb[sheet_name]
+        ws.reset_dimensions()  # 잘못 기록된 dimension 정보 무시
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        mapping, warnings = resolve_columns(header, schema)
+        if log:
+            for message in warnings:
+                log(f"[read_bom_sheet] {message}", logging.WARNING)
+
+        names = list(mapping)
+        indices = [mapping[name] for name in names]
+        width = max(indices) + 1
+        picked = []
+        for row in rows:
+            # 완전히 빈 행은 건너뜀 (pd.read_excel 과 동일)
+            if not any(v is not None for v in row):
+                continue
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            picked.append([row[i] for i in indices])
+            if progress and len(picked) % PROGRESS_INTERVAL == 0:
+                progress(len(picked))
+    finally:
+        wb.close()
+
+    kinds = {spec.name: spec.kind for spec in schema}
+    columns = list(zip(*picked)) if picked else [()] * len(names)
+    return pd.DataFrame({
+        name: _convert(values, kinds[name]) for name, values in zip(names, columns)
+    })
@@ -0,0 +1,79 @@
+# bom_worker.py
+
+import time
+import logging
+from PyQt5.QtCore import QThread, pyqtSignal
+from bom_schema import BomSchemaError
+from bom_loader import LoadContext, LoadCancelled, load_bom, save_timing_record
+
+# 로그를 모아서 GUI 스레드로 보내는 최소 간격 (초). 메시지마다 시그널을 보내지 않는다.
+LOG_EMIT_INTERVAL = 0.1
+
+
+class BomLoadWorker(QThread):
+    """
+    load_bom 을 작업 스레드에서 실행하는 QThread.
+    로그/진행률은 시그널로 GUI 스레드에 전달하고(로그는 LOG_EMIT_INTERVAL 마다 묶어서), 완료 시 LoadResult 를 loaded 로 보낸다.
+    cancel() 후에는 다음 진행률 보고 시점에 중단된다.
+    """
+    progress = pyqtSignal(int, str)   # (퍼센트, 메시지)
+    log = pyqtSignal(list)            # [(메시지, logging 수준), ...]
+    loaded = pyqtSignal(object)       # LoadResult
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, excel_path, parent=None):
+        super().__init__(parent)
+        self.excel_path = excel_path   # None 이면 폴더 스캔만 수행
+        self.start_time = time.time()
+        self._cancel_requested = False
+        self._log_buffer = []
+        self._last_log_emit = 0.0
+
+    def _log(self, message, level):
+        self._log_buffer.append((message, level))
+        now = time.time()
+        if now - self._last_log_emit >= LOG_EMIT_INTERVAL:
+            self._flush_log()
+
+    def _flush_log(self):
+        self._last_log_emit = time.time()
+        if self._log_buffer:
+            records, self._log_buffer = self._log_buffer, []
+            self.log.emit(records)
+
+    def _progress(self, percent, message):
+        # 단계가 바뀔 때는 모아 둔 로그를 바로 보냄 (긴 단계 동안 로그가 늦게 보이지 않도록)
+        self._flush_log()
+        self.progress.emit(percent, message)
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def is_cancelled(self):
+        return self._cancel_requested
+
+    def run(self):
+        ctx = LoadContext(log=self._log, progress=self._progress, is_cancelled=self.is_cancelled)
+        try:
+            try:
+                result = load_bom(self.excel_path, ctx)
+                try:
+                    save_timing_record(result)
+                except OSError as e:
+                    self._log(f"[timing] 기록 저장 실패: {e}", logging.WARNING)
+            finally:
+                self._flush_log()
+        except LoadCancelled:
+            self.cancelled.emit()
+            return
+        except BomSchemaError as e:
+            self.failed.emit(f"엑셀 컬럼 구성 오류: {e}")
+            return
+        except Exception as e:
+            self.failed.emit(f"{type(e).__name__}: {e}")
+            return
+        if self._cancel_requested:
+            self.cancelled.emit()
+            return
+        self.loaded.emit(result)
@@ -0,0 +1,260 @@
+# excel_cache.py
+
+import os
+import logging
+import json
+import hashlib
+import tempfile
+import datetime
+import numpy as np
+import pandas as pd
+from perf_timing import NULL_SPAN
+
+# ─────────────────────────────────────────────────────────────
+# 엑셀 파싱 결과 캐시
+#   data.xlsx 옆에 "data.xlsx.<시트명>.cache.npz" 로 저장.
+#   파일 크기 + 수정시각(mtime) + 내용 해시(sha256)로 유효성 확인.
+#   pickle 을 쓰지 않으므로(allow_pickle=False) 공유 폴더의 캐시 파일도 안전하게 읽을 수 있다.
+#   캐시 파일은 언제 지워도 되며, 환경변수 FA50_PARSE_CACHE=0 으로 끌 수 있다.
+# ─────────────────────────────────────────────────────────────
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".cache.npz"
+
+# object 컬럼 값의 원래 타입 태그
+_TAG_STR, _TAG_INT, _TAG_FLOAT, _TAG_NONE, _TAG_BOOL, _TAG_DATETIME = range(6)
+
+
+def cache_enabled():
+    return os.environ.get("FA50_PARSE_CACHE", "1") != "0"
+
+
+def get_cache_path(excel_path, sheet_name):
+    return f"{excel_path}.{sheet_name}{CACHE_SUFFIX}"
+
+
+def file_fingerprint(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _tag_of(value):
+    if isinstance(value, str):
+        return _TAG_STR
+    if isinstance(value, (bool, np.bool_)):
+        return _TAG_BOOL
+    if isinstance(value, (int, np.integer)):
+        return _TAG_INT
+    if isinstance(value, (float, np.floating)):
+        return _TAG_FLOAT
+    if value is None:
+        return _TAG_NONE
+    if isinstance(value, (datetime.datetime, pd.Timestamp)):
+        return _TAG_DATETIME
+    return _TAG_STR  # 그 밖의 값은 문자열로 보관
+
+
+def _encode_column(series):
+    """컬럼 하나를 pickle 없이 저장할 수 있는 배열(값, 태그)로 변환"""
+    values = series.to_numpy()
+    if values.dtype.kind in "biufMm":
+        return values, None
+    values = values.astype(object)
+    tags = np.fromiter((_tag_of(v) for v in values), dtype=np.int8, count=len(values))
+    strings = np.array(
+        [v.isoformat() if t == _TAG_DATETIME else str(v) for v, t in zip(values, tags)],
+        dtype=str,
+    ) if len(values) else np.zeros(0, dtype="<U1")
+    return strings, tags
+
+
+def _decode_column(strings, tags):
+    if tags is None:
+        return strings
+    out = strings.astype(object)
+    for tag, convert in (
+        (_TAG_INT, lambda s: s.astype(np.int64)),
+        (_TAG_FLOAT, lambda s: s.astype(np.float64)),
+        (_TAG_BOOL, lambda s: s == "True"),
+        (_TAG_DATETIME, lambda s: pd.to_datetime(s).to_pydatetime()),
+    ):
+        mask = tags == tag
+        if mask.any():
+            out[mask] = convert(strings[mask]).astype(object)
+    mask = tags == _TAG_NONE
+    if mask.any():
+        out[mask] = None
+    return out
+
+
+def load_cache(excel_path, sheet_name, variant=""):
+    """
+    유효한 캐시가 있으면 DataFrame 을, 없거나 손상/불일치면 None 을 반환.
+    크기와 mtime 이 같으면 바로 사용하고, 다르면 내용 해시로 한 번 더 확인한다.
+    variant 는 읽기 방식(컬럼 스키마 등)이 바뀌었을 때 이전 캐시를 무시하기 위한 구분값.
+    """
+    cache_path = get_cache_path(excel_path, sheet_name)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CACHE_VERSION or meta.get("sheet") != sheet_name:
+                return None
+            if not _source_matches(meta, excel_path, variant):
+                return None
+            columns = {}
+            for i, kind in enumerate(meta["kinds"]):
+                tags = data[f"t{i}"] if kind == "o" else None
+                columns[i] = _decode_column(data[f"c{i}"], tags)
+        df = pd.DataFrame(columns)
+        df.columns = meta["columns"]
+        return df
+    except Exception:
+        # 손상되었거나 다른 버전이 쓴 캐시 → 무시하고 다시 파싱
+        return None
+
+
+def save_cache(excel_path, sheet_name, df, variant=""):
+    """
+    임시 파일에 쓴 뒤 os.replace 로 교체 (동시에 여러 프로세스가 써도 읽는 쪽은 항상 완전한 파일을 본다).
+    실패해도 예외를 올리지 않고 False 반환.
+    """
+    cache_path = get_cache_path(excel_path, sheet_name)
+    try:
+        arrays = {}
+        kinds = []
+        for i, column in enumerate(df.columns):
+            values, tags = _encode_column(df.iloc[:, i])
+            arrays[f"c{i}"] = values
+            if tags is None:
+                kinds.append("n")
+            else:
+                kinds.append("o")
+                arrays[f"t{i}"] = tags
+        meta = _source_meta(excel_path, variant)
+        meta.update({
+            "version": CACHE_VERSION,
+            "sheet": sheet_name,
+            "columns": [c if isinstance(c, (int, float)) else str(c) for c in df.columns],
+            "kinds": kinds,
+        })
+        arrays["meta"] = np.array(json.dumps(meta, ensure_ascii=False))
+        return _write_npz(cache_path, arrays)
+    except Exception:
+        return False
+
+
+def _source_meta(excel_path, variant):
+    """캐시가 어떤 엑셀 파일 내용으로 만들어졌는지 기록하는 메타 정보"""
+    size, mtime_ns = file_fingerprint(excel_path)
+    return {"variant": variant, "size": size, "mtime_ns": mtime_ns, "sha256": file_hash(excel_path)}
+
+
+def _source_matches(meta, excel_path, variant):
+    """크기와 mtime 이 같으면 바로 인정하고, 다르면 내용 해시로 한 번 더 확인"""
+    if meta.get("variant", "") != variant:
+        return False
+    size, mtime_ns = file_fingerprint(excel_path)
+    if size != meta["size"]:
+        return False
+    return mtime_ns == meta["mtime_ns"] or file_hash(excel_path) == meta["sha256"]
+
+
+def _write_npz(cache_path, arrays):
+    """임시 파일에 쓴 뒤 os.replace 로 교체. 실패하면 False."""
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(cache_path) + ".", suffix=".tmp",
+            dir=os.path.dirname(cache_path) or ".",
+        )
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.chmod(tmp_path, 0o644)  # mkstemp 기본 권한(0600) 대신 다른 사용자도 읽을 수 있게
+        os.replace(tmp_path, cache_path)
+        tmp_path = None
+        return True
+    except Exception:
+        return False
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def load_derived(excel_path, name, variant=""):
+    """
+    엑셀 내용으로부터 계산한 숫자 배열 묶음(검색 인덱스 등)의 캐시를 읽는다.
+    "data.xlsx.<name>.cache.npz" 가 같은 엑셀 내용·variant 로 만들어졌으면 {이름: 배열}, 아니면 None.
+    """
+    if not cache_enabled():
+        return None
+    cache_path = get_cache_path(excel_path, name)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CACHE_VERSION or not _source_matches(meta, excel_path, variant):
+                return None
+            return {key: data[key] for key in data.files if key != "meta"}
+    except Exception:
+        return None
+
+
+def save_derived(excel_path, name, arrays, variant=""):
+    """load_derived 로 읽을 배열 묶음을 저장. 실패해도 예외를 올리지 않고 False 반환."""
+    if not cache_enabled():
+        return False
+    try:
+        meta = _source_meta(excel_path, variant)
+        meta["version"] = CACHE_VERSION
+        payload = dict(arrays)
+        payload["meta"] = np.array(json.dumps(meta, ensure_ascii=False))
+        return _write_npz(get_cache_path(excel_path, name), payload)
+    except Exception:
+        return False
+
+
+def read_excel_cached(excel_path, sheet_name="Sheet1", log=None, reader=None, variant="", timing=None,
+                      check_cache=True):
+    """
+    pd.read_excel 대체 함수. 캐시가 유효하면 캐시를 읽고, 아니면 엑셀을 파싱한 뒤 캐시를 갱신한다.
+    reader(excel_path, sheet_name) 로 파싱 방식을 바꿀 수 있으며(기본 pd.read_excel),
+    그때는 variant 로 캐시를 구분한다. log 가 주어지면 캐시 사용 여부를 기록.
+    timing(perf_timing 구간)이 주어지면 "load_cache" / "parse" / "save_cache" 구간을 남긴다.
+    check_cache 가 False 이면 (호출한 쪽에서 이미 캐시를 확인한 경우) 바로 파싱한다.
+    """
+    timing = timing or NULL_SPAN
+    if cache_enabled() and check_cache:
+        with timing.span("load_cache"):
+            df = load_cache(excel_path, sheet_name, variant)
+        if df is not None:
+            if log:
+                log(f"[excel_cache] 캐시 사용: {get_cache_path(excel_path, sheet_name)}")
+            return df
+
+    with timing.span("parse"):
+        if reader is None:
+            df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        else:
+            df = reader(excel_path, sheet_name)
+    if cache_enabled():
+        with timing.span("save_cache"):
+            saved = save_cache(excel_path, sheet_name, df, variant)
+        if log:
+            if saved:
+                log(f"[excel_cache] 캐시 저장: {get_cache_path(excel_path, sheet_name)}")
+            else:
+                log("[excel_cache] 캐시 저장 실패 (다음 실행 시 엑셀을 다시 읽습니다)", logging.WARNING)
+    return df
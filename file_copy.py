@@ -0,0 +1,200 @@
+# file_copy.py
+
+import os
+import time
+import shutil
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# ─────────────────────────────────────────────────────────────
+# 하위 노드 파일 복사
+#   - 파트넘버 중복을 먼저 제거하고, 같은 원본 파일은 한 번만 복사한다.
+#   - 복사는 스레드 풀(FA50_COPY_WORKERS, 기본 4)에서 수행하고 GUI 스레드는 진행률만 받는다.
+#   - 대상 폴더에 크기와 수정시각이 같은 파일이 이미 있으면 건너뛴다 (다시 복사할 때 바뀐 파일만 복사).
+#   - 결과는 대상 폴더의 copy_report_<시간>.txt 에 기록한다.
+# ─────────────────────────────────────────────────────────────
+DEFAULT_COPY_WORKERS = 4
+# FAT/네트워크 드라이브의 수정시각 해상도(2초)를 고려한 허용 오차
+MTIME_TOLERANCE = 2.0
+# 진행률 시그널 최소 간격 (초)
+PROGRESS_INTERVAL = 0.05
+
+
+def copy_workers():
+    try:
+        return max(1, int(os.environ.get("FA50_COPY_WORKERS", DEFAULT_COPY_WORKERS)))
+    except ValueError:
+        return DEFAULT_COPY_WORKERS
+
+
+def plan_copy(part_numbers, file_dict, destination_dir):
+    """
+    복사 작업 목록을 만든다. 반환: (jobs, missing)
+      jobs    : [(파트넘버, 원본 경로, 대상 경로), ...] (원본 파일 기준 중복 제거)
+      missing : 파일 딕셔너리에 없는 파트넘버
+    한 모드의 파일은 모두 같은 자산 폴더에 있으므로 파일 이름이 같으면 같은 원본이다.
+    """
+    jobs = []
+    missing = []
+    targets = set()  # 대상 파일 이름
+    for part in dict.fromkeys(part_numbers):
+        src = file_dict.get(part)
+        if not src:
+            missing.append(part)
+            continue
+        name = os.path.basename(src)
+        key = os.path.normcase(name)
+        if key in targets:
+            continue
+        targets.add(key)
+        jobs.append((part, src, os.path.join(destination_dir, name)))
+    return jobs, missing
+
+
+def is_up_to_date(src, dst):
+    """대상 파일이 원본과 크기·수정시각이 같으면 True"""
+    try:
+        s = os.stat(src)
+        d = os.stat(dst)
+    except OSError:
+        return False
+    return s.st_size == d.st_size and abs(s.st_mtime - d.st_mtime) < MTIME_TOLERANCE
+
+
+def copy_one(src, dst):
+    """임시 이름으로 복사한 뒤 교체하여, 중간에 멈춘 복사가 완성된 파일처럼 남지 않게 한다."""
+    tmp_path = f"{dst}.{os.getpid()}.{threading.get_ident()}.part"
+    try:
+        shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+class CopyResult:
+    """하위 노드 파일 복사 결과"""
+    def __init__(self, destination_dir, label="", mode=""):
+        self.destination_dir = destination_dir
+        self.label = label           # 복사를 시작한 노드의 파트넘버
+        self.mode = mode             # files_dict 키 (image / xml3d / fbx)
+        self.total = 0               # 복사 대상 파일 수
+        self.copied = []             # 복사한 원본 경로
+        self.skipped = []            # 이미 같은 파일이 있어 건너뛴 원본 경로
+        self.missing = []            # 파일이 없는 파트넘버
+        self.failed = []             # (원본 경로, 오류 메시지)
+        self.cancelled = False
+        self.report_path = None
+        self.elapsed = 0.0
+
+    def summary(self):
+        text = (f"복사 {len(self.copied)}, 건너뜀 {len(self.skipped)}, 파일 없음 {len(self.missing)}, "
+                f"실패 {len(self.failed)}")
+        if self.cancelled:
+            text += " (취소됨)"
+        return text
+
+    def write_report(self):
+        """대상 폴더에 결과 보고서를 쓰고 경로를 반환"""
+        now = datetime.datetime.now()
+        base = os.path.join(self.destination_dir, f"copy_report_{now:%Y%m%d_%H%M%S}")
+        path = base + ".txt"
+        n = 1
+        while os.path.exists(path):  # 같은 초에 다시 복사한 경우
+            path = f"{base}_{n}.txt"
+            n += 1
+        lines = [
+            f"노드: {self.label}",
+            f"모드: {self.mode}",
+            f"시간: {now:%Y-%m-%d %H:%M:%S} ({self.elapsed:.1f}초)",
+            f"대상 파일 수: {self.total}",
+            self.summary(),
+        ]
+
+        def section(title, items):
+            if items:
+                lines.append("")
+                lines.append(f"[{title}] {len(items)}")
+                lines.extend(items)
+
+        section("복사", self.copied)
+        section("건너뜀 (이미 있음)", self.skipped)
+        section("파일 없음", self.missing)
+        section("실패", [f"{src}\t{error}" for src, error in self.failed])
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        self.report_path = path
+        return path
+
+
+class SubtreeCopyWorker(QThread):
+    """
+    파트넘버 목록의 파일을 destination_dir 로 복사하는 QThread.
+    progress(완료 수, 전체 수, 파일 이름) 로 진행률을 알리고, 끝나면 completed(CopyResult) 를 보낸다.
+    cancel() 후에는 아직 시작하지 않은 파일을 복사하지 않는다.
+    """
+    progress = pyqtSignal(int, int, str)
+    completed = pyqtSignal(object)
+
+    def __init__(self, part_numbers, file_dict, destination_dir, label="", mode="", parent=None):
+        super().__init__(parent)
+        self.part_numbers = part_numbers
+        self.file_dict = dict(file_dict)  # 복사 중 자산 변경 감지로 원본 딕셔너리가 바뀌어도 영향 없음
+        self.result = CopyResult(destination_dir, label, mode)
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def _copy_job(self, src, dst):
+        if self._cancel_requested:
+            return "cancelled"
+        if is_up_to_date(src, dst):
+            return "skipped"
+        copy_one(src, dst)
+        return "copied"
+
+    def run(self):
+        result = self.result
+        start = time.time()
+        jobs, result.missing = plan_copy(self.part_numbers, self.file_dict, result.destination_dir)
+        result.total = len(jobs)
+        done = 0
+        last_emit = 0.0
+        self.progress.emit(0, result.total, "")
+        try:
+            os.makedirs(result.destination_dir, exist_ok=True)
+            with ThreadPoolExecutor(max_workers=copy_workers()) as pool:
+                futures = {pool.submit(self._copy_job, src, dst): (part, src) for part, src, dst in jobs}
+                for future in as_completed(futures):
+                    part, src = futures[future]
+                    try:
+                        status = future.result()
+                    except FileNotFoundError:
+                        result.missing.append(part)  # 스캔 이후 원본이 지워짐
+                    except OSError as e:
+                        result.failed.append((src, str(e)))
+                    else:
+                        if status == "copied":
+                            result.copied.append(src)
+                        elif status == "skipped":
+                            result.skipped.append(src)
+                    done += 1
+                    now = time.time()
+                    if now - last_emit >= PROGRESS_INTERVAL or done == result.total:
+                        last_emit = now
+                        self.progress.emit(done, result.total, os.path.basename(src))
+        except OSError as e:
+            result.failed.append((result.destination_dir, str(e)))
+        result.cancelled = self._cancel_requested
+        result.elapsed = time.time() - start
+        try:
+            result.write_report()
+        except OSError as e:
+            result.failed.append((result.destination_dir, f"보고서 저장 실패: {e}"))
+        self.completed.emit(result)
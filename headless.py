@@ -0,0 +1,143 @@
+# headless.py
+
+import os
+import sys
+import csv
+import json
+import logging
+import time
+import argparse
+import datetime
+from bom_schema import BomSchemaError
+from part_search import FuzzySearchIndex
+from bom_loader import (
+    LoadContext, load_bom, as_sources, get_base_path, operation_summary, coverage_report, SOURCE_COLUMN,
+)
+
+# ─────────────────────────────────────────────────────────────
+# 헤드리스 실행 (python main.py --headless)
+#   Qt 를 띄우지 않고 뷰어와 같은 bom_loader 파이프라인으로 BOM 을 읽어
+#   Operation Summary, 모드별 커버리지, 자산이 없는 파트 목록, 단계별 시간을 JSON/CSV 로 출력한다.
+#   --excel 을 여러 번 주면 모든 엑셀/시트를 동시에 파싱하여 하나의 숲으로 합친 결과를 보고한다.
+#   종료 코드: 0 성공, 2 엑셀 없음/컬럼 구성 오류
+# ─────────────────────────────────────────────────────────────
+MISSING_CSV_COLUMNS = ("Type", "Part No", "Nomenclature")
+
+
+def default_excel_path():
+    return os.path.join(get_base_path(), "01_excel", "data.xlsx")
+
+
+def source_report(result):
+    """출처별 이름, 경로, 시트, 행 수, 최종 루트 파트넘버 목록"""
+    graph = result.graph
+    df = result.df
+    entries = []
+    for number, source in enumerate(result.sources):
+        rows = int((df[SOURCE_COLUMN].cat.codes == number).sum()) if SOURCE_COLUMN in df.columns else len(df)
+        roots = graph.roots[graph.part_source[graph.roots] == number]
+        entries.append({
+            "label": source.label,
+            "excel": os.path.abspath(source.path),
+            "sheet": source.sheet,
+            "rows": rows,
+            "roots": graph.keys[roots].tolist(),
+        })
+    return entries
+
+
+def build_report(excel_path, with_missing=True, log=None):
+    """엑셀(하나 또는 출처 목록)과 자산 폴더를 읽어 (보고서 dict, LoadResult) 를 반환"""
+    start = time.time()
+    result = load_bom(excel_path, LoadContext(log=log), with_search=False)
+    graph = result.graph
+    timing = result.timing
+    with timing.span("coverage_report"):
+        coverage = coverage_report(graph, result.files, with_missing)
+    timing.finish()
+    report = {
+        "excel": os.path.abspath(result.sources[0].path),
+        "generated": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "root": graph.keys[graph.root] if graph.root >= 0 else None,
+        "roots": graph.keys[graph.roots].tolist(),
+        "sources": source_report(result),
+        "summary": operation_summary(result.counts, graph),
+        "coverage": coverage,
+        "elapsed_seconds": round(time.time() - start, 3),
+    }
+    if timing:
+        report["timing"] = timing.to_dict()
+    return report, result
+
+
+def write_missing_csv(report, result, path):
+    """자산이 없는 파트 목록을 CSV 로 저장 (Excel 에서 한글이 깨지지 않도록 BOM 포함 UTF-8)"""
+    graph = result.graph
+    labels = FuzzySearchIndex.part_labels(graph, result.df)
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(MISSING_CSV_COLUMNS)
+        for mode, entry in report["coverage"].items():
+            for key in entry.get("missing", ()):
+                part = graph.lookup(key)
+                writer.writerow((mode, key, labels[part] if part >= 0 else ""))
+
+
+def stderr_log(message, level=logging.INFO):
+    """진행 로그를 표준 오류로 출력 (DEBUG 수준의 파일별 내역은 생략)"""
+    if level >= logging.INFO:
+        print(message, file=sys.stderr)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py --headless",
+        description="GUI 없이 BOM 을 읽어 요약/커버리지/누락 자산 목록을 출력합니다.",
+    )
+    parser.add_argument("--excel", action="append", default=None, metavar="PATH[#SHEET]",
+                        help="BOM 엑셀 경로와 시트 (기본: 01_excel/data.xlsx, 시트 Sheet1). "
+                             "여러 번 주면 동시에 파싱하여 하나의 숲으로 합침")
+    parser.add_argument("--json", default="-", metavar="PATH",
+                        help="JSON 보고서 경로 ('-' 이면 표준 출력, 기본)")
+    parser.add_argument("--csv", default=None, metavar="PATH", help="자산이 없는 파트 목록 CSV 경로")
+    parser.add_argument("--no-missing", action="store_true", help="JSON 에 누락 파트 목록을 넣지 않음")
+    parser.add_argument("--quiet", action="store_true", help="진행 로그를 표준 오류로 출력하지 않음")
+    parser.add_argument("--profile", default=None, metavar="SPANS",
+                        help="cProfile 로 감쌀 구간 이름 (쉼표 구분, all 이면 전체). 01_excel/profile 에 .prof 저장")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    sources = as_sources(args.excel or [default_excel_path()])
+    log = None if args.quiet else stderr_log
+    if args.profile:
+        os.environ["FA50_PROFILE"] = args.profile
+    for source in sources:
+        if not os.path.exists(source.path):
+            print(f"엑셀 파일이 없습니다: {source.path}", file=sys.stderr)
+            return 2
+    try:
+        report, result = build_report(sources, with_missing=not args.no_missing or bool(args.csv), log=log)
+    except BomSchemaError as e:
+        print(f"엑셀 컬럼 구성 오류: {e}", file=sys.stderr)
+        return 2
+    if log and result.timing:
+        log(result.timing.format_summary())
+
+    if args.csv:
+        write_missing_csv(report, result, args.csv)
+        if args.no_missing:
+            for entry in report["coverage"].values():
+                entry.pop("missing", None)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.json == "-":
+        print(text)
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# log_console.py
+
+import os
+import re
+import time
+import logging
+import heapq
+import threading
+from collections import deque, namedtuple
+from logging.handlers import RotatingFileHandler
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# ─────────────────────────────────────────────────────────────
+# 로그 콘솔
+#   appendLog 는 메시지를 링 버퍼에 넣기만 하고, 화면(QPlainTextEdit)에는 타이머로 모아서 한 번에 붙인다.
+#   - 링 버퍼와 화면 모두 줄 수로 제한 (FA50_LOG_MAX_LINES, 기본 5000) 하므로 메모리가 계속 늘지 않는다.
+#     한 메시지가 제한의 1/10 보다 길면 화면에는 앞부분만 보이고, 로그 파일에는 전체가 남는다.
+#     DEBUG 는 별도의 링 버퍼에 두어 파일별 내역이 많아도 INFO 이상의 기록을 밀어내지 않는다.
+#   - 수준은 logging 모듈의 DEBUG/INFO/WARNING/ERROR 를 그대로 쓰며, 화면에는 선택한 수준 이상만 보인다.
+#   - 출처(source)는 메시지 앞의 "[태그]" (예: [scan_assets:Image] -> scan_assets) 로 정하고 출처별로 걸러 볼 수 있다.
+#   - FA50_LOG_FILE=1 (또는 파일 경로) 이면 모든 수준의 로그를 회전 로그 파일에도 남긴다
+#     (기본 01_excel/logs/fa50.log, 2MB x 5개).
+# ─────────────────────────────────────────────────────────────
+DEFAULT_MAX_LINES = 5000
+FLUSH_INTERVAL_MS = 100
+LOG_FILE_BYTES = 2 * 1024 * 1024
+LOG_FILE_BACKUPS = 5
+LOG_DIRNAME = "logs"
+LOG_FILENAME = "fa50.log"
+DEFAULT_SOURCE = "app"
+
+LEVELS = (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR)
+
+# seq 는 기록 순서, message 는 원문(로그 파일용), text 는 화면용 (너무 긴 메시지는 앞부분만), lines 는 text 의 줄 수
+LogRecord = namedtuple("LogRecord", "seq time level source message text lines")
+
+_SOURCE_PATTERN = re.compile(r"\[([A-Za-z_]\w*)")
+
+
+def max_log_lines():
+    try:
+        return max(100, int(os.environ.get("FA50_LOG_MAX_LINES", DEFAULT_MAX_LINES)))
+    except ValueError:
+        return DEFAULT_MAX_LINES
+
+
+def log_file_path(base_path):
+    """FA50_LOG_FILE 설정에 따른 로그 파일 경로 (꺼져 있으면 None)"""
+    value = os.environ.get("FA50_LOG_FILE", "").strip()
+    if not value or value == "0":
+        return None
+    if value == "1":
+        return os.path.join(base_path, "01_excel", LOG_DIRNAME, LOG_FILENAME)
+    return value
+
+
+def _display_text(message, limit):
+    """(화면용 문자열, 줄 수). limit 줄을 넘으면 앞부분만 남긴다."""
+    lines = message.count("\n") + 1
+    if lines <= limit:
+        return message, lines
+    head = message.split("\n", limit)[:limit]
+    head.append(f"... ({lines - limit}줄 생략, 전체 내용은 로그 파일 참고)")
+    return "\n".join(head), limit + 1
+
+
+def source_of(message):
+    """메시지 앞의 [태그] 에서 출처 이름을 꺼낸다 (없으면 DEFAULT_SOURCE)"""
+    if not message.startswith("["):
+        return DEFAULT_SOURCE
+    match = _SOURCE_PATTERN.match(message)
+    return match.group(1) if match else DEFAULT_SOURCE
+
+
+class _Ring:
+    """줄 수 합계로 크기를 제한하는 기록 버퍼"""
+    def __init__(self, max_lines):
+        self.records = deque()
+        self.lines = 0
+        self.max_lines = max_lines
+
+    def append(self, record):
+        self.records.append(record)
+        self.lines += record.lines
+        while self.lines > self.max_lines and len(self.records) > 1:
+            self.lines -= self.records.popleft().lines
+
+    def clear(self):
+        self.records.clear()
+        self.lines = 0
+
+
+class LogConsole(QObject):
+    """
+    링 버퍼 + 일괄 출력 로그 콘솔. append() 는 어느 스레드에서 불러도 되며,
+    화면 반영과 파일 기록은 GUI 스레드의 타이머에서 FLUSH_INTERVAL_MS 마다 한 번에 처리한다.
+    새 출처가 처음 보이면 source_added(출처) 를 보낸다.
+    """
+    source_added = pyqtSignal(str)
+    _wake = pyqtSignal()   # 작업 스레드에서 기록했을 때 GUI 스레드의 타이머를 깨움
+
+    def __init__(self, view, max_lines=None, file_path=None, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.max_lines = max_lines or max_log_lines()
+        self.min_level = logging.INFO
+        self.source_filter = None          # None 이면 전체 출처
+        self.sources = set()
+        self._ring = _Ring(self.max_lines)         # INFO 이상
+        self._debug_ring = _Ring(self.max_lines)   # DEBUG (INFO 이상을 밀어내지 않도록 따로 둠)
+        self._seq = 0
+        self._pending = deque()            # 아직 화면/파일에 반영하지 않은 기록
+        self._lock = threading.Lock()
+        self.view.setMaximumBlockCount(self.max_lines)
+
+        self._file_logger = None
+        if file_path:
+            self._file_logger = self._open_file_logger(file_path)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+        self._wake.connect(self._schedule)
+
+    @staticmethod
+    def _open_file_logger(file_path):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            handler = RotatingFileHandler(file_path, maxBytes=LOG_FILE_BYTES, backupCount=LOG_FILE_BACKUPS,
+                                          encoding="utf-8")
+        except OSError:
+            return None
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s [%(source)s] %(message)s"))
+        logger = logging.getLogger(f"fa50.console.{id(handler)}")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.addHandler(handler)
+        return logger
+
+    # ─── 기록 ─────────────────────────────────────────
+
+    def append(self, message, level=logging.INFO, source=None):
+        self.extend(((message, level),), source)
+
+    def extend(self, entries, source=None):
+        """[(메시지, 수준), ...] 을 한 번에 기록 (작업 스레드가 묶어 보낸 로그용)"""
+        now = time.time()
+        limit = max(1, self.max_lines // 10)
+        with self._lock:
+            records = []
+            for message, level in entries:
+                self._seq += 1
+                records.append(LogRecord(self._seq, now, level, source or source_of(message), message,
+                                         *_display_text(message, limit)))
+            for record in records:
+                (self._debug_ring if record.level < logging.INFO else self._ring).append(record)
+            self._pending.extend(records)
+        if threading.current_thread() is threading.main_thread():
+            self._schedule()
+        else:
+            self._wake.emit()
+
+    def _schedule(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """쌓인 기록을 화면과 로그 파일에 한 번에 반영"""
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if not batch:
+            return
+        for record in batch:
+            if record.source not in self.sources:
+                self.sources.add(record.source)
+                self.source_added.emit(record.source)
+        self._render([record for record in batch if self._visible(record)])
+        if self._file_logger is not None:
+            for record in batch:
+                self._file_logger.log(record.level, record.message, extra={"source": record.source})
+
+    def _visible(self, record):
+        return record.level >= self.min_level and (self.source_filter is None or record.source == self.source_filter)
+
+    def _render(self, records):
+        """화면에 남을 마지막 max_lines 줄만 한 번의 appendPlainText 로 붙인다"""
+        lines = 0
+        start = len(records)
+        while start > 0 and lines < self.max_lines:
+            start -= 1
+            lines += records[start].lines
+        if start < len(records):
+            self.view.appendPlainText("\n".join(self._format(record) for record in records[start:]))
+
+    @staticmethod
+    def _format(record):
+        if record.level >= logging.WARNING:
+            return f"Log event: [{logging.getLevelName(record.level)}] {record.text}"
+        return "Log event: " + record.text
+
+    # ─── 화면 ─────────────────────────────────────────
+
+    def set_filter(self, min_level=None, source=None):
+        """표시 수준/출처를 바꾸고 링 버퍼에서 다시 그린다 (source 가 None 이면 전체)"""
+        if min_level is not None:
+            self.min_level = min_level
+        self.source_filter = source
+        self.rerender()
+
+    def rerender(self):
+        self.flush()
+        with self._lock:
+            if self.min_level < logging.INFO:
+                records = list(heapq.merge(self._ring.records, self._debug_ring.records))
+            else:
+                records = list(self._ring.records)
+        self.view.clear()
+        self._render([record for record in records if self._visible(record)])
+
+    def show_html(self, html):
+        """로그 대신 서식 있는 내용(파트 정보)을 보여줌. 이후 로그는 그 아래에 이어 붙는다."""
+        self.flush()
+        self.view.clear()
+        self.view.appendHtml(html)
+
+    def clear(self):
+        with self._lock:
+            self._ring.clear()
+            self._debug_ring.clear()
+            self._pending.clear()
+        self.view.clear()
+
+    def close(self):
+        self._timer.stop()
+        self.flush()
+        if self._file_logger is not None:
+            for handler in list(self._file_logger.handlers):
+                handler.close()
+                self._file_logger.removeHandler(handler)
+            self._file_logger = None
@@ -1,16 +1,25 @@
 import os
 import sys
-from PyQt5.QtWidgets import QApplication
-from ui_functionality import MainWindow
-from tree_manager import get_base_path, build_tree_view
+import logging
+import multiprocessing
 
 def main():
+    # GUI 모듈은 여기서 import (헤드리스 실행은 Qt 위젯 없이 동작)
+    from PyQt5.QtWidgets import QApplication
+    from ui_functionality import MainWindow
+    from tree_manager import get_base_path
+    from bom_loader import as_sources
+
     app = QApplication(sys.argv)
     window = MainWindow()
 
     base_path = get_base_path()
     excelfolder_path = os.path.join(base_path, "01_excel")
     excel_file_path = os.path.join(excelfolder_path, "data.xlsx")
+    # python main.py 경로[#시트] [경로[#시트] ...] : 지정한 엑셀/시트를 모두 읽어 하나의 트리로 표시
+    specs = [arg for arg in app.arguments()[1:] if not arg.startswith("-")]
+    if specs:
+        excel_file_path = specs[0] if len(specs) == 1 else specs
     
     # JSON 파일 경로를 01_excel 폴더 내부로 지정
     json_file_path = os.path.join(excelfolder_path, "memo.json")
@@ -20,11 +29,23 @@ def main():
     window.json_file_path = json_file_path
     window.load_memo_data()
     
-    if os.path.exists(excel_file_path):
-        build_tree_view(excel_file_path, window)
-    
+    # 창을 먼저 띄우고 엑셀/폴더 로딩은 백그라운드에서 진행
     window.show()
+    window.excel_file_path = excel_file_path
+    missing = [source.path for source in as_sources(excel_file_path) if not os.path.exists(source.path)]
+    if specs:
+        for path in missing:
+            window.appendLog(f"엑셀 파일이 없습니다: {path}", logging.WARNING)
+    if not missing:
+        window.start_bom_load(excel_file_path)
+    
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # PyInstaller 로 빌드한 실행 파일에서 엑셀 파싱 작업 프로세스가 다시 GUI 를 띄우지 않도록
+    multiprocessing.freeze_support()
+    if "--headless" in sys.argv[1:]:
+        # python main.py --headless [--excel 경로] [--json 경로] [--csv 경로] : 요약/커버리지를 JSON/CSV 로 출력
+        import headless
+        sys.exit(headless.main([arg for arg in sys.argv[1:] if arg != "--headless"]))
     main()
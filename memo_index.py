@@ -0,0 +1,88 @@
+# memo_index.py
+
+import re
+import bisect
+
+# 메모 검색 결과의 최대 파트 수
+MEMO_RESULT_LIMIT = 200
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def memo_tokens(text):
+    """메모 내용/시간을 검색 단어로 분리 (대소문자 무시). 날짜(YYYY-MM-DD)는 통째로도 색인한다."""
+    text = str(text).casefold()
+    tokens = set(_TOKEN_RE.findall(text))
+    tokens.update(re.findall(r"\d{4}-\d{2}-\d{2}", text))
+    return tokens
+
+
+class MemoIndex:
+    """
+    메모 내용과 저장 시간에 대한 역색인 (단어 -> 파트번호 집합).
+    검색어의 모든 단어가 (접두어로) 들어 있는 메모를 가진 파트를 찾는다.
+    메모를 저장/삭제할 때 set_part() 로 해당 파트만 다시 색인한다.
+    """
+    def __init__(self):
+        self._postings = {}      # 단어 -> {파트번호, ...}
+        self._part_tokens = {}   # 파트번호 -> {단어, ...} (다시 색인할 때 이전 단어 제거용)
+        self._vocab = None       # 정렬된 단어 목록 (접두어 검색용, 색인이 바뀌면 다시 만든다)
+
+    def __len__(self):
+        return len(self._part_tokens)
+
+    def parts(self):
+        """메모가 있는 파트번호 집합"""
+        return set(self._part_tokens)
+
+    def rebuild(self, memo_data):
+        self._postings = {}
+        self._part_tokens = {}
+        for part, entries in memo_data.items():
+            self.set_part(part, entries)
+
+    def set_part(self, part, entries):
+        """part 의 메모 목록(entries)으로 다시 색인한다 (빈 목록이면 색인에서 제거)."""
+        old = self._part_tokens.pop(part, set())
+        tokens = set()
+        for entry in entries or ():
+            tokens |= memo_tokens(entry.get("memo", ""))
+            tokens |= memo_tokens(entry.get("timestamp", ""))
+        for token in old - tokens:
+            holders = self._postings[token]
+            holders.discard(part)
+            if not holders:
+                del self._postings[token]
+        for token in tokens - old:
+            self._postings.setdefault(token, set()).add(part)
+        if entries:
+            self._part_tokens[part] = tokens
+        if (old - tokens) or (tokens - old):
+            self._vocab = None
+
+    def _matching(self, token):
+        """token 으로 시작하는 단어를 가진 파트번호 집합"""
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        vocab = self._vocab
+        lo = bisect.bisect_left(vocab, token)
+        hi = bisect.bisect_left(vocab, token + "\uffff", lo)
+        if hi - lo == 1:
+            return self._postings[vocab[lo]]
+        result = set()
+        for word in vocab[lo:hi]:
+            result |= self._postings[word]
+        return result
+
+    def search(self, text, limit=MEMO_RESULT_LIMIT):
+        """검색어의 모든 단어를 포함하는 메모가 있는 파트번호 목록 (파트번호 순)"""
+        tokens = sorted(memo_tokens(text), key=len, reverse=True)
+        if not tokens:
+            return []
+        result = None
+        for token in tokens:
+            parts = self._matching(token)
+            result = set(parts) if result is None else result & parts
+            if not result:
+                return []
+        return sorted(result)[:limit]
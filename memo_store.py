@@ -0,0 +1,544 @@
+# memo_store.py
+
+import os
+import json
+import time
+import uuid
+import queue
+import tempfile
+import threading
+from contextlib import contextmanager
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# ─────────────────────────────────────────────────────────────
+# 메모 저장소 (01_excel/memo.jsonl)
+#   한 줄에 변경 하나를 JSON 으로 덧붙이는 저널 방식.
+#     {"op": "add", "part": 파트번호, "memo": 내용, "timestamp": 시간, "writer": 기록한 인스턴스}
+#     {"op": "clear", "part": 파트번호, "writer": ...}
+#     {"op": "snapshot", "generation": ...}   ← 압축된 파일의 첫 줄
+#   시작할 때 저널을 처음부터 재생하여 { 파트번호: [ {memo, timestamp}, ... ] } 를 만든다.
+#   기록은 백그라운드 스레드가 하므로 저장 버튼이 파일 I/O 를 기다리지 않는다.
+#   지운 메모가 쌓여 저널이 커지면 현재 내용만 새 파일에 쓰고 os.replace 로 교체(압축)한다.
+#   예전 memo.json 은 저널이 없을 때 한 번 읽어 옮기고, 파일은 백업으로 그대로 둔다.
+#
+# 여러 프로그램이 같은 폴더를 함께 쓰는 경우
+#   - 저널을 읽고 쓰는 동안 memo.jsonl.lock 에 OS 파일 잠금을 건다 (Windows: msvcrt, 그 외: fcntl).
+#   - 압축은 잠금을 잡은 채 파일 내용 전체로 다시 계산하므로 다른 프로그램의 기록을 잃지 않는다.
+#   - poll() 은 마지막으로 읽은 위치 이후에 덧붙은 줄만 읽는다. 자신이 쓴 줄(writer 가 같음)은
+#     이미 반영되어 있으므로 건너뛰고, 다른 프로그램이 압축했으면(generation 변경) 처음부터 다시 읽는다.
+#   - 잠금을 기다리는 읽기는 기록과 같은 작업 스레드가 하고, 읽은 줄만 시그널로 GUI 스레드에 넘겨 data 에 반영한다.
+# ─────────────────────────────────────────────────────────────
+JOURNAL_SUFFIX = ".jsonl"
+LOCK_SUFFIX = ".lock"
+# 저널 줄 수가 (현재 메모 수 * COMPACT_RATIO + COMPACT_SLACK) 를 넘으면 압축
+COMPACT_RATIO = 2
+COMPACT_SLACK = 200
+# 다른 프로그램의 변경을 확인하는 주기 (ms)
+POLL_INTERVAL_MS = 2000
+
+
+def journal_path_for(json_path):
+    """예전 memo.json 경로 -> 저널 경로 (memo.jsonl)"""
+    return os.path.splitext(json_path)[0] + JOURNAL_SUFFIX
+
+
+@contextmanager
+def file_lock(lock_path):
+    """lock_path 파일에 배타적 잠금을 건다 (다른 프로세스가 잡고 있으면 풀릴 때까지 대기)."""
+    f = open(lock_path, "a+b")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # 약 10초 재시도 후 OSError
+                    break
+                except OSError:
+                    continue
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    finally:
+        f.close()
+
+
+def _normalize_entries(entries):
+    """예전 형식(단일 dict / 문자열)도 [ {memo, timestamp}, ... ] 로 맞춤"""
+    if isinstance(entries, dict):
+        entries = [entries]
+    elif not isinstance(entries, list):
+        entries = [{"memo": str(entries), "timestamp": ""}]
+    result = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            result.append({"memo": str(entry.get("memo", "")), "timestamp": str(entry.get("timestamp", ""))})
+        else:
+            result.append({"memo": str(entry), "timestamp": ""})
+    return result
+
+
+def _apply_record(data, record):
+    """저널 한 줄을 data 에 반영하고 바뀐 파트번호를 반환 (스냅샷 머리줄은 None)"""
+    op = record["op"]
+    if op == "snapshot":
+        return None
+    part = record["part"]
+    if op == "add":
+        data.setdefault(part, []).append(
+            {"memo": record["memo"], "timestamp": record.get("timestamp", "")}
+        )
+    elif op == "clear":
+        data.pop(part, None)
+    else:
+        raise KeyError(op)
+    return part
+
+
+def _valid_record(record):
+    """재생할 수 있는 add/clear 줄인지 확인"""
+    op = record.get("op")
+    if op == "add":
+        return isinstance(record.get("part"), str) and "memo" in record
+    if op == "clear":
+        return isinstance(record.get("part"), str)
+    return False
+
+
+def _snapshot_records(data, generation):
+    records = [{"op": "snapshot", "generation": generation}]
+    records.extend(
+        {"op": "add", "part": part, "memo": entry["memo"], "timestamp": entry["timestamp"]}
+        for part, entries in data.items()
+        for entry in entries
+    )
+    return records
+
+
+class MemoStore(QObject):
+    """
+    파트별 메모 저장소. data 는 GUI 스레드에서만 바꾸고, 파일 기록은 작업 스레드가 순서대로 처리한다.
+    기록 실패는 error, 다른 프로그램이 쓴 메모를 읽어 들이면 changed(바뀐 파트번호 집합) 시그널을 보낸다.
+    """
+    error = pyqtSignal(str)
+    changed = pyqtSignal(object)
+    _polled = pyqtSignal(object)   # 작업 스레드가 읽은 저널 변경분 -> GUI 스레드
+
+    def __init__(self, journal_path, legacy_path=None, parent=None):
+        super().__init__(parent)
+        self.journal_path = journal_path
+        self.lock_path = journal_path + LOCK_SUFFIX
+        self.legacy_path = legacy_path
+        self.writer_id = uuid.uuid4().hex  # 이 인스턴스가 쓴 줄을 구분
+        self.data = {}             # 파트번호 -> [ {"memo": 내용, "timestamp": 시간}, ... ]
+        self.skipped_lines = 0     # 읽지 못한(손상된) 저널 줄 수
+        self.migrated = 0          # memo.json 에서 옮긴 파트 수
+        self._records = 0          # 저널 줄 수 (압축 판단용)
+        # 아래 세 값은 load() 이후 작업 스레드만 사용
+        self._offset = 0           # 저널에서 읽은 바이트 위치 (완전한 줄 단위)
+        self._generation = None    # 마지막으로 읽은 저널의 스냅샷 구분값
+        self._file_state = None    # 마지막으로 확인한 (크기, 수정시각)
+        self._seq = 0              # 이 인스턴스가 요청한 기록 수
+        self._own = []             # 다시 읽은 저널에 아직 없을 수 있는 자신의 기록 [(순번, 기록), ...]
+        self._written_seq = 0      # 작업 스레드가 처리(기록)를 마친 마지막 순번 (작업 스레드만 사용)
+        self._poll_seq = None      # 처리 중인 poll 요청의 순번 (없으면 None)
+        self._closed = False
+        self._queue = queue.Queue()
+        self._thread = None
+        self._polled.connect(self._apply_polled)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self.poll)
+
+    # ─── 읽기 ─────────────────────────────────────────────
+
+    def load(self):
+        """저널을 재생하여 data 를 만든다. 저널이 없으면 memo.json 을 옮긴다. data 를 반환."""
+        self.skipped_lines = 0
+        with file_lock(self.lock_path):
+            # 다른 프로그램이 먼저 옮겼을 수 있으므로 잠금 안에서 다시 확인
+            if not os.path.exists(self.journal_path) and self.legacy_path and os.path.exists(self.legacy_path):
+                self._migrate()
+            self._reload()
+        self._start_writer()
+        if self._records > self._live_count() * COMPACT_RATIO + COMPACT_SLACK:
+            self.compact()
+        return self.data
+
+    def _reload(self):
+        """저널 전체를 다시 읽는다 (잠금 안에서 호출). data 객체는 유지하고 내용만 바꾼다."""
+        data, self._records = self._read_all()
+        self.data.clear()
+        self.data.update(data)
+
+    def _read_all(self):
+        """저널을 처음부터 재생한 (data, 줄 수) 를 반환 (잠금 안에서 호출)"""
+        self._offset = 0
+        self._generation = None
+        data = {}
+        records = self._read_new()
+        for record in records:
+            _apply_record(data, record)
+        return data, len(records)
+
+    def _read_new(self):
+        """
+        _offset 이후에 덧붙은 완전한 줄의 기록 목록을 저널 순서대로 반환 (잠금 안에서 호출, 자신의 기록 포함).
+        끝이 잘린 마지막 줄은 다음에 다시 읽는다.
+        """
+        records = []
+        try:
+            with open(self.journal_path, "rb") as f:
+                st = os.fstat(f.fileno())
+                self._file_state = (st.st_size, st.st_mtime_ns)
+                f.seek(self._offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            self._file_state = None
+            return records
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return records
+        self._offset += end + 1
+        for line in chunk[:end].split(b"\n"):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line.decode("utf-8"))
+                if record.get("op") == "snapshot":
+                    self._generation = record.get("generation")
+                    continue
+            except (ValueError, AttributeError):
+                record = None
+            if record is None or not _valid_record(record):
+                # 기록 도중 종료되어 잘린 줄 등은 건너뛰고 나머지는 살린다
+                self.skipped_lines += 1
+                continue
+            records.append(record)
+        return records
+
+    def _journal_generation(self):
+        """저널 첫 줄이 스냅샷 머리줄이면 그 generation, 아니면 None"""
+        try:
+            with open(self.journal_path, "rb") as f:
+                first = f.readline()
+            record = json.loads(first.decode("utf-8"))
+            return record.get("generation") if record.get("op") == "snapshot" else None
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def poll(self):
+        """
+        다른 프로그램이 바꾼 저널을 읽도록 작업 스레드에 요청한다 (GUI 스레드는 파일 잠금을 기다리지 않음).
+        읽은 변경분은 _apply_polled 에서 data 에 반영되고, 바뀐 파트번호가 있으면 changed 시그널을 보낸다.
+        """
+        if self._poll_seq is not None or self._thread is None or not self._thread.is_alive():
+            return
+        self._poll_seq = self._seq
+        self._queue.put(("poll", self._seq))
+
+    def _poll_file(self, seq):
+        """
+        (작업 스레드) 저널이 바뀌었으면 새 줄 또는 전체를 읽어 _polled 로 넘긴다. seq 는 요청 시점의 기록 순번.
+        바뀐 것이 없어도 요청마다 한 번 응답한다 (GUI 쪽에서 처리 중인 요청을 정리하도록).
+        """
+        changes = None
+        try:
+            st = os.stat(self.journal_path)
+            if (st.st_size, st.st_mtime_ns) != self._file_state:
+                with file_lock(self.lock_path):
+                    changes = self._read_changes(seq)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.error.emit(f"메모 읽기 중 오류: {e}")
+        self._polled.emit(changes or ("none", seq, None, 0, True))
+
+    def _read_changes(self, seq, reply=True):
+        """
+        (작업 스레드, 잠금 안) 마지막으로 읽은 뒤의 저널 변경분. 다른 프로그램이 압축했으면 전체를 다시 읽는다.
+        (종류, seq, 내용, 다른 프로그램의 줄 수, poll 응답 여부) 또는 None 을 반환.
+        """
+        if os.path.getsize(self.journal_path) < self._offset or self._journal_generation() != self._generation:
+            data, count = self._read_all()
+            return ("reload", seq, data, count, reply)
+        skipped = self.skipped_lines
+        records = self._read_new()
+        others = sum(1 for record in records if record.get("writer") != self.writer_id)
+        if others or self.skipped_lines != skipped:
+            return ("append", seq, records, others, reply)
+        return None
+
+    def _apply_polled(self, polled):
+        """
+        작업 스레드가 읽은 변경분을 data 에 반영 (GUI 스레드).
+        seq 이후에 요청한 자신의 기록은 읽은 저널에 아직 없으므로 저널 순서대로 그 뒤에 다시 얹는다.
+        """
+        kind, seq, payload, count, reply = polled
+        if reply:
+            self._poll_seq = None
+        if self._closed:
+            return
+        pending = [record for n, record in self._own if n > seq]
+        if kind == "reload":
+            data = payload
+            for record in pending:
+                _apply_record(data, record)
+            changed = {
+                part for part in set(data) | set(self.data)
+                if data.get(part) != self.data.get(part)
+            }
+            self.data.clear()
+            self.data.update(data)
+            self._records = count + len(pending)
+        elif kind == "append":
+            changed = self._merge_records(payload, pending)
+            self._records += count
+        else:
+            changed = set()
+        # seq 까지의 기록은 저널에 있고, 이후에 올 변경분의 seq 는 이보다 작지 않으므로 더는 필요 없음
+        # (poll 은 바뀐 것이 없어도 응답하므로 한 프로그램만 쓰는 경우에도 _own 이 계속 늘지 않는다)
+        del self._own[:sum(1 for n, _ in self._own if n <= seq)]
+        if changed:
+            self.changed.emit(changed)
+
+    def _merge_records(self, records, pending):
+        """
+        새로 읽은 저널 줄(자신의 줄 포함)과 아직 쓰이지 않은 자신의 기록을 저널 순서대로 반영하고 바뀐 파트번호를 반환.
+        data 에는 자신의 기록이 이미 먼저 반영되어 있으므로, 다른 프로그램이 건드린 파트만 순서대로 다시 계산한다.
+        """
+        touched = {record["part"] for record in records if record.get("writer") != self.writer_id}
+        sequences = {part: [] for part in touched}
+        for record in records + pending:
+            if record["part"] in sequences:
+                sequences[record["part"]].append(record)
+        changed = set()
+        for part, sequence in sequences.items():
+            before = self.data.get(part)
+            clears = [i for i, record in enumerate(sequence) if record["op"] == "clear"]
+            if clears:
+                # 마지막 clear 이후의 기록만 남음
+                data = {}
+                sequence = sequence[clears[-1] + 1:]
+            else:
+                # 자신의 add 는 모두 끝에 붙어 있으므로 떼어 내고 저널 순서대로 다시 붙임
+                own = sum(1 for record in sequence if record.get("writer") == self.writer_id)
+                entries = list(before or [])
+                data = {part: entries[:len(entries) - own]}
+            for record in sequence:
+                _apply_record(data, record)
+            if data.get(part):
+                self.data[part] = data[part]
+            else:
+                self.data.pop(part, None)
+            if self.data.get(part) != before:
+                changed.add(part)
+        return changed
+
+    def start_polling(self):
+        self._poll_timer.start()
+
+    def stop_polling(self):
+        self._poll_timer.stop()
+
+    def _migrate(self):
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                content = f.read().strip()
+            legacy = json.loads(content) if content else {}
+        except (OSError, ValueError) as e:
+            # 손상된 memo.json 은 건드리지 않고 빈 저장소로 시작 (원본은 그대로 남아 있음)
+            self.error.emit(f"memo.json 을 읽지 못했습니다: {e}")
+            return
+        if not isinstance(legacy, dict):
+            return
+        data = {}
+        for part, entries in legacy.items():
+            entries = _normalize_entries(entries)
+            if entries:
+                data[str(part)] = entries
+        self.migrated = len(data)
+        self._write_snapshot(_snapshot_records(data, uuid.uuid4().hex))
+
+    def _live_count(self):
+        return sum(len(entries) for entries in self.data.values())
+
+    # ─── 변경 ─────────────────────────────────────────────
+
+    def entries(self, part):
+        return self.data.get(part, [])
+
+    def add(self, part, memo, timestamp):
+        entry = {"memo": memo, "timestamp": timestamp}
+        self.data.setdefault(part, []).append(entry)
+        self._enqueue({"op": "add", "part": part, "memo": memo, "timestamp": timestamp, "writer": self.writer_id})
+        return entry
+
+    def clear(self, part):
+        if part not in self.data:
+            return False
+        del self.data[part]
+        self._enqueue({"op": "clear", "part": part, "writer": self.writer_id})
+        return True
+
+    def compact(self):
+        """저널을 현재 내용만 담은 파일로 교체 (작업 스레드에서 앞선 기록이 모두 끝난 뒤 수행)"""
+        self._records = self._live_count()
+        self._queue.put(("compact", None))
+
+    def _enqueue(self, record):
+        self._records += 1
+        self._seq += 1
+        self._own.append((self._seq, record))
+        self._queue.put(("append", (self._seq, record)))
+        if self._records > self._live_count() * COMPACT_RATIO + COMPACT_SLACK:
+            self.compact()
+
+    # ─── 작업 스레드 ───────────────────────────────────────
+
+    def _start_writer(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._writer_loop, name="MemoStoreWriter", daemon=True)
+            self._thread.start()
+
+    def _writer_loop(self):
+        while True:
+            task = self._queue.get()
+            tasks = [task]
+            # 밀린 작업을 한 번에 처리하여 잠금/fsync 횟수를 줄임
+            while True:
+                try:
+                    tasks.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            records = []
+            for kind, payload in tasks:
+                if kind == "append":
+                    records.append(payload)
+                elif kind == "compact":
+                    self._append_records(records)
+                    records = []
+                    self._compact_file()
+                elif kind == "poll":
+                    # 앞서 요청한 기록을 먼저 써야 seq 까지의 자신의 기록이 저널에 있음
+                    self._append_records(records)
+                    records = []
+                    self._poll_file(payload)
+                elif kind == "stop":
+                    stop = True
+            self._append_records(records)
+            for _ in tasks:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _append_records(self, records):
+        """[(순번, 기록), ...] 을 저널 끝에 덧붙인다"""
+        if not records:
+            return
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for _, r in records).encode("utf-8")
+        try:
+            with file_lock(self.lock_path):
+                with open(self.journal_path, "ab+") as f:
+                    # 다른 프로그램(또는 이전 실행)이 줄 중간에서 끊겼다면 새 줄에서 시작
+                    end = f.seek(0, os.SEEK_END)
+                    if end > 0:
+                        f.seek(end - 1)
+                        if f.read(1) != b"\n":
+                            payload = b"\n" + payload
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError as e:
+            self.error.emit(f"메모 저장 중 오류: {e}")
+        finally:
+            # 실패한 기록도 다시 시도하지 않으므로 처리한 것으로 본다 (압축 시 넘기는 변경분의 seq)
+            self._written_seq = records[-1][0]
+
+    def _compact_file(self):
+        """
+        잠금을 잡은 채 저널 전체(다른 프로그램의 기록 포함)로 현재 내용을 계산해 새 파일로 교체.
+        아직 읽지 않은 다른 프로그램의 기록은 먼저 GUI 로 넘기고, 읽은 위치를 새 파일 끝으로 옮겨
+        다음 poll 이 자신이 압축한 저널을 처음부터 다시 읽지 않게 한다.
+        """
+        changes = None
+        try:
+            with file_lock(self.lock_path):
+                changes = self._read_changes(self._written_seq, reply=False)
+                data = {}
+                with open(self.journal_path, "rb") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line.decode("utf-8"))
+                            if _valid_record(record):
+                                _apply_record(data, record)
+                        except (ValueError, AttributeError):
+                            continue
+                generation = uuid.uuid4().hex
+                if self._write_snapshot(_snapshot_records(data, generation)):
+                    st = os.stat(self.journal_path)
+                    self._offset = st.st_size
+                    self._generation = generation
+                    self._file_state = (st.st_size, st.st_mtime_ns)
+        except OSError as e:
+            self.error.emit(f"메모 저널 압축 중 오류: {e}")
+        if changes is not None:
+            self._polled.emit(changes)
+
+    def _write_snapshot(self, records):
+        """records 를 임시 파일에 쓴 뒤 저널과 교체 (잠금 안에서 호출). 성공하면 True."""
+        tmp_path = None
+        try:
+            folder = os.path.dirname(self.journal_path) or "."
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.journal_path) + ".", suffix=".tmp", dir=folder)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o644)  # mkstemp 기본 권한(0600) 대신 다른 사용자도 읽을 수 있게
+            for attempt in range(5):
+                try:
+                    os.replace(tmp_path, self.journal_path)
+                    break
+                except PermissionError:
+                    # Windows: 저널을 잠깐 열어 둔 프로그램(백신 등)이 있으면 잠시 후 다시 시도
+                    if attempt == 4:
+                        raise
+                    time.sleep(0.1)
+            tmp_path = None
+            return True
+        except OSError as e:
+            self.error.emit(f"메모 저널 압축 중 오류: {e}")
+            return False
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def flush(self):
+        """지금까지 요청한 기록이 모두 파일에 쓰일 때까지 대기"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """남은 기록을 마치고 작업 스레드를 종료"""
+        self._poll_timer.stop()
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(("stop", None))
+            self._thread.join()
+        self._thread = None
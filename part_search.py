@@ -0,0 +1,224 @@
+# part_search.py
+
+import bisect
+import numpy as np
+
+# 검색 결과(노드 위치)의 최대 개수
+SEARCH_MAX_HITS = 1000
+# 자동완성 목록에 보여줄 최대 파트넘버 수
+COMPLETION_LIMIT = 30
+
+
+class PartSearchIndex:
+    """
+    트리 로드 시 만들어 두는 파트넘버 검색 인덱스 (대소문자 무시).
+
+    - 접두어 검색 : 정렬된 대문자 파트넘버 목록에서 bisect
+    - 부분 문자열 : 정렬된 파트넘버를 줄바꿈으로 이어 붙인 문자열에서 str.find 로 찾고,
+                    각 파트넘버의 시작 위치 배열로 어느 파트인지 역산
+    결과는 파트 id 이며, 트리뷰 상의 모든 위치는 occurrences() 로 얻는다.
+    """
+    def __init__(self, graph):
+        self.graph = graph
+        upper = graph.upper_keys
+        order = np.argsort(upper, kind="stable") if len(upper) else np.zeros(0, dtype=np.int64)
+        self._ids = order
+        self._sorted = upper[order].tolist()
+        self._text = "\n".join(self._sorted) + "\n"
+        lengths = np.fromiter((len(k) + 1 for k in self._sorted), dtype=np.int64, count=len(self._sorted))
+        self._starts = np.zeros(len(self._sorted), dtype=np.int64)
+        if len(lengths):
+            np.cumsum(lengths[:-1], out=self._starts[1:])
+
+    def _prefix_range(self, text):
+        lo = bisect.bisect_left(self._sorted, text)
+        hi = bisect.bisect_left(self._sorted, text + "\uffff", lo)
+        return lo, hi
+
+    def match_parts(self, text, limit=None):
+        """
+        검색어를 포함하는 파트 id 목록. 정확히 일치 → 접두어 → 부분 문자열 순서이며
+        같은 그룹 안에서는 파트넘버 순으로 정렬된다.
+        """
+        text = text.strip().upper()
+        if not text or "\n" in text:
+            return []
+        lo, hi = self._prefix_range(text)
+        positions = list(range(lo, hi if limit is None else min(hi, lo + limit)))
+
+        # 접두어 구간 밖에서 부분 문자열 일치
+        extra = []
+        start = 0
+        find = self._text.find
+        while limit is None or len(positions) + len(extra) < limit:
+            pos = find(text, start)
+            if pos < 0:
+                break
+            k = int(np.searchsorted(self._starts, pos, side="right")) - 1
+            if not lo <= k < hi:
+                extra.append(k)
+            # 같은 파트넘버 안의 두 번째 일치는 건너뛰고 다음 파트넘버부터 계속
+            start = int(self._starts[k + 1]) if k + 1 < len(self._starts) else len(self._text)
+        return [int(self._ids[k]) for k in positions + extra]
+
+    def complete(self, text, limit=COMPLETION_LIMIT):
+        """자동완성 후보 파트넘버 (트리뷰에 나타나는 파트만)"""
+        graph = self.graph
+        result = []
+        for part in self.match_parts(text, limit * 2):
+            if graph.is_reachable(part) and graph.keys[part] not in result:
+                result.append(graph.keys[part])
+                if len(result) >= limit:
+                    break
+        return result
+
+    def occurrences(self, text, limit=SEARCH_MAX_HITS):
+        """
+        검색어와 일치하는 트리뷰 상의 모든 위치 (파트 id, row 경로) 목록 (최대 limit 개).
+        정확히 일치하는 파트넘버가 있으면 그 위치만, 없으면 접두어/부분 문자열 일치 위치를 반환.
+        트리뷰 전위 순회 순서이며, 반복되는 하위 조립품 안의 파트는 쓰인 위치마다 따로 나온다.
+        """
+        graph = self.graph
+        text = text.strip().upper()
+        parts = self.match_parts(text, limit)
+        exact = [p for p in parts if graph.upper_keys[p] == text]
+        flags = np.zeros(len(graph), dtype=bool)
+        flags[exact or parts] = True
+        return graph.occurrence_paths(flags, limit)
+
+
+# ─────────────────────────────────────────────────────────────
+# 퍼지 검색 (Part No + Nomenclature 트라이그램 역색인)
+#   각 파트의 "파트넘버 품명" 문자열을 대문자·공백 정리 후 앞뒤에 공백을 붙여 3글자 단위로 나누고,
+#   트라이그램 -> 파트 id 목록(CSR)으로 보관한다.
+#   점수는 검색어와 공유하는 트라이그램 수로 계산한 Dice 계수 2|A∩B| / (|A|+|B|).
+#   인덱스 배열은 엑셀 파싱 캐시 옆에 저장해 두고 같은 엑셀이면 다시 읽어 쓴다.
+# ─────────────────────────────────────────────────────────────
+FUZZY_VERSION = 1
+FUZZY_RESULT_LIMIT = 50
+# 이 점수 미만인 결과는 버림
+FUZZY_MIN_SCORE = 0.2
+
+
+def _fuzzy_text(text):
+    return " " + " ".join(str(text).upper().split()) + " "
+
+
+def _trigram_codes(codes):
+    """유니코드 코드값 배열 -> 연속 3글자를 하나의 정수(21비트 x 3)로 묶은 배열"""
+    codes = codes.astype(np.uint64)
+    return (codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:]
+
+
+def _sorted_unique(values):
+    """정렬 후 인접 중복 제거 (큰 정수 배열에서 np.unique 보다 빠름)"""
+    values = np.sort(values)
+    if len(values):
+        values = values[np.concatenate(([True], values[1:] != values[:-1]))]
+    return values
+
+
+def _query_trigrams(text):
+    codes = np.frombuffer(_fuzzy_text(text).encode("utf-32-le"), dtype=np.uint32)
+    if len(codes) < 3:
+        return np.zeros(0, dtype=np.uint64)
+    return _sorted_unique(_trigram_codes(codes))
+
+
+class FuzzySearchIndex:
+    """
+    파트넘버와 품명(Nomenclature)에 대한 트라이그램 역색인.
+    search() 는 유사도 순으로 (파트 id, 점수) 목록을 반환한다.
+    """
+    def __init__(self, graph, labels, tri_codes, post_ptr, post_docs, doc_sizes):
+        self.graph = graph
+        self.labels = labels          # 파트 id -> 품명 (결과 목록 표시용)
+        self.tri_codes = tri_codes    # 정렬된 트라이그램 코드
+        self.post_ptr = post_ptr      # tri_codes[i] 의 파트 id 는 post_docs[post_ptr[i]:post_ptr[i+1]]
+        self.post_docs = post_docs
+        self.doc_sizes = doc_sizes    # 파트 id -> 서로 다른 트라이그램 수
+
+    @staticmethod
+    def part_labels(graph, df):
+        """파트 id -> 품명 (파트넘버로 처음 등장하는 행의 Nomenclature, 없으면 빈 문자열)"""
+        if df is None or "Nomenclature" not in df.columns:
+            return [""] * len(graph)
+        names = df["Nomenclature"].to_numpy(dtype=object)
+        return [
+            "" if row < 0 or not isinstance(names[row], str) else names[row].strip()
+            for row in graph.first_row.tolist()
+        ]
+
+    @classmethod
+    def build(cls, graph, labels):
+        """모든 파트의 트라이그램을 한 번에 numpy 로 추출하여 역색인을 만든다 (파트별 파이썬 루프 없음)."""
+        texts = [_fuzzy_text(f"{key} {label}") for key, label in zip(graph.keys.tolist(), labels)]
+        n = len(texts)
+        if not n:
+            empty = np.zeros(0, dtype=np.int64)
+            return cls(graph, labels, empty.astype(np.uint64), np.zeros(1, dtype=np.int64), empty, empty)
+        # 문서 구분자(\0)를 사이에 두고 이어 붙인 뒤, 구분자를 포함하지 않는 3글자만 사용
+        codes = np.frombuffer("\0".join(texts).encode("utf-32-le"), dtype=np.uint32)
+        lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64, count=n)
+        doc_of = np.repeat(np.arange(n, dtype=np.int64), lengths)[:len(codes)]
+        valid = (codes[:-2] != 0) & (codes[1:-1] != 0) & (codes[2:] != 0)
+        tris = _trigram_codes(codes)[valid]
+        docs = doc_of[:-2][valid]
+
+        tri_codes = _sorted_unique(tris)
+        tri_ids = np.searchsorted(tri_codes, tris).astype(np.int64)
+        pairs = _sorted_unique(tri_ids * n + docs)  # (트라이그램, 파트) 중복 제거 + 정렬
+        pair_tri = pairs // n
+        post_docs = pairs % n
+        post_ptr = np.zeros(len(tri_codes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pair_tri, minlength=len(tri_codes)), out=post_ptr[1:])
+        doc_sizes = np.bincount(post_docs, minlength=n)
+        return cls(graph, labels, tri_codes, post_ptr, post_docs, doc_sizes)
+
+    @classmethod
+    def load_or_build(cls, graph, df, excel_path=None, variant="", log=None):
+        """엑셀 캐시 옆에 저장된 인덱스가 같은 엑셀 내용으로 만들어졌으면 재사용, 아니면 새로 만들어 저장."""
+        from excel_cache import load_derived, save_derived
+
+        labels = cls.part_labels(graph, df)
+        name = f"fuzzy{FUZZY_VERSION}"
+        if excel_path:
+            arrays = load_derived(excel_path, name, variant)
+            if arrays is not None and len(arrays.get("doc_sizes", ())) == len(graph):
+                if log:
+                    log("[part_search] 퍼지 검색 인덱스 캐시 사용")
+                return cls(graph, labels, arrays["tri_codes"], arrays["post_ptr"],
+                           arrays["post_docs"], arrays["doc_sizes"])
+        index = cls.build(graph, labels)
+        if excel_path:
+            save_derived(excel_path, name, {
+                "tri_codes": index.tri_codes, "post_ptr": index.post_ptr,
+                "post_docs": index.post_docs, "doc_sizes": index.doc_sizes,
+            }, variant)
+        return index
+
+    def search(self, text, limit=FUZZY_RESULT_LIMIT, min_score=FUZZY_MIN_SCORE):
+        """검색어와 유사한 파트를 점수 내림차순으로 [(파트 id, 점수), ...] 반환 (트리뷰에 나타나는 파트만)."""
+        query = _query_trigrams(text)
+        if not len(query) or not len(self.tri_codes):
+            return []
+        pos = np.searchsorted(self.tri_codes, query)
+        inside = pos < len(self.tri_codes)
+        pos, query_in = pos[inside], query[inside]
+        pos = pos[self.tri_codes[pos] == query_in]
+        if not len(pos):
+            return []
+        postings = np.concatenate([self.post_docs[self.post_ptr[i]:self.post_ptr[i + 1]] for i in pos])
+        shared = np.bincount(postings, minlength=len(self.doc_sizes))
+        docs = np.flatnonzero(shared)
+        shared = shared[docs]
+        scores = 2.0 * shared / (len(query) + self.doc_sizes[docs])
+        keep = (scores >= min_score) & (self.graph.depth[docs] >= 0)
+        docs, scores = docs[keep], scores[keep]
+        if len(docs) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            docs, scores = docs[top], scores[top]
+        # 점수 내림차순, 같은 점수는 파트넘버 순
+        keys = self.graph.keys[docs]
+        order = sorted(range(len(docs)), key=lambda i: (-scores[i], keys[i]))
+        return [(int(docs[i]), float(scores[i])) for i in order]
@@ -0,0 +1,246 @@
+# perf_timing.py
+
+import os
+import json
+import time
+import cProfile
+import datetime
+import tempfile
+import threading
+import contextlib
+
+# ─────────────────────────────────────────────────────────────
+# 단계별 시간 측정 (Qt 없이 동작)
+#   로딩 파이프라인의 단계를 이름 있는 구간(span)으로 감싸 중첩 구조로 시간과 개수(행/노드/파일)를 남긴다.
+#     root = start_span("load")
+#     with root.span("read_excel") as span:
+#         ...
+#         span.count(rows=len(df))
+#   - 구간은 단계 단위로만 만들므로 측정 비용은 무시할 수준이며, FA50_TIMING=0 이면 아무것도 기록하지 않는다.
+#   - FA50_PROFILE=구간이름[,구간이름...] (또는 all) 이면 해당 구간을 cProfile 로 감싸
+#     profile_dir 에 <구간이름>_<시각>.prof 를 남긴다 (snakeviz, pstats 등으로 확인).
+#     한 스레드에서는 가장 바깥 구간 하나만 프로파일한다.
+#   - 결과는 format_summary() 로 로그에, to_dict() 로 JSON 에 쓴다.
+# ─────────────────────────────────────────────────────────────
+TIMING_FILENAME = "timing_log.jsonl"
+PROFILE_DIRNAME = "profile"
+# timing_log.jsonl 에 남기는 최근 기록 수
+TIMING_KEEP = 200
+
+_profiling = threading.local()
+
+
+def timing_enabled():
+    return os.environ.get("FA50_TIMING", "1") != "0"
+
+
+def profile_targets():
+    """FA50_PROFILE 에 지정된 구간 이름 집합 ("*" 은 전체)"""
+    value = os.environ.get("FA50_PROFILE", "").strip()
+    if not value or value == "0":
+        return frozenset()
+    if value.lower() in ("1", "all", "*"):
+        return frozenset(("*",))
+    return frozenset(name.strip() for name in value.split(",") if name.strip())
+
+
+def _wants_profile(name):
+    targets = profile_targets()
+    if not targets:
+        return False
+    # "scan:Image" 같은 구간은 "scan" 으로도 지정할 수 있다
+    return "*" in targets or name in targets or name.split(":", 1)[0] in targets
+
+
+class Span:
+    """이름 있는 측정 구간. 하위 구간(children)과 개수(counts)를 가진다."""
+    def __init__(self, name, counts=None, profile_dir=None):
+        self.name = name
+        self.counts = dict(counts or {})
+        self.children = []
+        self.profile_dir = profile_dir   # .prof 를 남길 폴더 (None 이면 프로파일하지 않음)
+        self.profile_path = None
+        self.started = time.time()
+        self.elapsed = None
+        self._start = time.perf_counter()
+        self._profiler = None
+
+    def count(self, **counts):
+        """개수 기록 (같은 이름은 덮어씀)"""
+        self.counts.update(counts)
+
+    def attach(self, child):
+        """다른 곳(작업 프로세스 등)에서 측정을 마친 구간을 하위 구간으로 붙인다"""
+        if child:
+            self.children.append(child)
+
+    def merge(self, earlier):
+        """같은 대상을 앞서 따로 잰 구간(earlier)을 이 구간에 합친다 (둘 다 끝난 구간). 시간은 더하고 하위 구간은 앞에 둔다."""
+        if not earlier:
+            return
+        self.children[:0] = earlier.children
+        self.elapsed = self.seconds + earlier.seconds
+        for key, value in earlier.counts.items():
+            self.counts.setdefault(key, value)
+
+    @contextlib.contextmanager
+    def span(self, name, **counts):
+        """하위 구간. 작업 스레드에서 열어도 되며, 끝난 순서대로 children 에 추가된다."""
+        child = Span(name, counts, self.profile_dir)
+        child._start_profile()
+        try:
+            yield child
+        finally:
+            child.finish()
+            self.children.append(child)
+
+    def _start_profile(self):
+        if self.profile_dir is None or getattr(_profiling, "active", False) or not _wants_profile(self.name):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return  # 다른 스레드에서 이미 프로파일러가 동작 중
+        _profiling.active = True
+        self._profiler = profiler
+
+    def _stop_profile(self):
+        profiler, self._profiler = self._profiler, None
+        profiler.disable()
+        _profiling.active = False
+        stamp = datetime.datetime.fromtimestamp(self.started).strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.name)
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(self.profile_dir, f"{safe_name}_{stamp}.prof")
+            profiler.dump_stats(path)
+            self.profile_path = path
+        except OSError:
+            pass
+
+    def finish(self):
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self._start
+            if self._profiler is not None:
+                self._stop_profile()
+        return self.elapsed
+
+    @property
+    def seconds(self):
+        return self.elapsed if self.elapsed is not None else time.perf_counter() - self._start
+
+    def to_dict(self):
+        data = {"name": self.name, "seconds": round(self.seconds, 4)}
+        if self.counts:
+            data["counts"] = dict(self.counts)
+        if self.profile_path:
+            data["profile"] = self.profile_path
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+    def summary_lines(self, depth=0):
+        counts = " ".join(f"{key}={value}" for key, value in self.counts.items())
+        label = "  " * depth + self.name
+        line = f"{label:<32} {self.seconds:8.3f}s"
+        if counts:
+            line += f"  {counts}"
+        if self.profile_path:
+            line += f"  [prof: {os.path.basename(self.profile_path)}]"
+        lines = [line]
+        for child in self.children:
+            lines.extend(child.summary_lines(depth + 1))
+        return lines
+
+    def format_summary(self):
+        """로그창용 여러 줄 요약"""
+        return "===== Timing =====\n" + "\n".join(self.summary_lines())
+
+    def brief(self, top=3):
+        """상태표시줄용 한 줄 요약: 전체 시간과 가장 오래 걸린 단계들"""
+        leaves = []
+
+        def collect(span):
+            if not span.children:
+                leaves.append(span)
+            for child in span.children:
+                collect(child)
+
+        for child in self.children:
+            collect(child)
+        leaves.sort(key=lambda span: span.seconds, reverse=True)
+        text = f"{self.seconds:.2f}s"
+        if leaves:
+            text += " (" + ", ".join(f"{span.name} {span.seconds:.2f}s" for span in leaves[:top]) + ")"
+        return text
+
+
+class NullSpan:
+    """FA50_TIMING=0 일 때 쓰는 아무것도 기록하지 않는 구간"""
+    name = ""
+    counts = {}
+    children = ()
+    profile_path = None
+    elapsed = 0.0
+    seconds = 0.0
+
+    def count(self, **counts):
+        pass
+
+    def attach(self, child):
+        pass
+
+    def merge(self, earlier):
+        pass
+
+    def span(self, name, **counts):
+        return contextlib.nullcontext(self)
+
+    def finish(self):
+        return 0.0
+
+    def to_dict(self):
+        return {}
+
+    def format_summary(self):
+        return ""
+
+    def brief(self, top=3):
+        return ""
+
+    def __bool__(self):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+def start_span(name, profile_dir=None, **counts):
+    """최상위 구간을 시작 (측정이 꺼져 있으면 NULL_SPAN). 최상위 구간은 프로파일하지 않는다."""
+    if not timing_enabled():
+        return NULL_SPAN
+    return Span(name, counts, profile_dir)
+
+
+def append_timing_record(path, record, keep=TIMING_KEEP):
+    """JSON Lines 파일에 기록을 추가하고 최근 keep 개만 남긴다 (임시 파일에 쓴 뒤 교체)"""
+    lines = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [line for line in f.read().splitlines() if line.strip()]
+    except FileNotFoundError:
+        pass
+    lines.append(json.dumps(record, ensure_ascii=False))
+    lines = lines[-keep:]
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
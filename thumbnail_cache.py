@@ -0,0 +1,293 @@
+# thumbnail_cache.py
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import Qt, QObject, QSize, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
+
+# ─────────────────────────────────────────────────────────────
+# 미리보기 썸네일 캐시 (2단계)
+#   1) 메모리 LRU : 축소된 QImage 를 바이트 합계 기준으로 제한 (FA50_THUMB_CACHE_MB, 기본 64MB)
+#   2) 디스크     : 01_excel/thumbnails/ 에 원본 경로 + 수정시각 + 크기 + 표시 크기로 만든 이름의 PNG
+#                   (FA50_THUMB_DISK=0 으로 끌 수 있으며, 폴더는 언제 지워도 된다)
+#                   합계가 FA50_THUMB_DISK_MB(기본 512MB)를 넘으면 가장 오래 쓰지 않은 파일부터 지운다.
+#                   디스크에서 읽을 때 수정시각을 갱신하므로 수정시각이 곧 마지막 사용 시각이다
+#                   (접근시각은 noatime 등으로 갱신되지 않는 경우가 많아 쓰지 않음).
+#   QImage 는 작업 스레드에서 다뤄도 안전하므로 이미지 읽기와 이웃 노드 미리 읽기는 스레드 풀에서 수행한다.
+# ─────────────────────────────────────────────────────────────
+THUMB_DIRNAME = "thumbnails"
+DEFAULT_CACHE_MB = 64
+DEFAULT_DISK_MB = 512
+# 디스크 캐시를 정리할 때 한도의 이 비율까지 줄임 (저장할 때마다 정리하지 않도록)
+DISK_TRIM_RATIO = 0.8
+PREFETCH_WORKERS = 2
+# 현재 선택한 노드의 이미지를 읽는 스레드 수 (미리 읽기와 별도)
+REQUEST_WORKERS = 2
+
+
+def cache_limit_bytes():
+    try:
+        megabytes = float(os.environ.get("FA50_THUMB_CACHE_MB", DEFAULT_CACHE_MB))
+    except ValueError:
+        megabytes = DEFAULT_CACHE_MB
+    return max(0, int(megabytes * 1024 * 1024))
+
+
+def disk_cache_enabled():
+    return os.environ.get("FA50_THUMB_DISK", "1") != "0"
+
+
+def disk_limit_bytes():
+    try:
+        megabytes = float(os.environ.get("FA50_THUMB_DISK_MB", DEFAULT_DISK_MB))
+    except ValueError:
+        megabytes = DEFAULT_DISK_MB
+    return max(0, int(megabytes * 1024 * 1024))
+
+
+def make_thumbnail(image_path, width, height):
+    """
+    원본 이미지를 (width, height) 안에 비율을 유지해 맞춘 QImage 로 읽는다 (실패 시 null QImage).
+    QImageReader.setScaledSize 로 처음부터 미리보기 크기로 디코딩한다 (JPEG 는 축소 디코딩 지원).
+    """
+    reader = QImageReader(image_path)
+    size = reader.size()
+    if size.isValid() and not size.isEmpty():
+        reader.setScaledSize(size.scaled(QSize(width, height), Qt.KeepAspectRatio))
+        image = reader.read()
+        if not image.isNull():
+            return image
+    # 크기를 미리 알 수 없는 형식: 전체를 읽은 뒤 축소
+    image = QImage(image_path)
+    if image.isNull():
+        return image
+    return image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+class ThumbnailCache:
+    """
+    원본 경로와 수정시각으로 구분하는 썸네일 캐시. 여러 스레드에서 호출해도 안전하다.
+    get() 은 메모리 → 디스크 → 원본 순서로 찾고, prefetch() 는 백그라운드에서 미리 채운다.
+    """
+    def __init__(self, disk_dir=None, max_bytes=None, disk_max_bytes=None):
+        self.max_bytes = cache_limit_bytes() if max_bytes is None else max_bytes
+        self.disk_max_bytes = disk_limit_bytes() if disk_max_bytes is None else disk_max_bytes
+        self.disk_dir = disk_dir if disk_cache_enabled() and self.disk_max_bytes > 0 else None
+        self.total_bytes = 0
+        self.disk_bytes = None         # 디스크 캐시 크기 합계 (첫 정리가 끝나기 전에는 모름)
+        self._images = OrderedDict()   # 키 -> QImage (가장 최근에 쓴 항목이 끝)
+        self._pending = set()          # 미리 읽기 중인 키
+        self._trimming = False
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+        if self.disk_dir:
+            # 이전 실행에서 쌓인 파일의 크기를 세고 한도를 넘었으면 정리
+            self._schedule_trim()
+
+    @staticmethod
+    def _key(image_path, width, height):
+        st = os.stat(image_path)
+        return (os.path.abspath(image_path), st.st_mtime_ns, st.st_size, width, height)
+
+    def _disk_path(self, key):
+        name = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, name[:2], name + ".png")
+
+    def _remember(self, key, image):
+        size = image.sizeInBytes()
+        with self._lock:
+            old = self._images.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.sizeInBytes()
+            if size > self.max_bytes:
+                return
+            self._images[key] = image
+            self.total_bytes += size
+            # 한도를 넘으면 가장 오래 쓰지 않은 항목부터 버림
+            while self.total_bytes > self.max_bytes and self._images:
+                _, evicted = self._images.popitem(last=False)
+                self.total_bytes -= evicted.sizeInBytes()
+
+    def cached(self, image_path, width, height):
+        """메모리에 있는 썸네일만 반환 (없으면 None). 파일이 없으면 None."""
+        try:
+            key = self._key(image_path, width, height)
+        except OSError:
+            return None
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def get(self, image_path, width, height):
+        """썸네일 QImage 를 반환. 파일이 없거나 읽지 못하면 null QImage."""
+        try:
+            key = self._key(image_path, width, height)
+        except OSError:
+            return QImage()
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+
+        image = QImage()
+        disk_path = self._disk_path(key) if self.disk_dir else None
+        if disk_path and os.path.exists(disk_path):
+            image = QImage(disk_path)
+            if not image.isNull():
+                try:
+                    os.utime(disk_path)  # 정리 순서(LRU)에 쓰는 마지막 사용 시각
+                except OSError:
+                    pass
+        if image.isNull():
+            image = make_thumbnail(image_path, width, height)
+            if image.isNull():
+                return image
+            if disk_path:
+                self._save_to_disk(image, disk_path)
+        self._remember(key, image)
+        return image
+
+    def _save_to_disk(self, image, disk_path):
+        # 다른 스레드/프로세스가 같은 파일을 읽는 중일 수 있으므로 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{disk_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+            if not image.save(tmp_path, "PNG"):
+                return
+            os.replace(tmp_path, disk_path)
+            size = os.path.getsize(disk_path)
+        except OSError:
+            return
+        finally:
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+        with self._lock:
+            if self.disk_bytes is None:
+                return  # 첫 정리에서 함께 센다
+            self.disk_bytes += size
+            over = self.disk_bytes > self.disk_max_bytes
+        if over:
+            self._schedule_trim()
+
+    def _schedule_trim(self):
+        with self._lock:
+            if self._trimming:
+                return
+            self._trimming = True
+        try:
+            self._pool.submit(self._trim_disk)
+        except RuntimeError:
+            # 종료 중 (스레드 풀이 이미 닫힘)
+            with self._lock:
+                self._trimming = False
+
+    def _trim_disk(self):
+        """디스크 캐시 합계를 다시 세고, 한도를 넘었으면 수정시각이 오래된 파일부터 지운다 (작업 스레드)."""
+        try:
+            files = []
+            total = 0
+            for dirpath, _, names in os.walk(self.disk_dir):
+                for name in names:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime_ns, st.st_size, path))
+                    total += st.st_size
+            if total > self.disk_max_bytes:
+                target = int(self.disk_max_bytes * DISK_TRIM_RATIO)
+                files.sort()
+                for _, size, path in files:
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue  # 다른 프로그램이 먼저 지웠거나 사용 중
+                    total -= size
+            with self._lock:
+                self.disk_bytes = total
+        finally:
+            with self._lock:
+                self._trimming = False
+
+    def prefetch(self, image_paths, width, height):
+        """주어진 이미지들의 썸네일을 백그라운드에서 미리 만들어 둔다 (이미 있거나 진행 중이면 건너뜀)."""
+        for image_path in image_paths:
+            if self.cached(image_path, width, height) is not None:
+                continue
+            job = (image_path, width, height)
+            with self._lock:
+                if job in self._pending:
+                    continue
+                self._pending.add(job)
+            self._pool.submit(self._prefetch_one, job)
+
+    def _prefetch_one(self, job):
+        try:
+            self.get(*job)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard(job)
+
+    def shutdown(self):
+        """대기 중인 미리 읽기를 버리고 스레드 풀을 종료"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ImageLoader(QObject):
+    """
+    미리보기 이미지를 GUI 스레드 밖에서 읽어 loaded(요청 번호, 경로, QImage) 로 전달.
+    새 요청이 들어오면 이전 요청 번호는 무효가 되어, 아직 시작하지 않은 작업은 건너뛰고
+    이미 끝난 결과는 받는 쪽에서 요청 번호로 버린다.
+    """
+    loaded = pyqtSignal(int, str, QImage)
+
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.request_id = 0
+        self._pool = ThreadPoolExecutor(max_workers=REQUEST_WORKERS)
+
+    def request(self, image_path, width, height):
+        """
+        요청 번호를 반환. 메모리에 있으면 (번호, QImage) 로 바로 돌려주고, 없으면 (번호, None) 을 반환한 뒤
+        읽기가 끝나면 loaded 시그널을 보낸다.
+        """
+        self.request_id += 1
+        request_id = self.request_id
+        image = self.cache.cached(image_path, width, height)
+        if image is not None:
+            return request_id, image
+        self._pool.submit(self._load, request_id, image_path, width, height)
+        return request_id, None
+
+    def cancel(self):
+        """진행 중인 요청을 무효화 (결과가 와도 무시됨)"""
+        self.request_id += 1
+
+    def _load(self, request_id, image_path, width, height):
+        if request_id != self.request_id:
+            return  # 이미 다른 노드로 이동함
+        try:
+            image = self.cache.get(image_path, width, height)
+        except Exception:
+            image = QImage()
+        if request_id == self.request_id:
+            self.loaded.emit(request_id, image_path, image)
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
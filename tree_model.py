@@ -0,0 +1,431 @@
+# tree_model.py
+
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex
+from PyQt5.QtGui import QBrush, QColor, QFont, QPixmap, QPainter
+from bom_loader import STYLE_MODES, mode_flags
+
+# fetchMore 한 번에 생성하는 최대 자식 노드 수
+FETCH_BATCH_SIZE = 500
+
+# 모드별 활성 노드 색상 (apply_tree_view_styles 와 동일)
+STYLE_COLORS = {
+    "image": QColor(255, 0, 0),    # 빨간색
+    "3dxml": QColor(0, 0, 255),    # 파란색
+    "fbx": QColor(0, 128, 0),      # 녹색
+}
+
+# 메모 필터용 활성 여부 (Qt.UserRole 은 파일 필터용)
+MEMO_ROLE = Qt.UserRole + 1
+MEMO_MARK_COLOR = QColor(255, 170, 0)
+
+
+def _memo_mark():
+    """메모가 있는 노드 앞에 표시할 작은 점"""
+    pixmap = QPixmap(10, 10)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(MEMO_MARK_COLOR)
+    painter.drawEllipse(1, 1, 8, 8)
+    painter.end()
+    return pixmap
+
+
+class BomNode:
+    """
+    트리뷰에 실제로 펼쳐진 노드 하나(BOM 상의 한 occurrence).
+    자식 노드는 fetchMore 가 호출될 때에만 생성된다.
+    """
+    __slots__ = ("part", "parent", "row", "children", "expandable", "slot")
+
+    def __init__(self, part, parent, row, expandable, slot=-1):
+        self.part = part              # BomGraph 파트 id
+        self.slot = slot              # BomGraph 자식 슬롯 (최종 루트는 -1)
+        self.parent = parent          # 부모 BomNode (최상위는 보이지 않는 루트)
+        self.row = row                # 부모 안에서의 위치
+        self.children = []            # 지금까지 생성된 자식 노드
+        self.expandable = expandable  # 순환 위치(조상 파트로 되돌아가는 관계)만 펼치지 않음
+
+
+class BomTreeModel(QAbstractItemModel):
+    """
+    BomGraph 를 감싸는 지연 생성 트리 모델.
+    QTreeWidgetItem 을 미리 만들지 않고, 펼쳐진 노드의 자식만 canFetchMore/fetchMore 로 만든다.
+    반복되는 하위 조립품은 어느 위치에서 펼쳐도 그래프의 같은 자식 목록으로 전체 하위 트리가 보인다.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._header = ""
+        self._root = BomNode(-1, None, 0, True)  # 보이지 않는 최상위 노드
+        self.graph = None
+
+        self._self_masks = None  # 파트 id -> 모드별 파일 존재 비트 (STYLE_MODES 순서)
+        self._sub_masks = None   # 파트 id -> 모드별 활성 비트(자식 포함, 모든 occurrence 에서 같음)
+        self._mode_bit = None    # 현재 모드의 비트 위치
+        self._self_flags = None  # 파트 id -> 현재 모드 파일 존재 여부
+        self._subtree = None     # 파트 id -> 활성 여부(자식 포함)
+        self._memo_flags = None  # 파트 id -> 메모 존재 여부
+        self._memo_sub = None    # 파트 id -> 자신 또는 하위 노드에 메모가 있는지 여부
+        self._memo_marks = True  # 메모가 있는 노드에 표시를 그릴지 여부
+        self._memo_pixmap = None
+        self._default_brush = QBrush(QColor(0, 0, 0))
+        self._active_brush = self._default_brush
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+
+    # ─── 데이터 적재 ─────────────────────────────────────────
+
+    def load(self, graph):
+        """BomGraph 로 모델을 초기화한다. 최종 루트 노드들만 만들고 가상 트리의 전체 노드 수를 반환."""
+        self.beginResetModel()
+        self.graph = graph
+        self._root = BomNode(-1, None, 0, True)
+        self._root.children = [BomNode(part, self._root, row, True) for row, part in enumerate(graph.roots.tolist())]
+        self._self_masks = np.zeros(len(graph), dtype=np.uint8)
+        self._sub_masks = self._self_masks.copy()
+        self._self_flags = np.zeros(len(graph), dtype=bool)
+        self._subtree = self._self_flags.copy()
+        self._memo_flags = self._self_flags.copy()
+        self._memo_sub = self._self_flags.copy()
+        self.endResetModel()
+        return graph.node_count
+
+    def clear(self):
+        self.beginResetModel()
+        self.graph = None
+        self._root = BomNode(-1, None, 0, True)
+        self._self_masks = None
+        self._sub_masks = None
+        self._self_flags = None
+        self._subtree = None
+        self._memo_flags = None
+        self._memo_sub = None
+        self.endResetModel()
+
+    def node_count(self):
+        return self.graph.node_count if self.graph is not None else 0
+
+    # ─── QAbstractItemModel 구현 ─────────────────────────────
+
+    def _node(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        node = self._node(parent)
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self._root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        if node is self._root:
+            return bool(node.children)
+        return node.expandable and self.graph.child_count(node.part) > 0
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        if node is self._root or not node.expandable:
+            return False
+        return len(node.children) < self.graph.child_count(node.part)
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        self._fetch(node, len(node.children) + FETCH_BATCH_SIZE)
+
+    def _fetch(self, node, upto):
+        """node 의 자식을 upto 개까지 생성 (beginInsertRows/endInsertRows 로 뷰에 알림)"""
+        graph = self.graph
+        start = len(node.children)
+        end = min(upto, graph.child_count(node.part))
+        if end <= start:
+            return
+        self.beginInsertRows(self.index_of_node(node), start, end - 1)
+        base = graph.child_slot(node.part, 0)
+        parts = graph.child_idx[base + start:base + end].tolist()
+        expand = graph.expand_edge[base + start:base + end].tolist()
+        for offset, child_part in enumerate(parts):
+            node.children.append(BomNode(child_part, node, start + offset, expand[offset], base + start + offset))
+        self.endInsertRows()
+
+    def index_of_node(self, node):
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return self.graph.keys[node.part]
+        if role == Qt.FontRole:
+            if self._self_flags[node.part]:
+                return self._bold_font
+            return None
+        if role == Qt.ForegroundRole:
+            if self._self_flags[node.part]:
+                return self._active_brush
+            return self._default_brush
+        if role == Qt.DecorationRole:
+            if self._memo_marks and self._memo_flags[node.part]:
+                if self._memo_pixmap is None:
+                    self._memo_pixmap = _memo_mark()
+                return self._memo_pixmap
+            return None
+        if role == Qt.ToolTipRole:
+            # 여러 엑셀/시트를 합쳐 읽었을 때만 출처를 보여줌
+            if len(self.graph.source_labels) > 1:
+                return f"출처: {self.graph.source_of(node.part)}"
+            return None
+        if role == Qt.UserRole:
+            return self.is_visible(node)
+        if role == MEMO_ROLE:
+            return self.is_memo_visible(node)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return self._header
+        return None
+
+    def setHeaderData(self, section, orientation, value, role=Qt.EditRole):
+        if orientation != Qt.Horizontal or section != 0:
+            return False
+        self._header = value
+        self.headerDataChanged.emit(orientation, section, section)
+        return True
+
+    # ─── 스타일 / 활성 여부 ───────────────────────────────────
+
+    def set_files(self, file_dicts):
+        """
+        {모드: 파일 딕셔너리} 로 모든 모드의 파일 존재 여부와 자식 포함 활성 여부를 한 번에 계산해 둔다.
+        모드 전환(set_style)은 미리 계산한 비트만 꺼내 쓴다.
+        """
+        if self.graph is None:
+            return
+        self._self_masks = self.graph.self_masks([file_dicts.get(mode, {}) for mode in STYLE_MODES])
+        self._sub_masks = self.graph.subtree_flags(self._self_masks)
+        self._apply_mode()
+
+    def set_style(self, style):
+        """
+        모드 변경. 색상이 바뀌면 활성 노드 전체를, 아니면 값이 바뀐 파트의 노드만 다시 그리게 한다.
+        """
+        color = STYLE_COLORS.get(style)
+        brush = QBrush(color) if color is not None else self._default_brush
+        color_changed = brush != self._active_brush
+        self._active_brush = brush
+        self._mode_bit = STYLE_MODES.index(style) if style in STYLE_MODES else None
+        self._apply_mode(repaint_active=color_changed)
+
+    def _apply_mode(self, repaint_active=False):
+        """현재 모드의 비트를 bool 배열로 꺼내고, 값이 바뀐 파트의 노드만 다시 그리게 한다."""
+        if self.graph is None:
+            return
+        old_self, old_sub = self._self_flags, self._subtree
+        if self._mode_bit is None or self._self_masks is None:
+            self._self_flags = np.zeros(len(self.graph), dtype=bool)
+            self._subtree = self._self_flags.copy()
+        else:
+            self._self_flags = mode_flags(self._self_masks, self._mode_bit)
+            self._subtree = mode_flags(self._sub_masks, self._mode_bit)
+
+        changed = (old_self != self._self_flags) | (old_sub != self._subtree)
+        if repaint_active:
+            changed |= self._self_flags
+        self._emit_changed(changed)
+
+    def update_parts(self, file_dicts, upper_keys):
+        """
+        일부 파트넘버(대문자)의 파일 존재 여부만 바뀌었을 때 해당 파트와 조상 노드만 다시 계산하고 다시 그린다.
+        """
+        if self.graph is None or self._self_masks is None:
+            return
+        parts = self.graph.parts_for_upper_keys(upper_keys)
+        if not len(parts):
+            return
+        dicts = [file_dicts.get(mode, {}) for mode in STYLE_MODES]
+        upper = self.graph.upper_keys
+        for part in parts:
+            mask = 0
+            for bit, file_dict in enumerate(dicts):
+                if upper[part] in file_dict:
+                    mask |= 1 << bit
+            self._self_masks[part] = mask
+        self.graph.update_subtree_flags(self._self_masks, self._sub_masks, parts)
+        self._apply_mode()
+
+    def _emit_changed(self, changed, roles=()):
+        """changed[파트 id] 가 True 인 파트의, 이미 생성된 노드에만 dataChanged 알림"""
+        if not changed.any():
+            return
+        for node in self.iter_fetched():
+            if node is not self._root and changed[node.part]:
+                index = self.createIndex(node.row, 0, node)
+                self.dataChanged.emit(index, index, list(roles))
+
+    # ─── 메모 표시 / 메모 필터 ───────────────────────────────
+
+    def set_memo_parts(self, upper_keys):
+        """메모가 있는 파트넘버(대문자) 전체로 메모 여부와 자식 포함 여부를 다시 계산"""
+        if self.graph is None:
+            return
+        old_flags, old_sub = self._memo_flags, self._memo_sub
+        self._memo_flags = np.zeros(len(self.graph), dtype=bool)
+        self._memo_flags[self.graph.parts_for_upper_keys(upper_keys)] = True
+        self._memo_sub = self.graph.subtree_flags(self._memo_flags)
+        changed = (old_flags != self._memo_flags) | (old_sub != self._memo_sub)
+        self._emit_changed(changed, (Qt.DecorationRole, MEMO_ROLE))
+
+    def update_memo_parts(self, upper_keys, has_memo):
+        """
+        일부 파트넘버(대문자)의 메모 여부만 바뀌었을 때 해당 파트와 조상만 다시 계산하고 다시 그린다.
+        has_memo(대문자 파트넘버) 가 현재 메모 존재 여부를 알려준다.
+        """
+        if self.graph is None or self._memo_flags is None:
+            return
+        parts = self.graph.parts_for_upper_keys(upper_keys)
+        if not len(parts):
+            return
+        upper = self.graph.upper_keys
+        changed = np.zeros(len(self.graph), dtype=bool)
+        for part in parts:
+            flag = bool(has_memo(upper[part]))
+            if flag != self._memo_flags[part]:
+                self._memo_flags[part] = flag
+                changed[part] = True
+        if not changed.any():
+            return
+        changed[self.graph.update_subtree_flags(self._memo_flags, self._memo_sub, parts)] = True
+        self._emit_changed(changed, (Qt.DecorationRole, MEMO_ROLE))
+
+    def set_memo_marks(self, visible):
+        """메모 표시 on/off. 메모가 있는 파트의 이미 생성된 노드만 다시 그린다."""
+        if visible == self._memo_marks:
+            return
+        self._memo_marks = visible
+        if self._memo_flags is not None:
+            self._emit_changed(self._memo_flags, (Qt.DecorationRole,))
+
+    def is_memo_visible(self, node):
+        """노드 자신 또는 (펼칠 수 있는 경우) 하위 노드 중 하나라도 메모가 있으면 True"""
+        if self._memo_flags[node.part]:
+            return True
+        return bool(node.expandable and self._memo_sub[node.part])
+
+    def count_memo_visible(self):
+        """가상 트리 전체에서 메모 필터를 통과하는 노드 수"""
+        if self.graph is None:
+            return 0
+        return self.graph.count_visible(self._memo_flags, self._memo_sub)
+
+    def is_visible(self, node):
+        """노드 자신 또는 (펼칠 수 있는 경우) 하위 노드 중 하나라도 파일이 있으면 True"""
+        if self._self_flags[node.part]:
+            return True
+        return bool(node.expandable and self._subtree[node.part])
+
+    def count_visible(self):
+        """가상 트리 전체에서 활성(필터 통과) 노드 수"""
+        if self.graph is None:
+            return 0
+        return self.graph.count_visible(self._self_flags, self._subtree)
+
+    # ─── 탐색 도우미 ─────────────────────────────────────────
+
+    def iter_fetched(self, node=None):
+        """지금까지 생성된 노드를 전위 순회 (보이지 않는 루트 포함)"""
+        stack = [node or self._root]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(current.children))
+
+    def index_for_key(self, key):
+        """
+        파트넘버의 최초 등장 노드 인덱스를 반환 (기존 find_item 의 전위 순회 첫 결과와 동일).
+        경로 상의 노드는 필요한 만큼만 생성한다.
+        """
+        if self.graph is None:
+            return QModelIndex()
+        part = self.graph.lookup(key)
+        if part < 0 or not self.graph.is_reachable(part):
+            return QModelIndex()
+        return self.index_for_path(self.graph.path_rows(part))
+
+    def index_for_occurrence(self, rows):
+        """occurrence 의 row 경로(BomGraph.occurrence_paths)가 가리키는 노드 인덱스. 경로 상의 노드는 필요한 만큼만 생성한다."""
+        if self.graph is None or not rows or not self._root.children:
+            return QModelIndex()
+        return self.index_for_path(rows)
+
+    def index_for_path(self, rows):
+        """rows[0] 번째 최종 루트 노드에서 시작해 나머지 rows 를 차례로 따라간 노드의 인덱스"""
+        node = self._root.children[rows[0]]
+        for row in rows[1:]:
+            if len(node.children) <= row:
+                self._fetch(node, row + 1)
+            node = node.children[row]
+        return self.index_of_node(node)
+
+    def row_for_index(self, index):
+        """index 노드(occurrence)에 해당하는 엑셀 행 위치 (-1 이면 없음)"""
+        node = self._node(index)
+        if node is self._root or self.graph is None:
+            return -1
+        return self.graph.row_of(node.part, node.slot)
+
+    def iter_subtree_keys(self, index):
+        """index 노드와 그 하위 노드(미생성 포함)의 파트넘버를 전위 순회 순서로 반환"""
+        node = self._node(index)
+        if node is self._root:
+            return
+        keys = self.graph.keys
+        for part in self.graph.iter_subtree(node.part, node.expandable):
+            yield keys[part]
+
+    def subtree_keys(self, index):
+        """index 노드와 그 하위 노드(미생성 포함)에 나타나는 서로 다른 파트넘버 목록"""
+        node = self._node(index)
+        if node is self._root:
+            return []
+        keys = self.graph.keys
+        return [keys[part] for part in self.graph.subtree_parts(node.part, node.expandable)]
+
+    def node_location(self, index):
+        """index 노드의 (파트 id, 슬롯, 펼침 가능 여부, 최종 루트부터 부모까지의 파트 id 목록)"""
+        node = self._node(index)
+        if node is self._root:
+            return None
+        ancestors = []
+        current = node.parent
+        while current is not None and current is not self._root:
+            ancestors.append(current.part)
+            current = current.parent
+        return node.part, node.slot, node.expandable, ancestors[::-1]
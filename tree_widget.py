@@ -1,38 +1,53 @@
 import os
 import sys
-import shutil
-import datetime
-from PyQt5.QtWidgets import QTreeWidget, QMessageBox, QMenu
+from PyQt5.QtWidgets import (
+    QTreeView, QMessageBox, QMenu, QProgressDialog, QDialog, QDialogButtonBox, QVBoxLayout, QCheckBox,
+    QFileDialog,
+)
 from PyQt5.QtCore import Qt, QUrl, QMimeData
 from PyQt5.QtGui import QDrag
 from tree_manager import files_dict
+from tree_model import BomTreeModel
+from file_copy import SubtreeCopyWorker
+from asset_export import SubtreeExportWorker, EXPORT_TYPES
 
-class MyTreeWidget(QTreeWidget):
+class MyTreeWidget(QTreeView):
     """
-    드래그 앤 드롭, 더블 클릭, 노드 검색 기능을 포함한 QTreeWidget 하위 클래스
+    드래그 앤 드롭, 더블 클릭, 노드 검색 기능을 포함한 QTreeView 하위 클래스.
+    노드는 BomTreeModel 이 펼쳐질 때마다 지연 생성한다.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.setDragEnabled(True)
+        self.setUniformRowHeights(True)
+        self.setModel(BomTreeModel(self))
+
+        # 필터 상태: 새로 생성되는 노드에도 같은 필터를 적용
+        self.filter_active = False
+        self.memo_filter_active = False  # 메모가 있는 노드(와 그 조상)만 표시
+        self.copy_worker = None          # 진행 중인 하위 노드 파일 복사
+        self.export_worker = None        # 진행 중인 하위 노드 ZIP 내보내기
+        self.model().rowsInserted.connect(self._on_rows_inserted)
+        self.model().dataChanged.connect(self._on_data_changed)
 
     def mouseDoubleClickEvent(self, event):
         """더블 클릭 시 기본 노드 확장/축소 기능을 막고 사용자 정의 이벤트만 실행"""
-        item = self.itemAt(event.pos())
-        if item:
+        index = self.indexAt(event.pos())
+        if index.isValid():
             main_window = self.window()
             if hasattr(main_window, "on_tree_item_double_clicked"):
-                main_window.on_tree_item_double_clicked(item, 0)
+                main_window.on_tree_item_double_clicked(index)
         event.ignore()  # 기본 동작(노드 확장/축소) 방지
 
     def keyPressEvent(self, event):
         """엔터 키를 누르면 현재 선택된 노드에 대해 더블 클릭 이벤트 실행"""
         if event.key() in (Qt.Key_Return, Qt.Key_Enter):
-            item = self.currentItem()
-            if item:
+            index = self.currentIndex()
+            if index.isValid():
                 main_window = self.window()
                 if hasattr(main_window, "on_tree_item_double_clicked"):
-                    main_window.on_tree_item_double_clicked(item, 0)
+                    main_window.on_tree_item_double_clicked(index)
             event.accept()
         else:
             super().keyPressEvent(event)
@@ -60,13 +75,13 @@ class MyTreeWidget(QTreeWidget):
                 )[0]
                 parts = file_name_no_ext.split("_")
                 part_number = parts[3] if len(parts) >= 4 else file_name_no_ext
-                item = self.find_item(part_number)
+                index = self.find_item(part_number)
 
-                if item:
-                    self.setCurrentItem(item)
-                    item.setExpanded(True)
+                if index.isValid():
+                    self.setCurrentIndex(index)
+                    self.expand(index)
                     if hasattr(main_window, "on_tree_item_clicked"):
-                        main_window.on_tree_item_clicked(item, 0)
+                        main_window.on_tree_item_clicked(index)
                 else:
                     not_found_files.append(file_name_no_ext)  # 찾지 못한 파일 저장
 
@@ -84,33 +99,65 @@ class MyTreeWidget(QTreeWidget):
 
     def find_item(self, text):
         """
-        재귀적으로 트리 내에서 주어진 텍스트와 일치하는 노드를 검색
+        주어진 텍스트와 일치하는 노드의 인덱스를 반환 (없으면 유효하지 않은 QModelIndex).
+        아직 생성되지 않은 노드라도 모델이 경로를 따라 생성한다.
         """
-        def recursive_search(item):
-            if item.text(0) == text:
-                return item
-            for i in range(item.childCount()):
-                found = recursive_search(item.child(i))
-                if found:
-                    return found
-            return None
+        return self.model().index_for_key(text)
+
+    def set_filter_active(self, active):
+        """
+        필터 on/off. 캐싱된 활성 여부(Qt.UserRole)가 False 인 노드를 숨긴다.
+        이미 생성된 노드만 처리하고, 이후 생성되는 노드는 _on_rows_inserted 에서 처리.
+        """
+        self.filter_active = active
+        self._apply_filters()
+
+    def set_memo_filter_active(self, active):
+        """메모 필터 on/off. 메모 여부(MEMO_ROLE)가 False 인 노드를 숨긴다 (파일 필터와 함께 쓰면 둘 다 통과해야 표시)."""
+        self.memo_filter_active = active
+        self._apply_filters()
 
-        for i in range(self.topLevelItemCount()):
-            found = recursive_search(self.topLevelItem(i))
-            if found:
-                return found
-        return None
+    def _is_filtered_out(self, node):
+        model = self.model()
+        if self.filter_active and not model.is_visible(node):
+            return True
+        return self.memo_filter_active and not model.is_memo_visible(node)
+
+    def _apply_filters(self):
+        model = self.model()
+        for node in model.iter_fetched():
+            parent_index = model.index_of_node(node)
+            for child in node.children:
+                self.setRowHidden(child.row, parent_index, self._is_filtered_out(child))
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        # 활성 여부가 바뀐 노드의 필터 상태만 다시 적용
+        if not (self.filter_active or self.memo_filter_active):
+            return
+        parent_index = top_left.parent()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            index = self.model().index(row, 0, parent_index)
+            self.setRowHidden(row, parent_index, self._is_filtered_out(index.internalPointer()))
+
+    def _on_rows_inserted(self, parent_index, first, last):
+        if not (self.filter_active or self.memo_filter_active):
+            return
+        model = self.model()
+        for row in range(first, last + 1):
+            index = model.index(row, 0, parent_index)
+            if self._is_filtered_out(index.internalPointer()):
+                self.setRowHidden(row, parent_index, True)
 
     def startDrag(self, supportedActions):
         """
         노드를 드래그할 때, 노드 텍스트(파트넘버)를 기반으로 현재 모드에 맞는 파일 경로를 files_dict에서 찾아
         외부(예: Windows Explorer)로 파일처럼 드래그 앤 드롭할 수 있도록 MIME 데이터를 생성합니다.
         """
-        item = self.currentItem()
-        if not item:
+        index = self.currentIndex()
+        if not index.isValid():
             return
 
-        part_no = item.text(0).strip().upper()
+        part_no = index.data().strip().upper()
         main_window = self.window()
 
         file_path = None
@@ -138,71 +185,174 @@ class MyTreeWidget(QTreeWidget):
         # 필요에 따라 drag.setPixmap() 등으로 시각적 효과를 추가할 수 있습니다.
         drag.exec_(supportedActions)
 
-    def copy_files_from_node(self, item):
+    def copy_files_from_node(self, index):
         """
         선택된 노드와 그 자식 노드의 텍스트(파트넘버)를 기반으로, 현재 모드(files_dict)
         에 해당하는 파일들을 새로 만든 폴더로 복사합니다.
+        복사는 작업 스레드에서 진행하고 진행률 창에서 취소할 수 있으며, 결과는 대상 폴더의 보고서 파일에 남깁니다.
         """
-        main_window = self.window()
-        # 현재 모드 확인: radio_image, radio_3dxml, radio_fbx
-        if hasattr(main_window, "radio_image") and main_window.radio_image.isChecked():
-            mode = "image"
-        elif hasattr(main_window, "radio_3dxml") and main_window.radio_3dxml.isChecked():
-            mode = "xml3d"
-        elif hasattr(main_window, "radio_fbx") and main_window.radio_fbx.isChecked():
-            mode = "fbx"
-        else:
-            mode = "image"  # 기본값
-
-        # 재귀적으로 노드(파트넘버) 수집
-        def collect_nodes(node):
-            parts = [node.text(0).strip().upper()]
-            for i in range(node.childCount()):
-                parts.extend(collect_nodes(node.child(i)))
-            return parts
-
-        part_numbers = collect_nodes(item)
-
-        # 복사할 대상 폴더 생성 (선택한 노드 이름만 사용)
-        folder_name = f"Copied_{item.text(0).strip()}"
-        destination_dir = os.path.join(os.getcwd(), folder_name)
-        os.makedirs(destination_dir, exist_ok=True)
-
-        copied_files = []
-        not_found = []
-
-        # 각 파트넘버에 대해 files_dict에서 파일 경로를 찾고 복사 수행
-        for part in part_numbers:
-            if part in files_dict.get(mode, {}):
-                file_path = files_dict[mode][part]
-                if os.path.exists(file_path):
-                    try:
-                        shutil.copy2(file_path, destination_dir)
-                        copied_files.append(file_path)
-                    except Exception as e:
-                        print(f"Error copying {file_path}: {e}")
-                else:
-                    not_found.append(part)
-            else:
-                not_found.append(part)
+        if self.copy_worker is not None:
+            QMessageBox.information(self, "파일 복사", "이전 파일 복사가 아직 진행 중입니다.")
+            return
+        mode = self.current_mode()
+
+        # 하위 노드(파트넘버) 수집 (펼치지 않은 노드 포함, 같은 파트는 한 번만)
+        part_numbers = list(dict.fromkeys(key.strip().upper() for key in self.model().subtree_keys(index)))
+
+        # 복사할 대상 폴더 (선택한 노드 이름만 사용)
+        label = index.data().strip()
+        destination_dir = os.path.join(os.getcwd(), f"Copied_{label}")
+
+        worker = SubtreeCopyWorker(part_numbers, files_dict.get(mode, {}), destination_dir, label, mode)
+        dialog = QProgressDialog(f"'{label}' 하위 파일 복사 중...", "취소", 0, 0, self)
+        dialog.setWindowTitle("파일 복사")
+        dialog.setMinimumDuration(300)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(worker.cancel)
+        worker.progress.connect(lambda done, total, name: self._on_copy_progress(dialog, done, total, name))
+        worker.completed.connect(lambda result: self._on_copy_completed(dialog, result))
+        # 참조는 스레드가 끝난 뒤에 놓는다 (completed 직후에는 run() 이 아직 돌고 있을 수 있음)
+        worker.finished.connect(lambda: self._on_copy_stopped(worker))
+        self.copy_worker = worker
+        worker.start()
+
+    def _on_copy_progress(self, dialog, done, total, name):
+        dialog.setMaximum(max(total, 1))
+        dialog.setValue(done)
+        if name:
+            dialog.setLabelText(f"{done} / {total}  {name}")
 
-        msg = f"총 {len(copied_files)} 파일이 복사되었습니다.\n폴더: {destination_dir}"
-        if not_found:
-            msg += "\n\n다음 파일은 찾을 수 없습니다:\n" + "\n".join(not_found)
+    def _on_copy_stopped(self, worker):
+        if self.copy_worker is worker:
+            self.copy_worker = None
+        worker.deleteLater()
+
+    def _on_copy_completed(self, dialog, result):
+        dialog.close()
+        dialog.deleteLater()
+        main_window = self.window()
+        if hasattr(main_window, "appendLog"):
+            main_window.appendLog(f"파일 복사 ({result.label}, {result.mode}): {result.summary()}")
+        msg = f"{result.summary()}\n폴더: {result.destination_dir}"
+        if result.report_path:
+            msg += f"\n보고서: {os.path.basename(result.report_path)}"
         QMessageBox.information(self, "파일 복사 완료", msg)
 
+    def current_mode(self):
+        """메인 창의 라디오 버튼 상태에 해당하는 files_dict 키 (image / xml3d / fbx)"""
+        main_window = self.window()
+        if hasattr(main_window, "radio_3dxml") and main_window.radio_3dxml.isChecked():
+            return "xml3d"
+        if hasattr(main_window, "radio_fbx") and main_window.radio_fbx.isChecked():
+            return "fbx"
+        return "image"
+
+    def _ask_export_modes(self):
+        """내보낼 자산 종류를 고르는 창. 선택한 files_dict 키 목록(취소 시 None)을 반환."""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("ZIP 내보내기")
+        layout = QVBoxLayout(dialog)
+        checkboxes = {}
+        current = self.current_mode()
+        for mode, label in EXPORT_TYPES:
+            checkbox = QCheckBox(label, dialog)
+            checkbox.setChecked(mode == current)
+            layout.addWidget(checkbox)
+            checkboxes[mode] = checkbox
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, dialog)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        if dialog.exec_() != QDialog.Accepted:
+            return None
+        return [mode for mode, checkbox in checkboxes.items() if checkbox.isChecked()]
+
+    def export_zip_from_node(self, index):
+        """
+        선택된 노드와 하위 노드의 자산(선택한 종류 전부)을 zip 하나로 내보냅니다.
+        BOM 경로, 레벨, Qty, 원본 파일을 담은 manifest.csv 를 함께 넣으며, 작업 스레드에서 진행합니다.
+        """
+        if self.export_worker is not None:
+            QMessageBox.information(self, "ZIP 내보내기", "이전 내보내기가 아직 진행 중입니다.")
+            return
+        modes = self._ask_export_modes()
+        if modes is None:
+            return
+        if not modes:
+            QMessageBox.warning(self, "ZIP 내보내기", "내보낼 자산 종류를 선택하세요.")
+            return
+        label = index.data().strip()
+        zip_path, _ = QFileDialog.getSaveFileName(
+            self, "ZIP 내보내기", os.path.join(os.getcwd(), f"Export_{label}.zip"), "ZIP (*.zip)"
+        )
+        if not zip_path:
+            return
+
+        model = self.model()
+        main_window = self.window()
+        df = getattr(main_window, "df", None)
+        qty = df["Qty"].to_numpy() if df is not None and "Qty" in df.columns else None
+        worker = SubtreeExportWorker(model.graph, model.node_location(index), qty, files_dict, modes, zip_path, label)
+        dialog = QProgressDialog(f"'{label}' 하위 자산 내보내는 중...", "취소", 0, 100, self)
+        dialog.setWindowTitle("ZIP 내보내기")
+        dialog.setMinimumDuration(300)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(worker.cancel)
+        worker.progress.connect(lambda percent, message: self._on_export_progress(dialog, percent, message))
+        worker.completed.connect(lambda result: self._on_export_completed(dialog, result))
+        # 참조는 스레드가 끝난 뒤에 놓는다 (completed 직후에는 run() 이 아직 돌고 있을 수 있음)
+        worker.finished.connect(lambda: self._on_export_stopped(worker))
+        self.export_worker = worker
+        worker.start()
+
+    def _on_export_progress(self, dialog, percent, message):
+        dialog.setValue(percent)
+        if message:
+            dialog.setLabelText(message)
+
+    def _on_export_stopped(self, worker):
+        if self.export_worker is worker:
+            self.export_worker = None
+        worker.deleteLater()
+
+    def _on_export_completed(self, dialog, result):
+        dialog.close()
+        dialog.deleteLater()
+        main_window = self.window()
+        if hasattr(main_window, "appendLog"):
+            main_window.appendLog(f"ZIP 내보내기 ({result.label}): {result.summary()} ({result.elapsed:.1f}초)")
+        if result.cancelled:
+            QMessageBox.information(self, "ZIP 내보내기", "내보내기를 취소했습니다.")
+            return
+        msg = f"{result.summary()}\n파일: {result.zip_path}"
+        if result.failed:
+            msg += "\n\n실패:\n" + "\n".join(f"{src}: {error}" for src, error in result.failed[:10])
+        QMessageBox.information(self, "ZIP 내보내기 완료", msg)
+
+    def cancel_file_jobs(self):
+        """진행 중인 파일 복사/ZIP 내보내기를 취소하고 끝날 때까지 대기 (프로그램 종료 시)"""
+        for worker in (self.copy_worker, self.export_worker):
+            if worker is not None:
+                worker.cancel()
+                worker.wait()
+
     def contextMenuEvent(self, event):
         """
-        우클릭 시, 선택된 노드에 대해 '파일 복사' 메뉴를 표시하여
-        해당 노드와 자식 노드에 해당하는 파일들을 새 폴더로 복사합니다.
+        우클릭 시, 선택된 노드에 대해 '파일 복사' / 'ZIP 내보내기' 메뉴를 표시하여
+        해당 노드와 자식 노드에 해당하는 파일들을 새 폴더로 복사하거나 zip 하나로 내보냅니다.
         """
-        item = self.itemAt(event.pos())
+        index = self.indexAt(event.pos())
         menu = QMenu(self)
-        if item:
+        if index.isValid():
             copy_action = menu.addAction("파일 복사")
+            export_action = menu.addAction("ZIP 내보내기...")
             selected_action = menu.exec_(self.viewport().mapToGlobal(event.pos()))
             if selected_action == copy_action:
-                self.copy_files_from_node(item)
+                self.copy_files_from_node(index)
+            elif selected_action == export_action:
+                self.export_zip_from_node(index)
         else:
             menu.addAction("노드를 선택하세요")
             menu.exec_(self.viewport().mapToGlobal(event.pos()))
@@ -2,7 +2,7 @@
 from PyQt5.QtWidgets import (
     QMainWindow, QTreeWidget, QTextEdit, QVBoxLayout, QHBoxLayout,
     QWidget, QLabel, QRadioButton, QGroupBox, QPushButton, QSpacerItem, QSizePolicy, QCheckBox,
-    QLineEdit,
+    QLineEdit, QListWidget, QPlainTextEdit, QComboBox,
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QFontMetrics
@@ -34,8 +34,7 @@ class MainWindowUI:
         
         # ─── 좌측: 트리뷰 (로그창은 제거) ──────────────────────────────
         self.tree = MyTreeWidget(self)
-        self.tree.setColumnCount(1)
-        self.tree.setHeaderLabels(["FA-50M FINAL ASSEMBLY VERSION POLAND"])
+        self.tree.model().setHeaderData(0, Qt.Horizontal, "FA-50M FINAL ASSEMBLY VERSION POLAND")
         
         leftLayout = QVBoxLayout()
         leftLayout.addWidget(self.tree)
@@ -43,9 +42,17 @@ class MainWindowUI:
         leftWidget.setLayout(leftLayout)
         
         # ─── 하단: 로그창 (전체 하단 가로폭 사용) ──────────────────────────────
-        self.logText = QTextEdit(MainWindow)
+        # 로그는 LogConsole 이 모아서 붙이며, 줄 수 제한(maximumBlockCount)도 LogConsole 이 설정
+        self.logText = QPlainTextEdit(MainWindow)
         self.logText.setReadOnly(True)
         self.logText.setFixedHeight(300)
+        # 로그 수준 / 출처 필터
+        self.logLevelCombo = QComboBox(MainWindow)
+        self.logLevelCombo.setToolTip("이 수준 이상의 로그만 표시")
+        self.logSourceCombo = QComboBox(MainWindow)
+        self.logSourceCombo.setToolTip("선택한 출처의 로그만 표시")
+        self.logSourceCombo.setMinimumWidth(140)
+        self.logClearButton = QPushButton("Clear Log", MainWindow)
         
         # ─── 우측 상단: 이미지 패널 및 기타 구성요소 ──────────────────────────────
         self.imageLabel = ClickableLabel("이미지가 여기에 표시됩니다.", MainWindow)
@@ -64,6 +71,12 @@ class MainWindowUI:
         self.refresh_button.setMinimumSize(40, 40)
         self.refresh_button.setStyleSheet(self.button_style)
 
+        # BOM 엑셀 열기 (여러 개를 고르면 하나의 트리로 합쳐서 보여줌)
+        self.open_button = QPushButton("Open", MainWindow)
+        self.open_button.setMinimumSize(70, 40)
+        self.open_button.setStyleSheet(self.button_style)
+        self.open_button.setToolTip("BOM 엑셀 열기 (여러 파일을 고르면 모든 최종 루트를 하나의 트리에 표시)")
+
         self.filter_button = QPushButton("Filter", MainWindow)
         self.filter_button.setCheckable(True)
         self.filter_button.setMinimumSize(130, 40)
@@ -89,13 +102,20 @@ class MainWindowUI:
             lambda checked: self.checkbox_file.setStyleSheet("font-weight: bold;" if checked else "font-weight: normal;")
         )
 
+        # 자산 폴더 실시간 감시 체크박스
+        self.checkbox_watch = QCheckBox("Live", MainWindow)
+        self.checkbox_watch.setChecked(True)
+        self.checkbox_watch.setToolTip("자산 폴더의 파일 변경을 자동으로 반영합니다.")
+
         # Filter 버튼과 FILE 체크박스를 같은 행에 배치
         filter_layout = QHBoxLayout()
         filter_layout.addStretch()
+        filter_layout.addWidget(self.open_button)
         filter_layout.addWidget(self.refresh_button)
         filter_layout.addWidget(self.filter_button)
         filter_layout.addSpacing(10)
         filter_layout.addWidget(self.checkbox_file)
+        filter_layout.addWidget(self.checkbox_watch)
         filter_layout.addStretch()
 
         # 상단 라디오 버튼과 하단 Filter+FILE 레이아웃을 수직으로 배치
@@ -130,20 +150,62 @@ class MainWindowUI:
         button_layout.addWidget(self.memoSaveButton)
         button_layout.addWidget(self.memoClearButton)
         
+        # 메모 검색(내용/날짜), 메모가 있는 노드만 보기, 메모 표시 on/off
+        self.memoSearchEdit = QLineEdit(MainWindow)
+        self.memoSearchEdit.setPlaceholderText("Search memos")
+        self.memoSearchEdit.setClearButtonEnabled(True)
+        self.checkbox_memo_only = QCheckBox("Memo only", MainWindow)
+        self.checkbox_memo_only.setToolTip("메모가 있는 노드와 그 상위 노드만 표시합니다.")
+        self.checkbox_memo_marks = QCheckBox("Marks", MainWindow)
+        self.checkbox_memo_marks.setChecked(True)
+        self.checkbox_memo_marks.setToolTip("메모가 있는 노드 앞에 점을 표시합니다.")
+        memo_search_row = QHBoxLayout()
+        memo_search_row.addWidget(self.memoSearchEdit)
+        memo_search_row.addWidget(self.checkbox_memo_only)
+        memo_search_row.addWidget(self.checkbox_memo_marks)
+        self.memoResultList = QListWidget(MainWindow)
+        self.memoResultList.setFixedHeight(120)
+        self.memoResultList.setVisible(False)
+
+        memo_layout.addLayout(memo_search_row)
+        memo_layout.addWidget(self.memoResultList)
         memo_layout.addWidget(self.memoOutput)
         memo_layout.addWidget(self.memoText)
         memo_layout.addLayout(button_layout)
         self.memo_group.setLayout(memo_layout)
-        self.memo_group.setFixedHeight(480)
+        self.memo_group.setFixedHeight(530)
         
         # ─── Search 항목: 파트넘버 검색 텍스트박스 ─────────────
         self.searchLineEdit = QLineEdit(MainWindow)
         self.searchLineEdit.setPlaceholderText("Enter Part No and press Enter")
         self.searchLineEdit.setMinimumSize(130, 40)
+        # 이전/다음 일치 위치 이동 버튼과 일치 개수 표시
+        self.searchPrevButton = QPushButton("▲", MainWindow)
+        self.searchPrevButton.setToolTip("이전 검색 결과 (Shift+Enter)")
+        self.searchPrevButton.setFixedSize(40, 40)
+        self.searchNextButton = QPushButton("▼", MainWindow)
+        self.searchNextButton.setToolTip("다음 검색 결과 (Enter)")
+        self.searchNextButton.setFixedSize(40, 40)
+        self.searchCountLabel = QLabel("", MainWindow)
+        self.searchCountLabel.setMinimumWidth(70)
+        self.searchCountLabel.setAlignment(Qt.AlignCenter)
+        # 퍼지 검색(파트넘버 + 품명) 모드와 결과 목록
+        self.checkbox_fuzzy = QCheckBox("Fuzzy", MainWindow)
+        self.checkbox_fuzzy.setToolTip("파트넘버 일부나 품명(Nomenclature)으로 유사한 파트를 찾습니다.")
+        self.searchResultList = QListWidget(MainWindow)
+        self.searchResultList.setFixedHeight(150)
+        self.searchResultList.setVisible(False)
         self.search_group = QGroupBox("Search", MainWindow)
         self.search_group.setStyleSheet(self.qgroupbox_style)
-        search_layout = QHBoxLayout()
-        search_layout.addWidget(self.searchLineEdit)
+        search_row = QHBoxLayout()
+        search_row.addWidget(self.searchLineEdit)
+        search_row.addWidget(self.searchCountLabel)
+        search_row.addWidget(self.searchPrevButton)
+        search_row.addWidget(self.searchNextButton)
+        search_row.addWidget(self.checkbox_fuzzy)
+        search_layout = QVBoxLayout()
+        search_layout.addLayout(search_row)
+        search_layout.addWidget(self.searchResultList)
         self.search_group.setLayout(search_layout)
 
         # 우측 전체 레이아웃 (SpacerItem 제거)
@@ -164,6 +226,13 @@ class MainWindowUI:
         # ─── 메인 레이아웃: 상단 영역 + 하단 로그창 (전체 가로폭 사용) ─────────────────────────────
         mainLayout = QVBoxLayout()
         mainLayout.addLayout(topLayout)
+        log_row = QHBoxLayout()
+        log_row.addWidget(QLabel("Log", MainWindow))
+        log_row.addWidget(self.logLevelCombo)
+        log_row.addWidget(self.logSourceCombo)
+        log_row.addStretch(1)
+        log_row.addWidget(self.logClearButton)
+        mainLayout.addLayout(log_row)
         mainLayout.addWidget(self.logText)
         
         centralWidget = QWidget()
@@ -1,16 +1,27 @@
 # ui_functionality.py
 import os
 import sys
-import json
+import logging
 import datetime
 import subprocess
-from PyQt5.QtWidgets import QMainWindow, QMessageBox
-from PyQt5.QtCore import QUrl, Qt
-from PyQt5.QtGui import QDesktopServices, QPixmap, QFont
+from PyQt5.QtWidgets import QMainWindow, QMessageBox, QCompleter, QShortcut, QListWidgetItem, QFileDialog
+from PyQt5.QtCore import QUrl, Qt, QTimer, QStringListModel
+from PyQt5.QtGui import QDesktopServices, QPixmap, QFont, QKeySequence
 from ui import MainWindowUI  # UI 구성부
 # tree_widget 모듈에서 MyTreeWidget를 import
 from tree_widget import MyTreeWidget
-from tree_manager import files_dict, display_part_info, apply_tree_view_styles,build_image_dict,build_xml3d_dict,build_fbx_dict
+from tree_manager import files_dict, display_part_info, apply_tree_view_styles, apply_load_result, get_base_path
+from bom_worker import BomLoadWorker
+from bom_loader import as_sources
+from asset_watcher import AssetWatcher
+from part_search import COMPLETION_LIMIT, SEARCH_MAX_HITS
+from thumbnail_cache import ThumbnailCache, ImageLoader, THUMB_DIRNAME
+from memo_store import MemoStore, journal_path_for
+from memo_index import MemoIndex
+from log_console import LogConsole, LEVELS, log_file_path
+
+# 입력이 멈춘 뒤 검색을 실행하기까지 기다리는 시간 (ms)
+SEARCH_DELAY_MS = 200
 
 class MainWindow(QMainWindow, MainWindowUI):
     def __init__(self):
@@ -19,18 +30,51 @@ class MainWindow(QMainWindow, MainWindowUI):
         # self.setFont(parent_font)
         self.setupUi(self)  # UI 구성부 설정
 
+        # 로그창: 링 버퍼에 모아 두었다가 타이머로 한 번에 출력 (FA50_LOG_FILE 이면 회전 로그 파일에도 기록)
+        self.log_console = LogConsole(self.logText, file_path=log_file_path(get_base_path()), parent=self)
+        for level in LEVELS:
+            self.logLevelCombo.addItem(logging.getLevelName(level), level)
+        self.logLevelCombo.setCurrentIndex(LEVELS.index(logging.INFO))
+        self.logSourceCombo.addItem("All sources", None)
+        self.log_console.source_added.connect(lambda source: self.logSourceCombo.addItem(source, source))
+        self.logLevelCombo.currentIndexChanged.connect(self.on_log_filter_changed)
+        self.logSourceCombo.currentIndexChanged.connect(self.on_log_filter_changed)
+        self.logClearButton.clicked.connect(self.log_console.clear)
+
         # 최초 자동 선택 무시를 위한 플래그 추가
         self.firstDisplay = True
 
         # 기능 구현부 초기화
         self.current_part_no = None           # 현재 선택된 파트넘버
         self.memo_data = {}                   # { 파트번호: [ { "memo": 내용, "timestamp": 시간 }, ... ] }
-        self.json_file_path = None            # JSON 파일 경로 (예: 01_excel/memo.json)
+        self.json_file_path = None            # JSON 파일 경로 (예: 01_excel/memo.json, 저널은 memo.jsonl)
+        self.memo_store = None                # 메모 저장소 (load_memo_data 에서 생성)
+        self.memo_index = MemoIndex()         # 메모 내용/시간 역색인 (메모 검색, 메모 표시용)
         self.df = None                        # Excel 데이터 (나중에 build_tree_view에서 설정)
+        self.bom_graph = None                 # BOM 관계 그래프 (build_tree_view에서 설정)
+        self.search_index = None              # 파트넘버 검색 인덱스 (build_tree_view에서 설정)
+        self.fuzzy_index = None               # 파트넘버/품명 퍼지 검색 인덱스 (build_tree_view에서 설정)
+        self.search_hits = []                 # 현재 검색어의 일치 위치 [(파트 id, row 경로), ...]
+        self.search_pos = -1                  # search_hits 중 현재 선택된 위치
+        self.search_text = ""                 # search_hits 를 만든 검색어
+        self.excel_file_path = None           # 엑셀 파일 경로 (예: 01_excel/data.xlsx, 여러 출처면 "경로#시트" 목록)
+        self.load_worker = None               # 현재 진행 중인 로딩 작업
+        self._retired_workers = []            # 취소되었지만 아직 끝나지 않은 작업 (참조 유지용)
+        self._assets_dirty = False            # 로딩 중에 자산 폴더 변경이 감지됨
+
+        # 미리보기 썸네일 캐시 (메모리 LRU + 01_excel/thumbnails)
+        self.thumbnail_cache = ThumbnailCache(os.path.join(get_base_path(), "01_excel", THUMB_DIRNAME))
+        # 미리보기 이미지는 작업 스레드에서 읽음 (GUI 스레드는 기다리지 않음)
+        self.image_loader = ImageLoader(self.thumbnail_cache, parent=self)
+        self.image_loader.loaded.connect(self.on_image_loaded)
+
+        # 자산 폴더 실시간 감시
+        self.asset_watcher = AssetWatcher(get_base_path(), parent=self)
+        self.asset_watcher.changed.connect(self.on_assets_changed)
         
         # 시그널과 슬롯 연결 (이벤트 핸들러 연결)
-        self.tree.itemClicked.connect(self.on_tree_item_clicked)
-        self.tree.itemDoubleClicked.connect(self.on_tree_item_double_clicked)
+        self.tree.clicked.connect(self.on_tree_item_clicked)
+        self.tree.doubleClicked.connect(self.on_tree_item_double_clicked)
         self.imageLabel.clicked.connect(self.load_image_for_current_part)
         self.radio_image.toggled.connect(self.on_radio_image_clicked)
         self.radio_3dxml.toggled.connect(self.on_radio_3dxml_clicked)
@@ -38,46 +82,176 @@ class MainWindow(QMainWindow, MainWindowUI):
         self.filter_button.toggled.connect(self.on_filter_button_toggled)
         self.memoSaveButton.clicked.connect(self.on_save_memo)
         self.memoClearButton.clicked.connect(self.on_clear_memo)
+        self.memoSearchEdit.textChanged.connect(self.run_memo_search)
+        self.memoResultList.itemActivated.connect(self.on_memo_result_activated)
+        self.memoResultList.itemClicked.connect(self.on_memo_result_activated)
+        self.checkbox_memo_only.toggled.connect(self.on_memo_filter_toggled)
+        self.checkbox_memo_marks.toggled.connect(lambda checked: self.tree.model().set_memo_marks(checked))
         self.refresh_button.clicked.connect(self.on_refresh_clicked)
+        self.open_button.clicked.connect(self.on_open_clicked)
         self.searchLineEdit.returnPressed.connect(self.searchTree)
-        self.tree.currentItemChanged.connect(self.on_current_item_changed)
+        self.searchLineEdit.textEdited.connect(self.on_search_text_edited)
+        self.searchNextButton.clicked.connect(lambda: self.search_step(1))
+        self.searchPrevButton.clicked.connect(lambda: self.search_step(-1))
+        self.searchPrevShortcut = QShortcut(QKeySequence("Shift+Return"), self.searchLineEdit)
+        self.searchPrevShortcut.setContext(Qt.WidgetShortcut)
+        self.searchPrevShortcut.activated.connect(lambda: self.search_step(-1))
+
+        # 입력 중 자동완성과 첫 번째 일치 위치로 이동 (입력이 잠시 멈추면 실행)
+        self.searchCompleterModel = QStringListModel(self)
+        self.searchCompleter = QCompleter(self.searchCompleterModel, self)
+        self.searchCompleter.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.searchCompleter.setMaxVisibleItems(12)
+        self.searchCompleter.activated[str].connect(self.on_search_completion_activated)
+        self.searchLineEdit.setCompleter(self.searchCompleter)
+        self.searchTimer = QTimer(self)
+        self.searchTimer.setSingleShot(True)
+        self.searchTimer.setInterval(SEARCH_DELAY_MS)
+        self.searchTimer.timeout.connect(self.search_as_you_type)
+        self.checkbox_fuzzy.toggled.connect(self.on_fuzzy_toggled)
+        self.searchResultList.itemActivated.connect(self.on_search_result_activated)
+        self.searchResultList.itemClicked.connect(self.on_search_result_activated)
+        self.tree.selectionModel().currentChanged.connect(self.on_current_item_changed)
+        self.checkbox_watch.toggled.connect(self.on_watch_toggled)
+        if self.checkbox_watch.isChecked():
+            self.asset_watcher.start()
     
     def on_refresh_clicked(self):
         """
-        리프레쉬 버튼 클릭 시 3개의 파일 딕셔너리(이미지, 3DXML, FBX)를 다시 읽어
+        리프레쉬 버튼 클릭 시 3개의 파일 딕셔너리(이미지, 3DXML, FBX)를 백그라운드에서 다시 읽어
         현재 선택된 모드에 맞게 트리뷰 스타일을 업데이트하고,
         완료 메시지를 로그창에 출력합니다.
         """
-        # 파일 딕셔너리 갱신
-        build_image_dict(self)
-        build_xml3d_dict(self)
-        build_fbx_dict(self)
-        
-        # 현재 선택된 모드에 따른 스타일 결정
-        if self.radio_image.isChecked():
-            mode = "image"
-        elif self.radio_3dxml.isChecked():
-            mode = "3dxml"
-        elif self.radio_fbx.isChecked():
-            mode = "fbx"
+        self.start_refresh()
+
+    def on_open_clicked(self):
+        """
+        BOM 엑셀을 골라 다시 읽는다. 여러 파일을 고르면 동시에 파싱하여 하나의 트리(숲)로 합친다.
+        각 파일의 Sheet1 을 읽으며, 다른 시트는 실행 인자 "경로#시트" 로 지정한다.
+        """
+        sources = as_sources(self.excel_file_path)
+        folder = os.path.dirname(sources[0].path) if sources else os.path.join(get_base_path(), "01_excel")
+        paths, _ = QFileDialog.getOpenFileNames(self, "BOM 엑셀 열기", folder, "Excel (*.xlsx *.xlsm)")
+        if not paths:
+            return
+        self.excel_file_path = paths[0] if len(paths) == 1 else paths
+        self.start_bom_load(self.excel_file_path)
+
+    def on_watch_toggled(self, checked):
+        if checked:
+            self.asset_watcher.start()
+            self.on_assets_changed()  # 감시를 끈 동안의 변경분 반영
         else:
-            mode = "image"
-        
-        # 트리뷰의 스타일 재적용
-        apply_tree_view_styles(self.tree, mode)
-        
-        # 로그창에 완료 메시지 출력
-        self.appendLog("파일 딕셔너리 업데이트 및 스타일 재적용이 완료되었습니다.")
+            self.asset_watcher.stop()
+
+    def on_assets_changed(self):
+        """
+        자산 폴더 변경 감지 시(디바운스 후) 바뀐 폴더만 백그라운드에서 다시 읽어 반영.
+        로딩이 진행 중이면 끝난 뒤에 한 번 더 실행한다.
+        """
+        if self.load_worker is not None:
+            self._assets_dirty = True
+            return
+        self.start_bom_load(None)
+
+    # ─── 백그라운드 로딩 ─────────────────────────────────
+
+    def start_refresh(self):
+        """
+        폴더 스캔만 다시 실행. 엑셀 로딩이 진행 중이면 취소하지 않고 끝난 뒤에 한 번 실행하며,
+        진행 중인 폴더 스캔만 취소하고 새로 시작한다.
+        """
+        worker = self.load_worker
+        if worker is not None and worker.excel_path is not None:
+            self._assets_dirty = True
+            return
+        self.start_bom_load(None)
+
+    def start_bom_load(self, excel_path):
+        """
+        엑셀/폴더 로딩을 작업 스레드에서 시작한다 (excel_path 가 None 이면 폴더 스캔만).
+        진행 중인 로딩이 있으면 취소하고 새로 시작한다.
+        """
+        self.cancel_bom_load()
+        worker = BomLoadWorker(excel_path)
+        worker.progress.connect(lambda percent, message: self._on_load_progress(worker, percent, message))
+        worker.log.connect(lambda records: self._on_load_log(worker, records))
+        worker.loaded.connect(lambda result: self._on_load_finished(worker, result))
+        worker.failed.connect(lambda message: self._on_load_failed(worker, message))
+        worker.finished.connect(lambda: self._on_worker_stopped(worker))
+        self.load_worker = worker
+        worker.start()
+
+    def cancel_bom_load(self):
+        worker = self.load_worker
+        if worker is None:
+            return
+        self.load_worker = None
+        if worker.isRunning():
+            worker.cancel()
+            self._retired_workers.append(worker)
+            self.appendLog("진행 중이던 로딩을 취소했습니다.")
+
+    def _on_load_progress(self, worker, percent, message):
+        if worker is self.load_worker:
+            self.statusBar().showMessage(f"[{percent}%] {message}")
+
+    def _on_load_log(self, worker, records):
+        if worker is self.load_worker:
+            self.log_console.extend(records)
+
+    def _on_load_finished(self, worker, result):
+        if worker is not self.load_worker:
+            return  # 취소된 작업의 결과는 버림
+        apply_load_result(result, self, worker.start_time)
+        brief = result.timing.brief()
+        self.statusBar().showMessage(f"로딩 완료 - {brief}" if brief else "로딩 완료", 5000)
+
+    def _on_load_failed(self, worker, message):
+        if worker is not self.load_worker:
+            return
+        self.appendLog(f"[load] {message}", logging.ERROR)
+        self.statusBar().clearMessage()
+        QMessageBox.warning(self, "로딩 오류", message)
+
+    def _on_worker_stopped(self, worker):
+        if worker is self.load_worker:
+            self.load_worker = None
+            if self._assets_dirty:
+                self._assets_dirty = False
+                self.on_assets_changed()
+        if worker in self._retired_workers:
+            self._retired_workers.remove(worker)
+        worker.deleteLater()
+
+    def closeEvent(self, event):
+        # 종료 시 감시와 진행 중인 작업을 멈추고 스레드가 끝날 때까지 대기
+        self.asset_watcher.stop()
+        self.image_loader.shutdown()
+        if self.memo_store is not None:
+            self.memo_store.close()  # 남은 메모 기록을 마저 씀
+        self.thumbnail_cache.shutdown()
+        self.cancel_bom_load()
+        self.tree.cancel_file_jobs()
+        for worker in list(self._retired_workers):
+            worker.wait()
+        self.log_console.close()
+        super().closeEvent(event)
 
     # ─── 이벤트 핸들러 구현 ─────────────────────────────
 
-    def on_tree_item_clicked(self, item, column):
-        part_no = item.text(column).strip().upper()
+    def on_tree_item_clicked(self, index):
+        part_no = index.data().strip().upper()
         self.current_part_no = part_no
-        display_part_info(part_no, self)
+        display_part_info(part_no, self, self.tree.model().row_for_index(index))
         self.load_image_for_current_part()
-        
-        # 출력 박스에 저장된 메모(여러 메모이면 개행 한 번으로 구분) 출력
+        self.prefetch_neighbour_images(index)
+        self.show_memos(part_no)
+        # 메모 입력창은 입력 전용으로 항상 클리어
+        self.memoText.clear()
+
+    def show_memos(self, part_no):
+        """출력 박스에 저장된 메모(여러 메모이면 개행 한 번으로 구분) 출력"""
         if part_no in self.memo_data:
             memo_entries = self.memo_data[part_no]
             if isinstance(memo_entries, list):
@@ -92,12 +266,9 @@ class MainWindow(QMainWindow, MainWindowUI):
             self.memoOutput.setPlainText(display_text)
         else:
             self.memoOutput.clear()
-        
-        # 메모 입력창은 입력 전용으로 항상 클리어
-        self.memoText.clear()
     
-    def on_tree_item_double_clicked(self, item, column):
-        part_no = item.text(column).strip().upper()
+    def on_tree_item_double_clicked(self, index):
+        part_no = index.data().strip().upper()
         # 각 모드에 따른 파일 경로 선택
         if self.radio_image.isChecked():
             if part_no in files_dict["image"]:
@@ -149,25 +320,57 @@ class MainWindow(QMainWindow, MainWindowUI):
         if part_no in files_dict["image"]:
             image_path = files_dict["image"][part_no]
             if os.path.exists(image_path):
-                pixmap = QPixmap(image_path)
-                if not pixmap.isNull():
-                    scaled = pixmap.scaled(
-                        self.imageLabel.width(),
-                        self.imageLabel.height(),
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    self.imageLabel.setPixmap(scaled)
+                # 썸네일 캐시에 있으면 바로 표시, 없으면 작업 스레드에서 읽는 동안 안내 문구 표시
+                _, image = self.image_loader.request(
+                    image_path, self.imageLabel.width(), self.imageLabel.height()
+                )
+                if image is not None:
+                    self.show_preview_image(image)
                 else:
                     self.imageLabel.clear()
-                    self.imageLabel.setText("이미지 로드 실패.")
+                    self.imageLabel.setText("이미지 로딩 중...")
             else:
+                self.image_loader.cancel()
                 self.imageLabel.clear()
                 self.imageLabel.setText("이미지가 없습니다.")
         else:
+            self.image_loader.cancel()
             self.imageLabel.clear()
             self.imageLabel.setText("이미지가 없습니다.")
+
+    def on_image_loaded(self, request_id, image_path, image):
+        if request_id != self.image_loader.request_id:
+            return  # 다른 노드로 이동한 뒤 도착한 결과
+        self.show_preview_image(image)
+
+    def show_preview_image(self, image):
+        if not image.isNull():
+            self.imageLabel.setPixmap(QPixmap.fromImage(image))
+        else:
+            self.imageLabel.clear()
+            self.imageLabel.setText("이미지 로드 실패.")
     
+    def prefetch_neighbour_images(self, index):
+        """
+        방향키로 이동할 가능성이 높은 노드(위/아래 노드, 앞/뒤 형제)의 이미지 썸네일을 백그라운드에서 미리 만든다.
+        """
+        if not index.isValid():
+            return
+        neighbours = [
+            self.tree.indexAbove(index), self.tree.indexBelow(index),
+            index.sibling(index.row() - 1, 0), index.sibling(index.row() + 1, 0),
+        ]
+        image_files = files_dict["image"]
+        paths = []
+        for neighbour in neighbours:
+            if not neighbour.isValid():
+                continue
+            image_path = image_files.get(neighbour.data().strip().upper())
+            if image_path and image_path not in paths:
+                paths.append(image_path)
+        if paths:
+            self.thumbnail_cache.prefetch(paths, self.imageLabel.width(), self.imageLabel.height())
+
     def on_filter_button_toggled(self, checked):
         if checked:
             if self.radio_image.isChecked():
@@ -180,41 +383,18 @@ class MainWindow(QMainWindow, MainWindowUI):
                 mode = "image"
             self.filter_tree_items(self.tree, mode)
             
-            # 필터 적용 후 보이는 노드의 개수를 계산
-            def count_visible_nodes(item):
-                count = 0
-                if not item.isHidden():
-                    count += 1
-                for i in range(item.childCount()):
-                    count += count_visible_nodes(item.child(i))
-                return count
-
-            visible_total = 0
-            for i in range(self.tree.topLevelItemCount()):
-                visible_total += count_visible_nodes(self.tree.topLevelItem(i))
+            # 필터 적용 후 보이는 노드의 개수를 계산 (펼치지 않은 노드 포함)
+            visible_total = self.tree.model().count_visible()
             self.appendLog(f"{mode} 필터 적용 노드의 갯수: {visible_total}")
         else:
             self.clear_tree_filter(self.tree)
 
     def filter_tree_items(self, tree_widget, mode):
-        for i in range(tree_widget.topLevelItemCount()):
-            self._apply_filter(tree_widget.topLevelItem(i))
-
-    def _apply_filter(self, item):
-        # 캐싱된 활성 여부를 사용하여 필터 적용
-        visible = item.data(0, Qt.UserRole)
-        debug_message = f"Filtering Node: {item.text(0).upper()} | cached visible: {visible}"
-        item.setHidden(not visible)
-        for i in range(item.childCount()):
-            self._apply_filter(item.child(i))
+        # 캐싱된 활성 여부(Qt.UserRole)를 사용하여 필터 적용
+        tree_widget.set_filter_active(True)
     
     def clear_tree_filter(self, tree_widget):
-        def clear_item(item):
-            item.setHidden(False)
-            for i in range(item.childCount()):
-                clear_item(item.child(i))
-        for i in range(tree_widget.topLevelItemCount()):
-            clear_item(tree_widget.topLevelItem(i))
+        tree_widget.set_filter_active(False)
     
     def on_radio_image_clicked(self, checked):
         if checked:
@@ -238,8 +418,12 @@ class MainWindow(QMainWindow, MainWindowUI):
         if self.filter_button.isChecked():
             self.filter_button.setChecked(False)
 
-    def appendLog(self, message):
-        self.logText.append("Log event: " + message)
+    def appendLog(self, message, level=logging.INFO):
+        """로그 기록 (화면에는 잠시 뒤 모아서 출력됨). level 은 logging 수준."""
+        self.log_console.append(message, level)
+
+    def on_log_filter_changed(self, _index=None):
+        self.log_console.set_filter(self.logLevelCombo.currentData(), self.logSourceCombo.currentData())
 
     def on_save_memo(self):
         if not self.current_part_no:
@@ -250,22 +434,12 @@ class MainWindow(QMainWindow, MainWindowUI):
             QMessageBox.information(self, "알림", "메모를 입력하세요.")
             return
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        new_entry = {"memo": memo_content, "timestamp": timestamp}
-        if self.current_part_no in self.memo_data:
-            if not isinstance(self.memo_data[self.current_part_no], list):
-                self.memo_data[self.current_part_no] = [self.memo_data[self.current_part_no]]
-            self.memo_data[self.current_part_no].append(new_entry)
-        else:
-            self.memo_data[self.current_part_no] = [new_entry]
-        self.save_memo_data()
+        # 저널에 한 줄 덧붙이는 기록은 백그라운드에서 수행
+        self.memo_store.add(self.current_part_no, memo_content, timestamp)
         self.appendLog(f"[{timestamp}] Saved Memo for {self.current_part_no}: {memo_content}")
         self.memoText.clear()
-        memo_entries = self.memo_data[self.current_part_no]
-        display_text = "\n".join(
-            f"[{entry.get('timestamp','').strip()}] {entry.get('memo','').strip()}"
-            for entry in memo_entries
-        )
-        self.memoOutput.setPlainText(display_text)
+        self.show_memos(self.current_part_no)
+        self.memo_parts_changed([self.current_part_no])
     
     def on_clear_memo(self):
         if not self.current_part_no:
@@ -279,45 +453,119 @@ class MainWindow(QMainWindow, MainWindowUI):
             return
         self.memoText.clear()
         self.memoOutput.clear()
-        if self.current_part_no in self.memo_data:
-            del self.memo_data[self.current_part_no]
-            self.save_memo_data()
+        self.memo_store.clear(self.current_part_no)
+        self.memo_parts_changed([self.current_part_no])
         self.appendLog(f"Cleared Memo - Node: {self.current_part_no}")
 
     def load_memo_data(self):
-        if not os.path.exists(self.json_file_path):
-            with open(self.json_file_path, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=4)
-            self.memo_data = {}
-        else:
-            try:
-                with open(self.json_file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if not content:
-                        self.memo_data = {}
-                    else:
-                        self.memo_data = json.loads(content)
-            except json.JSONDecodeError:
-                self.memo_data = {}
-    
-    def save_memo_data(self):
+        """
+        메모 저널(memo.jsonl)을 읽어 memo_data 를 만든다. 저널이 없으면 예전 memo.json 을 옮긴다.
+        """
+        if self.memo_store is not None:
+            self.memo_store.close()
+        self.memo_store = MemoStore(journal_path_for(self.json_file_path), legacy_path=self.json_file_path, parent=self)
+        self.memo_store.error.connect(self.on_memo_store_error)
+        self.memo_store.changed.connect(self.on_memos_changed)
         try:
-            with open(self.json_file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.memo_data, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            QMessageBox.critical(self, "에러", f"JSON 파일 저장 중 오류: {str(e)}")
+            self.memo_data = self.memo_store.load()
+        except OSError as e:
+            self.memo_data = self.memo_store.data
+            QMessageBox.critical(self, "에러", f"메모 파일을 읽는 중 오류: {str(e)}")
+            return
+        finally:
+            self.memo_index.rebuild(self.memo_data)
+            self.tree.model().set_memo_parts(list(self.memo_data))
+        if self.memo_store.migrated:
+            self.appendLog(f"memo.json 의 메모 {self.memo_store.migrated}건(파트)을 {self.memo_store.journal_path} 로 옮겼습니다.")
+        if self.memo_store.skipped_lines:
+            self.appendLog(f"손상된 메모 기록 {self.memo_store.skipped_lines}줄을 건너뛰었습니다.", logging.WARNING)
+        # 같은 폴더를 쓰는 다른 프로그램이 남긴 메모를 주기적으로 읽어 들임
+        self.memo_store.start_polling()
+
+    def on_memos_changed(self, parts):
+        """다른 프로그램이 메모를 바꾼 경우: 보고 있는 파트면 메모 출력을 갱신"""
+        self.appendLog(f"다른 프로그램에서 변경된 메모를 읽었습니다: {len(parts)}개 파트")
+        if self.current_part_no in parts:
+            self.show_memos(self.current_part_no)
+        self.memo_parts_changed(parts)
+
+    def memo_parts_changed(self, parts):
+        """메모가 바뀐 파트만 메모 색인과 트리의 메모 표시/필터에 반영"""
+        for part in parts:
+            self.memo_index.set_part(part, self.memo_data.get(part))
+        self.tree.model().update_memo_parts(parts, self.memo_data.__contains__)
+        if self.memoSearchEdit.text().strip():
+            self.run_memo_search(self.memoSearchEdit.text())
+
+    def run_memo_search(self, text):
+        """메모 내용/날짜로 파트를 찾아 결과 목록에 채운다 (검색어가 없으면 목록을 숨김)."""
+        self.memoResultList.clear()
+        text = text.strip()
+        self.memoResultList.setVisible(bool(text))
+        self.memo_group.setFixedHeight(660 if text else 530)
+        if not text:
+            return
+        for part in self.memo_index.search(text):
+            entries = self.memo_data.get(part) or [{}]
+            latest = entries[-1]
+            memo = " ".join(str(latest.get("memo", "")).split())
+            if len(memo) > 60:
+                memo = memo[:57] + "..."
+            item = QListWidgetItem(f"{part}  [{latest.get('timestamp', '')}] {memo}")
+            item.setData(Qt.UserRole, part)
+            self.memoResultList.addItem(item)
+        if not self.memoResultList.count():
+            self.memoResultList.addItem("검색 결과 없음")
+
+    def on_memo_result_activated(self, item):
+        """메모 검색 결과에서 고른 파트의 트리 위치로 이동"""
+        part = item.data(Qt.UserRole)
+        if not part:
+            return
+        index = self.tree.find_item(part)
+        if not index.isValid():
+            self.appendLog(f"트리뷰에 없는 파트의 메모입니다: {part}")
+            self.current_part_no = part
+            self.show_memos(part)
+            return
+        if index != self.tree.currentIndex():
+            self.tree.setCurrentIndex(index)
+        self.tree.scrollTo(index)
+
+    def on_memo_filter_toggled(self, checked):
+        self.tree.set_memo_filter_active(checked)
+        if checked:
+            self.appendLog(f"메모 필터 적용 노드의 갯수: {self.tree.model().count_memo_visible()}")
+
+    def on_memo_store_error(self, message):
+        QMessageBox.critical(self, "에러", message)
 
     def searchTree(self):
-        """검색 텍스트박스에 입력한 파트넘버를 트리에서 찾아 선택하고 스크롤합니다."""
+        """
+        검색 텍스트박스에 입력한 파트넘버를 트리에서 찾아 선택하고 스크롤합니다.
+        같은 검색어로 다시 Enter 를 누르면 다음 일치 위치로 이동합니다.
+        정확히 일치하는 파트넘버가 없으면 접두어/부분 문자열이 일치하는 노드를 차례로 보여줍니다.
+        """
         search_text = self.searchLineEdit.text().strip().upper()
         if not search_text:
             return
-        # MyTreeWidget에 구현된 find_item() 메서드를 사용
-        found_item = self.tree.find_item(search_text)
-        if found_item:
-            self.tree.setCurrentItem(found_item)
-            self.tree.scrollToItem(found_item)
-            self.appendLog(f"Found node: {search_text}")
+        self.searchTimer.stop()
+        if self.checkbox_fuzzy.isChecked():
+            if not self.run_fuzzy_search(search_text):
+                self.appendLog(f"Node not found: {search_text}")
+                QMessageBox.warning(
+                    self, "죄송합니다.",
+                    f"'{search_text}'와 비슷한 파트를 찾을 수 없습니다.",
+                    QMessageBox.Ok
+                )
+            return
+        if search_text == self.search_text and self.search_hits:
+            self.search_step(1)
+            return
+        self.update_search_hits(search_text)
+        if self.search_hits:
+            self.search_step(1)
+            self.appendLog(f"Found node: {search_text} ({len(self.search_hits)}건)")
         else:
             self.appendLog(f"Node not found: {search_text}")
             QMessageBox.warning(
@@ -326,9 +574,111 @@ class MainWindow(QMainWindow, MainWindowUI):
                 QMessageBox.Ok
             )
 
+    def update_search_hits(self, search_text):
+        """검색 인덱스로 일치 위치 목록을 새로 만든다 (트리 노드를 순회하지 않음)."""
+        self.search_text = search_text
+        self.search_pos = -1
+        if self.search_index is None or not search_text:
+            self.search_hits = []
+        else:
+            self.search_hits = self.search_index.occurrences(search_text)
+        self.update_search_label()
+
+    def update_search_label(self):
+        if not self.search_text:
+            self.searchCountLabel.setText("")
+        elif not self.search_hits:
+            self.searchCountLabel.setText("0건")
+        else:
+            more = "+" if len(self.search_hits) >= SEARCH_MAX_HITS else ""  # 최대 개수에서 잘림
+            self.searchCountLabel.setText(f"{self.search_pos + 1}/{len(self.search_hits)}{more}")
+
+    def search_step(self, step):
+        """검색 결과에서 step(+1: 다음, -1: 이전) 만큼 이동하여 노드를 선택 (끝에서는 처음으로 순환)."""
+        search_text = self.searchLineEdit.text().strip().upper()
+        # 퍼지 모드에서는 결과 목록에서 고른 파트의 위치를 이동
+        if search_text != self.search_text and not self.checkbox_fuzzy.isChecked():
+            self.searchTimer.stop()
+            self.update_search_hits(search_text)
+        if not self.search_hits:
+            return
+        self.search_pos = (self.search_pos + step) % len(self.search_hits)
+        _, rows = self.search_hits[self.search_pos]
+        index = self.tree.model().index_for_occurrence(rows)
+        if index.isValid():
+            self.tree.setCurrentIndex(index)
+            self.tree.scrollTo(index)
+        self.update_search_label()
+
+    def on_search_text_edited(self, text):
+        self.searchTimer.start()  # 입력이 이어지는 동안 계속 뒤로 미룸
+
+    def search_as_you_type(self):
+        """자동완성 목록을 갱신하고, 일치하는 첫 번째 노드로 이동한다 (경고창 없음)."""
+        search_text = self.searchLineEdit.text().strip().upper()
+        if self.checkbox_fuzzy.isChecked():
+            self.run_fuzzy_search(search_text)
+            return
+        if self.search_index is None or search_text == self.search_text:
+            return
+        self.searchCompleterModel.setStringList(
+            self.search_index.complete(search_text, COMPLETION_LIMIT) if search_text else []
+        )
+        if search_text and self.searchLineEdit.hasFocus():
+            self.searchCompleter.complete()
+        self.update_search_hits(search_text)
+        if self.search_hits:
+            self.search_step(1)
+
+    def run_fuzzy_search(self, search_text):
+        """퍼지 검색 결과를 유사도 순으로 결과 목록에 채운다. 결과 수를 반환."""
+        self.searchResultList.clear()
+        if self.fuzzy_index is None or not search_text:
+            self.searchCountLabel.setText("")
+            return 0
+        results = self.fuzzy_index.search(search_text)
+        keys = self.bom_graph.keys
+        labels = self.fuzzy_index.labels
+        shown = set()
+        for part, score in results:
+            # 여러 출처에 같은 파트넘버가 있으면 한 번만 (이동 시 모든 출처의 위치가 검색 결과가 됨)
+            if keys[part] in shown:
+                continue
+            shown.add(keys[part])
+            text = f"{keys[part]}  {labels[part]}".rstrip()
+            item = QListWidgetItem(f"{text}  ({score:.0%})")
+            item.setData(Qt.UserRole, keys[part])
+            self.searchResultList.addItem(item)
+        self.searchCountLabel.setText(f"{len(shown)}건")
+        return len(shown)
+
+    def on_search_result_activated(self, item):
+        """결과 목록에서 고른 파트의 트리 위치로 이동 (이후 ▲/▼ 로 같은 파트의 다른 위치 이동)"""
+        key = item.data(Qt.UserRole).upper()
+        if key == self.search_text and self.search_hits:
+            return  # 클릭과 활성화(더블클릭/Enter)가 함께 들어온 경우
+        self.update_search_hits(key)
+        self.search_step(1)
+
+    def on_fuzzy_toggled(self, checked):
+        self.searchResultList.setVisible(checked)
+        self.searchLineEdit.setCompleter(None if checked else self.searchCompleter)
+        self.searchLineEdit.setPlaceholderText(
+            "Part No or Nomenclature" if checked else "Enter Part No and press Enter"
+        )
+        self.search_text = ""
+        self.search_hits = []
+        self.searchResultList.clear()
+        self.searchCountLabel.setText("")
+
+    def on_search_completion_activated(self, text):
+        self.searchTimer.stop()
+        self.update_search_hits(text.strip().upper())
+        self.search_step(1)
+
     def on_current_item_changed(self, current, previous):
         if self.firstDisplay:
             self.firstDisplay = False  # 최초 한 번만 무시
         else:
-            if current:
-                self.on_tree_item_clicked(current, 0)
\ No newline at end of file
+            if current.isValid():
+                self.on_tree_item_clicked(current)
\ No newline at end of file